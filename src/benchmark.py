@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# benchmark.py
+
+"""
+Times the board and search hot paths on seeded positions.
+
+Every benchmark runs for each board size and fill level asked for, on a
+position built from the seed, so two runs on the same machine time the
+same work. Results are seconds per call. They can be saved as a JSON
+baseline, and a later run compared against it: any case slower than the
+baseline by more than the threshold is reported as a regression and the
+exit status is 1.
+"""
+import argparse
+import json
+import platform
+import sys
+from random import Random
+from time import perf_counter
+from constants import *
+from coord import Coord
+from board import Board
+from bot import HexBot
+from hsearch import HSearch, carrier_limit
+from protocol import run_captured
+
+SIZES = (8, 11, 13, 19)
+FILLS = (0.0, 0.25, 0.5)
+GAME_MOVES = 8  # different opponent replies the late_move benchmark answers
+
+
+def calm_move(board: Board, cells: list, color: Color) -> Coord:
+    """ Find a move that leaves no two-bridge in jeopardy and no winner
+
+    Such a move neither intrudes into a bridge nor leaves an intrusion
+    unanswered, so late_move cannot take its jeopardy shortcut afterwards
+    and always runs the path search it is meant to time
+
+    Parameters:
+        board: (Board) the board in current gamestate
+        cells: (list[Coord]) candidates, tried from the end
+        color: (Color) colour of the stone
+
+    Returns: (Coord)
+        the move, None if no candidate qualifies
+    """
+    for coord in reversed(cells):
+        if not board.play(coord, color):
+            continue
+        calm = not any(board.jeopardy.values()) and board.check_win(board.getsize() ** 2) == Color.EMPTY
+        board.undo()
+        if calm:
+            return coord
+    return None
+
+
+def position(size: int, fill: float, seed: int) -> list:
+    """ Build a seeded sequence of moves that fills part of the board without a winner
+
+    Moves are random among those that leave no two-bridge in jeopardy (see
+    calm_move), so every benchmark times the same kind of work at every
+    size and fill. Filling stops early if no such move is left.
+
+    Parameters:
+        size: (int) size of the game board
+        fill: (float) fraction of the cells to fill
+        seed: (int) seed for the move order
+
+    Returns: (list[tuple[Coord, Color]])
+        the moves, alternating colours, white first
+    """
+    rng = Random(seed * 7919 + size)
+    board = Board(size)
+    cells = [Coord(x, y) for x in range(1, size+1) for y in range(1, size+1)]
+    rng.shuffle(cells)
+    moves = []
+    color = Color.WHITE
+    while len(moves) < int(fill * size * size):
+        coord = calm_move(board, cells, color)
+        if coord is None:
+            break
+        cells.remove(coord)
+        board.play(coord, color)
+        moves.append((coord, color))
+        color = Color.BLACK if color == Color.WHITE else Color.WHITE
+    return moves
+
+
+def setup_bot(size: int, moves: list, color: Color = Color.WHITE) -> HexBot:
+    bot = HexBot(color, board_size=size)
+    for coord, color in moves:
+        bot.set_piece(coord, color)
+    return bot
+
+
+def bench_board_init(size: int, moves: list) -> tuple:
+    return (lambda: Board(size)), 20
+
+
+def bench_bi_bfs(size: int, moves: list) -> tuple:
+    board = Board(size)
+    for coord, color in moves:
+        board.set(coord, color)
+    return (lambda: board.bi_bfs(Edges.TOP, Edges.BOTTOM)), 200
+
+
+def bench_check_win(size: int, moves: list) -> tuple:
+    board = Board(size)
+    for coord, color in moves:
+        board.set(coord, color)
+    return (lambda: board.check_win(size * size)), 2000
+
+
+def bench_update_twobridges(size: int, moves: list) -> tuple:
+    bot = setup_bot(size, moves)
+    coord = moves[-1][0] if moves else Coord(size // 2 + 1, size // 2 + 1)
+    return (lambda: bot.update_twobridges(coord)), 2000
+
+
+def bench_play_undo(size: int, moves: list) -> tuple:
+    board = Board(size)
+    for coord, color in moves:
+        board.play(coord, color)
+    replies = list(board.empties)[:16]  # each call tries sixteen moves and takes them back
+
+    def run():
+        for coord in replies:
+            board.play(coord, Color.WHITE)
+            board.undo()
+    return run, 200
+
+
+def bench_dijkstra(size: int, moves: list) -> tuple:
+    bot = setup_bot(size, moves)
+    top, bottom = bot.board.cells[Edges.TOP], bot.board.cells[Edges.BOTTOM]
+
+    def run():
+        bot.tt.clear()  # time the search, not the cache
+        bot.dijkstra(top, bottom, Color.WHITE)
+    return run, 50
+
+
+def bench_must_play(size: int, moves: list) -> tuple:
+    """ Find the cells that stop the player to move, with a fresh H-search every call
+    """
+    board = Board(size)
+    for coord, color in moves:
+        board.play(coord, color)
+    color = Color.WHITE if len(moves) % 2 == 0 else Color.BLACK
+
+    def run():
+        HSearch(board, color, max_carrier=carrier_limit(size)).must_play()
+    return run, 5
+
+
+def bench_late_move(size: int, moves: list) -> tuple:
+    """ An opponent stone, then our make_move, then both taken back
+
+    Each call answers a different one of GAME_MOVES opponent replies, so
+    no call repeats a position the bot has cached. The replies are calm
+    moves (see calm_move) picked from a seeded shuffle of the empty cells,
+    so late_move never answers a jeopardized bridge and always times its
+    path search. The bot runs with its default options; the must-play
+    search is timed by bench_must_play.
+    """
+    color = Color.BLACK if len(moves) % 2 == 0 else Color.WHITE  # the side not to move
+    opp = Color.WHITE if color == Color.BLACK else Color.BLACK
+    board = Board(size)
+    for coord, stone in moves:
+        board.play(coord, stone)
+    cells = list(board.empties)
+    Random(size).shuffle(cells)
+    replies = []
+    while cells and len(replies) < GAME_MOVES:
+        reply = calm_move(board, cells, opp)
+        if reply is None:
+            break
+        replies.append(reply)
+        cells = cells[:cells.index(reply)]
+    state = dict()
+
+    def setup():
+        state["bot"] = setup_bot(size, moves, color)
+        state["next"] = 0
+
+    def run():
+        bot = state["bot"]
+        reply = replies[state["next"] % len(replies)]
+        state["next"] += 1
+        bot.set_piece(reply, opp)
+        answer = run_captured(bot, ["make_move"])
+        bot.unset(answer)
+        bot.unset(str(reply))
+    return run, len(replies), setup
+
+
+BENCHMARKS = {
+    "board_init": bench_board_init,
+    "bi_bfs": bench_bi_bfs,
+    "check_win": bench_check_win,
+    "update_twobridges": bench_update_twobridges,
+    "play_undo": bench_play_undo,
+    "dijkstra": bench_dijkstra,
+    "must_play": bench_must_play,
+    "late_move": bench_late_move,
+}
+
+
+def measure(func: object, number: int, repeat: int, setup: object = None) -> float:
+    """ Time a function, keeping the fastest of several rounds
+
+    Parameters:
+        func: (callable) function to time, called without arguments
+        number: (int) calls per round
+        repeat: (int) rounds
+        setup: (callable) run untimed before every round, eg. to rebuild a position
+
+    Returns: (float)
+        seconds per call in the fastest round
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (perf_counter() - start) / number)
+    return best
+
+
+def run_suite(names: list, sizes: list, fills: list, seed: int, repeat: int, scale: float) -> dict:
+    """ Run every benchmark on every size and fill level
+
+    Parameters:
+        names: (list[str]) benchmarks to run
+        sizes: (list[int]) board sizes
+        fills: (list[float]) fractions of the board filled
+        seed: (int) seed for the positions
+        repeat: (int) timing rounds per case
+        scale: (float) multiplier on each benchmark's calls per round
+
+    Returns: (dict[str, float])
+        seconds per call by case name, eg. "dijkstra/11/0.25"
+    """
+    results = dict()
+    for size in sizes:
+        for fill in fills:
+            moves = position(size, fill, seed)
+            for name in names:
+                if name == "late_move" and not moves:
+                    continue  # late_move is never asked on an empty board
+                func, number, *setup = BENCHMARKS[name](size, moves)
+                if not number:
+                    continue  # eg. no calm reply left for late_move
+                case = "{}/{}/{}".format(name, size, fill)
+                results[case] = measure(func, max(1, int(number * scale)), repeat, *setup)
+                print("{:32} {:12.1f} us".format(case, results[case] * 1e6), file=sys.stderr)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """ Find the cases that got slower than the baseline
+
+    Parameters:
+        results: (dict[str, float]) this run
+        baseline: (dict[str, float]) an earlier run
+        threshold: (float) allowed slowdown, eg. 0.1 for 10%
+
+    Returns: (list[tuple[str, float, float]])
+        (case, baseline seconds, new seconds) of each regression
+    """
+    regressions = []
+    for case, seconds in results.items():
+        old = baseline.get(case)
+        if old is not None and seconds > old * (1 + threshold):
+            regressions.append((case, old, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the board and search hot paths")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmarks to run (default all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="Board sizes")
+    parser.add_argument("--fills", nargs="+", type=float, default=list(FILLS),
+                        help="Fractions of the board filled with stones")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the positions")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per case; the fastest is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier on the calls per round")
+    parser.add_argument("--save", default=None, metavar="PATH", help="Write the results as a JSON baseline")
+    parser.add_argument("--baseline", default=None, metavar="PATH", help="Compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown over the baseline that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    results = run_suite(args.only, args.sizes, args.fills, args.seed, args.repeat, args.scale)
+    if args.save is not None:
+        with open(args.save, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "seed": args.seed, "results": results}, file, indent=2, sort_keys=True)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for case, old, new in regressions:
+            print("REGRESSION {:32} {:10.1f} us -> {:10.1f} us ({:+.0%})".format(
+                case, old * 1e6, new * 1e6, new / old - 1))
+        if regressions:
+            sys.exit(1)
+        print("no regressions beyond {:.0%} in {} cases".format(args.threshold, len(results)))
+
+
+if __name__ == "__main__":
+    main()
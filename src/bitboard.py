@@ -0,0 +1,228 @@
+# bitboard.py
+
+from constants import *
+from coord import Coord
+from topology import Topology
+
+
+class BitLayout:
+    __cache = dict()
+
+    def __init__(self, size: int) -> None:
+        """ Create a BitLayout object: how a board size maps onto bits
+
+        Cell (x, y) is bit (y-1)*stride + (x-1), with stride = size+1. The
+        extra column is always empty, so shifting a row by one never wraps
+        into the next row. Neighbour and bridge masks are read from the
+        shared Topology, so they match the geometry Cell computes.
+        Use BitLayout.get() to share one layout per size.
+
+        Parameters:
+            size: (int) size of the game board
+        """
+        topology = Topology.get(size)
+        self.size = size
+        self.stride = size + 1
+        self.topology = topology
+        self.bits = [self.bit(coord) if coord.getx() > 0 and coord.gety() > 0 else 0
+                     for coord in topology.coords]
+
+        self.board = 0
+        for i in range(size*size):
+            self.board |= self.bits[i]
+        self.bottom_row = (1 << size) - 1
+        self.top_row = self.bottom_row << (self.stride * (size - 1))
+        self.left_column = 0
+        for y in range(size):
+            self.left_column |= 1 << (y * self.stride)
+        self.right_column = self.left_column << (size - 1)
+
+        # per cell: mask of its board neighbours, and (dest mask, carrier mask) of
+        # each two-bridge it starts; an edge dest has an empty mask
+        self.neighbours = []
+        self.bridges = []
+        for i in range(size*size):
+            mask = 0
+            for node in topology.neighbours(i):
+                mask |= self.bits[node]
+            self.neighbours.append(mask)
+            bridges = []
+            for b in range(topology.bridge_start[i], topology.bridge_start[i+1]):
+                carriers = self.bits[topology.bridge_dep0[b]] | self.bits[topology.bridge_dep1[b]]
+                bridges.append((self.bits[topology.bridge_dest[b]], carriers))
+            self.bridges.append(bridges)
+
+    @staticmethod
+    def get(size: int) -> object:
+        """ Get the shared BitLayout for a board size, building it on first use
+
+        Parameters:
+            size: (int) size of the game board
+
+        Returns: (BitLayout)
+            the cached layout for this size
+        """
+        if size not in BitLayout.__cache:
+            BitLayout.__cache[size] = BitLayout(size)
+        return BitLayout.__cache[size]
+
+    def bit(self, coord: Coord) -> int:
+        """ Get the single-bit mask of a board cell
+
+        Parameters:
+            coord: (Coord) a cell on the board (not an edge)
+
+        Returns: (int)
+            mask with only that cell's bit set
+        """
+        return 1 << ((coord.gety() - 1) * self.stride + coord.getx() - 1)
+
+    def expand(self, mask: int) -> int:
+        """ Grow a set of cells by all of their neighbours
+
+        Parameters:
+            mask: (int) set of cells
+
+        Returns: (int)
+            the cells and every cell adjacent to one of them
+        """
+        s = self.stride
+        grown = mask | (mask << 1) | (mask >> 1) | (mask << s) | (mask >> s) | \
+            (mask << (s - 1)) | (mask >> (s - 1))
+        return grown & self.board
+
+    def flood(self, seed: int, stones: int) -> int:
+        """ Find every stone connected to a seed through other stones
+
+        Parameters:
+            seed: (int) cells to start from (only those in 'stones' count)
+            stones: (int) cells that can be walked through
+
+        Returns: (int)
+            all stones connected to the seed
+        """
+        region = seed & stones
+        while True:
+            grown = self.expand(region) & stones
+            if grown == region:
+                return region
+            region = grown
+
+
+class BitBoard:
+    def __init__(self, size: int, whites: int = 0, blacks: int = 0) -> None:
+        """ Create a BitBoard object: a position held as two integer bitsets
+
+        Parameters:
+            size: (int) size of the game board
+            whites: (int) mask of white stones
+            blacks: (int) mask of black stones
+        """
+        self.layout = BitLayout.get(size)
+        self.whites = whites
+        self.blacks = blacks
+
+    @staticmethod
+    def from_board(board: object) -> object:
+        """ Build a BitBoard holding the same stones as a Board
+
+        Parameters:
+            board: (Board) the board in current gamestate
+
+        Returns: (BitBoard)
+            the equivalent bitboard
+        """
+        bitboard = BitBoard(board.getsize())
+        bits = bitboard.layout.bits
+        white = COLOR_CODES[Color.WHITE]
+        black = COLOR_CODES[Color.BLACK]
+        for i in range(board.getsize() ** 2):
+            if board.colors[i] == white:
+                bitboard.whites |= bits[i]
+            elif board.colors[i] == black:
+                bitboard.blacks |= bits[i]
+        return bitboard
+
+    def copy(self) -> object:
+        return BitBoard(self.layout.size, self.whites, self.blacks)
+
+    def empties(self) -> int:
+        return self.layout.board & ~(self.whites | self.blacks)
+
+    def get(self, coord: Coord) -> Color:
+        bit = self.layout.bit(coord)
+        if self.whites & bit:
+            return Color.WHITE
+        if self.blacks & bit:
+            return Color.BLACK
+        return Color.EMPTY
+
+    def set(self, coord: Coord, color: Color) -> bool:
+        """ Set a piece on an empty cell
+
+        Parameters:
+            coord: (Coord) coordinate to place the piece on
+            color: (Color) what colour piece to place
+
+        Returns: (bool)
+            True if successful, False if the cell was not empty
+        """
+        bit = self.layout.bit(coord)
+        if (self.whites | self.blacks) & bit or color == Color.EMPTY:
+            return False
+        if color == Color.WHITE:
+            self.whites |= bit
+        else:
+            self.blacks |= bit
+        return True
+
+    def unset(self, coord: Coord) -> bool:
+        """ Remove a piece from the board
+
+        Parameters:
+            coord: (Coord) coordinate to remove the piece from
+
+        Returns: (bool)
+            True if successful, False if there was no piece there
+        """
+        bit = self.layout.bit(coord)
+        if not (self.whites | self.blacks) & bit:
+            return False
+        self.whites &= ~bit
+        self.blacks &= ~bit
+        return True
+
+    def check_win(self) -> Color:
+        """ Check whether either player joins their two edges
+
+        Returns: (Color)
+            color of the winning player, or empty for no winner
+        """
+        layout = self.layout
+        if layout.flood(layout.top_row, self.whites) & layout.bottom_row:
+            return Color.WHITE
+        if layout.flood(layout.left_column, self.blacks) & layout.right_column:
+            return Color.BLACK
+        return Color.EMPTY
+
+    def neighbours(self, coord: Coord) -> int:
+        """ Get the mask of a cell's neighbours on the board
+
+        Parameters:
+            coord: (Coord) a cell on the board
+
+        Returns: (int)
+            neighbour mask (edges are not bits)
+        """
+        return self.layout.neighbours[self.layout.topology.index[coord]]
+
+    def bridge_carriers(self, coord: Coord) -> list:
+        """ Get the two-bridges starting at a cell as masks
+
+        Parameters:
+            coord: (Coord) a cell on the board
+
+        Returns: (list[tuple[int, int]])
+            (dest mask, carrier mask) per bridge; an edge dest has mask 0
+        """
+        return self.layout.bridges[self.layout.topology.index[coord]]
@@ -3,7 +3,10 @@
 from constants import *
 from coord import Coord
 from cell import Cell
-from twobridge import TwoBridge
+from twobridge import TwoBridge, STATUS_TABLES
+from unionfind import DisjointSet
+from topology import Topology
+from inferior import InferiorCells
 
 
 class Board:
@@ -14,116 +17,110 @@ class Board:
             size: (int) size of the game board
         """
         self.__boardsize = size
+        self.topology = Topology.get(size)
         self.cells = dict()
         self.blacks = dict()
         self.whites = dict()
         self.empties = dict()
+
+        # flat core: colours by cell id, geometry in the shared topology, bridges by bridge id
+        # the Cell dicts above are kept in sync and remain the public API
+        self.colors = bytearray(self.topology.initial_colors)
+        self.bridges = {Color.WHITE: [], Color.BLACK: []}
         self.__create_all_cells()
+        self.reset()
 
     def getsize(self) -> int:
         return self.__boardsize
 
     def __create_all_cells(self) -> None:
-        """ Creates a Cell object for every coord on the board
+        """ Creates a Cell object for every coord on the board from the shared topology
 
         Not to be used anywhere except during initialization
         """
-        # create all the standard cells
-        for i in range(1, self.__boardsize+1):
-            for j in range(1, self.__boardsize+1):
-                coord = Coord(i, j)
-                cell = Cell(coord, Color.EMPTY, self.__boardsize)
-                self.cells[coord] = cell
-                self.empties[coord] = cell
-
-        # create the edge cells
-        top = Cell(Edges.TOP, Color.WHITE, self.__boardsize)
-        for x in range(1, self.__boardsize+1):
-            top.neighbours.add(Coord(x, self.__boardsize))
-        for x in range(2, self.__boardsize+1):
-            dest = Coord(x, self.__boardsize-1)
-            top.white_twobridges[dest] = TwoBridge(
-                Edges.TOP,
-                dest,
-                (Coord(x-1, self.__boardsize), Coord(x, self.__boardsize)),
-                Color.WHITE,
-                Status.TO_BE
-            )
-            top.black_twobridges[dest] = TwoBridge(
-                Edges.TOP,
-                dest,
-                (Coord(x-1, self.__boardsize), Coord(x, self.__boardsize)),
-                Color.BLACK,
-                Status.FAIL
-            )
-        bottom = Cell(Edges.BOTTOM, Color.WHITE, self.__boardsize)
-        for x in range (1, self.__boardsize+1):
-            bottom.neighbours.add(Coord(x, 1))
-        for x in range (1, self.__boardsize):
-            dest = Coord(x, 2)
-            bottom.white_twobridges[dest] = TwoBridge(
-                Edges.BOTTOM,
-                dest,
-                (Coord(x, 1), Coord(x+1, 1)),
-                Color.WHITE,
-                Status.TO_BE
-            )
-            bottom.black_twobridges[dest] = TwoBridge(
-                Edges.BOTTOM,
-                dest,
-                (Coord(x, 1), Coord(x+1, 1)),
-                Color.BLACK,
-                Status.FAIL
-            )
-        left = Cell(Edges.LEFT, Color.BLACK, self.__boardsize)
-        for y in range(1, self.__boardsize+1):
-            left.neighbours.add(Coord(1, y))
-        for y in range(1, self.__boardsize):
-            dest = Coord(2, y)
-            left.white_twobridges[dest] = TwoBridge(
-                Edges.LEFT,
-                dest,
-                (Coord(1, y), Coord(1, y+1)),
-                Color.WHITE,
-                Status.FAIL
-            )
-            left.black_twobridges[dest] = TwoBridge(
-                Edges.LEFT,
-                dest,
-                (Coord(1, y), Coord(1, y+1)),
-                Color.BLACK,
-                Status.TO_BE
-            )
-        right = Cell(Edges.RIGHT, Color.BLACK, self.__boardsize)
-        for y in range (1, self.__boardsize+1):
-            right.neighbours.add(Coord(self.__boardsize, y))
-        for y in range (2, self.__boardsize+1):
-            dest = Coord(self.__boardsize-1, y)
-            right.white_twobridges[dest] = TwoBridge(
-                Edges.RIGHT,
-                dest,
-                (Coord(self.__boardsize, y-1), Coord(self.__boardsize, y)),
-                Color.WHITE,
-                Status.FAIL
-            )
-            right.black_twobridges[dest] = TwoBridge(
-                Edges.RIGHT,
-                dest,
-                (Coord(self.__boardsize, y-1), Coord(self.__boardsize, y)),
-                Color.BLACK,
-                Status.TO_BE
-            )
-
-        # populate the relevant dicts with the edge cells
-        self.cells[Edges.TOP] = top
-        self.whites[Edges.TOP] = top
-        self.cells[Edges.BOTTOM] = bottom
-        self.whites[Edges.BOTTOM] = bottom
-        self.cells[Edges.LEFT] = left
-        self.blacks[Edges.LEFT] = left
-        self.cells[Edges.RIGHT] = right
-        self.blacks[Edges.RIGHT] = right
+        topology = self.topology
+        for i, coord in enumerate(topology.coords):
+            cell = Cell(coord, CODE_COLORS[topology.initial_colors[i]], self.__boardsize, populate=False)
+            cell.neighbours = topology.neighbour_sets[i]
+            for b in range(topology.bridge_start[i], topology.bridge_start[i+1]):
+                dest = topology.coords[topology.bridge_dest[b]]
+                depends = topology.bridge_depends[b]
+                ids = (i, topology.bridge_dep0[b], topology.bridge_dep1[b], topology.bridge_dest[b])
+                white = TwoBridge(coord, dest, depends, Color.WHITE, topology.initial_status[Color.WHITE][b], ids)
+                black = TwoBridge(coord, dest, depends, Color.BLACK, topology.initial_status[Color.BLACK][b], ids)
+                cell.white_twobridges[dest] = white
+                cell.black_twobridges[dest] = black
+                self.bridges[Color.WHITE].append(white)
+                self.bridges[Color.BLACK].append(black)
+            self.cells[coord] = cell
+
+    def parse(self, name: str) -> Coord:
+        """ Convert a chess-style string to the board's Coord
+
+        Parameters:
+            name: (str) chess-style string eg. "b5"
+
+        Returns: (Coord)
+            the interned coordinate, from the precomputed table when it is on the board
+        """
+        coord = self.topology.names.get(name)
+        if coord is None:
+            coord = Coord(*Coord.str2cart(name))
+        return coord
 
+    def reset(self) -> None:
+        """ Clear the board back to an empty game, in place
+
+        Only colours, bridge statuses and stone groups are reset; the geometry is shared
+        """
+        topology = self.topology
+        self.colors[:] = topology.initial_colors
+        self.blacks.clear()
+        self.whites.clear()
+        self.empties.clear()
+        sorted_cells = {Color.EMPTY: self.empties, Color.WHITE: self.whites, Color.BLACK: self.blacks}
+        for i, coord in enumerate(topology.coords):
+            cell = self.cells[coord]
+            cell.color = CODE_COLORS[topology.initial_colors[i]]
+            sorted_cells[cell.color][coord] = cell
+        for color in self.bridges:
+            for bridge, status in zip(self.bridges[color], topology.initial_status[color]):
+                bridge.status = status
+
+        # two-bridges currently in JEOPARDY, per colour, maintained by update_bridges
+        self.jeopardy = {Color.WHITE: dict(), Color.BLACK: dict()}
+        # undo log of play(): (coord, [(bridge, old status), ...]) for every move, latest last
+        self.__history = []
+
+        self.__groups = DisjointSet(topology.cell_count())
+        self.__placed = []  # (coord, checkpoint) for every stone, in the order they were set
+
+        # zobrist hashes of the position and of its 180 degree rotation
+        self.__hash = 0
+        self.__rotated_hash = 0
+
+    def recompute_bridges(self) -> None:
+        """ Recompute every two-bridge status and the jeopardy index in one pass
+
+        For when many cells changed at once (loading a position, several
+        unsets); single moves are cheaper through update_bridges or play
+        """
+        topology = self.topology
+        colors = self.colors
+        # one table index per bridge, shared by both colours
+        keys = [
+            colors[origin]*27 + colors[dep0]*9 + colors[dep1]*3 + colors[dest]
+            for origin, dep0, dep1, dest in zip(
+                topology.bridge_origin, topology.bridge_dep0, topology.bridge_dep1, topology.bridge_dest)
+        ]
+        for color, bridges in self.bridges.items():
+            table = STATUS_TABLES[color]
+            jeopardy = self.jeopardy[color]
+            jeopardy.clear()
+            for bridge, key in zip(bridges, keys):
+                bridge.status = table[key]
+                if bridge.status == Status.JEOPARDY:
+                    jeopardy[frozenset((bridge.origin, bridge.dest))] = bridge
 
     def bi_bfs(self, si: Coord, sg: Coord) -> bool:
         """ Run Bi-BFS algorithm to find path between start and goal state
@@ -135,62 +132,49 @@ class Board:
         Returns: (bool)
             True if path exists between si and sg, False if not
         """
+        colors = self.colors
+        nbrs = self.topology.nbrs
+        nbr_start = self.topology.nbr_start
+
         # initialize the forward open and closed (set) lists twith starting state
-        color = self.cells[si].color
-        openf = []
-        openf.append(si)
+        start = self.topology.index[si]
+        color = colors[start]
+        openf = [start]
         counterf = 0
-        closedf = set()
-        closedf.add(si)
+        closedf = {start}
 
         # initialize the backward lists with goal state
-        openb = []
-        openb.append(sg)
+        goal = self.topology.index[sg]
+        openb = [goal]
         counterb = 0
-        closedb = set()
-        closedb.add(sg)
+        closedb = {goal}
 
         search_forwards = True
 
         # run Bi-BS
         while counterf < len(openf) and counterb < len(openb):
             if search_forwards:
-                coord = openf[counterf]
-                counterf+=1
-
-                # get a list of children of the node that are the same color
-                children = []
-                for node in self.cells[coord].neighbours:
-                    if self.cells[node].color == color:
-                        children.append(node)
-
-                for child in children:
-                    # if the child exists in the closed backwards list, a path has been found and the game won
-                    if child in closedb:
-                        return True
-
-                    # if the child does not exist in the closed forward list, add to open and closed forward lists
-                    if child not in closedf:
-                        openf.append(child)
-                        closedf.add(child)
-
-            # else, expand from backwards (same as done above but with switched backwards/forwards lists)
+                node = openf[counterf]
+                counterf += 1
+                opened, closed, other = openf, closedf, closedb
+            # else, expand from backwards (same as forwards but with switched lists)
             else:
-                coord = openb[counterb]
+                node = openb[counterb]
                 counterb += 1
-
-                children = []
-                for node in self.cells[coord].neighbours:
-                    if self.cells[node].color == color:
-                        children.append(node)
-
-                for child in children:
-                    if child in closedf:
-                        return True
-
-                    if child not in closedb:
-                        openb.append(child)
-                        closedb.add(child)
+                opened, closed, other = openb, closedb, closedf
+
+            # children are the neighbours of the node that are the same color
+            for k in range(nbr_start[node], nbr_start[node+1]):
+                child = nbrs[k]
+                if colors[child] != color:
+                    continue
+                # if the child exists in the other closed list, a path has been found and the game won
+                if child in other:
+                    return True
+                # if the child does not exist in this closed list, add to open and closed lists
+                if child not in closed:
+                    opened.append(child)
+                    closed.add(child)
 
             search_forwards = not search_forwards
 
@@ -198,6 +182,95 @@ class Board:
         return False
 
 
+    def __join_groups(self, coord: Coord, present: set = None) -> int:
+        """ Merge the group of a newly placed stone with its same-coloured neighbours
+
+        Parameters:
+            coord: (Coord) coordinate of the stone that was just placed
+            present: (set[int]) if given, only neighbours with these ids count as placed
+
+        Returns: (int)
+            checkpoint taken before merging, used to undo the merge
+        """
+        checkpoint = self.__groups.checkpoint()
+        index = self.topology.index[coord]
+        color = self.colors[index]
+        for k in range(self.topology.nbr_start[index], self.topology.nbr_start[index+1]):
+            node = self.topology.nbrs[k]
+            if self.colors[node] == color and (present is None or node in present):
+                self.__groups.union(index, node)
+        return checkpoint
+
+    def __rebuild_groups(self) -> None:
+        """ Rebuild the stone groups from scratch by replaying every placed stone
+
+        Only needed when a stone other than the most recent one is removed
+        """
+        self.__groups = DisjointSet(self.topology.cell_count())
+        # a stone may only join stones placed before it, so each checkpoint stays a valid undo point
+        present = {self.topology.top, self.topology.bottom, self.topology.left, self.topology.right}
+        placed = self.__placed
+        self.__placed = []
+        for coord, _ in placed:
+            self.__placed.append((coord, self.__join_groups(coord, present)))
+            present.add(self.topology.index[coord])
+
+    def __toggle_hash(self, index: int, color: Color) -> None:
+        """ Add or remove (xor is its own inverse) a stone from both zobrist hashes
+
+        Parameters:
+            index: (int) id of the cell
+            color: (Color) colour of the stone
+        """
+        keys = self.topology.zobrist[color]
+        self.__hash ^= keys[index]
+        self.__rotated_hash ^= keys[self.topology.rotation[index]]
+
+    def key(self, canonical: bool = False) -> int:
+        """ Get the zobrist hash of the current position
+
+        Parameters:
+            canonical: (bool) fold the position with its 180 degree rotation,
+                so both orientations share one key
+
+        Returns: (int)
+            64-bit position key
+        """
+        if canonical:
+            return min(self.__hash, self.__rotated_hash)
+        return self.__hash
+
+    def connected(self, a: Coord, b: Coord) -> bool:
+        """ Check whether two cells belong to the same group of stones
+
+        Parameters:
+            a: (Coord) first cell
+            b: (Coord) second cell
+
+        Returns: (bool)
+            True if a chain of same-coloured stones joins a and b, False if not
+        """
+        return self.__groups.connected(self.topology.index[a], self.topology.index[b])
+
+    def candidates(self, color: Color) -> list:
+        """ Get the empty cells worth playing for a player
+
+        Dead cells, cells either player has captured and cells dominated by
+        the opponent's captures (see inferior.py) are left out. If that
+        leaves nothing, every empty cell is returned so there is still a move.
+
+        Parameters:
+            color: (Color) player to move
+
+        Returns: (list[Coord])
+            candidate moves, in cell id order
+        """
+        pruned = InferiorCells(self.topology, self.colors).pruned(color)
+        coords = self.topology.coords
+        empty = COLOR_CODES[Color.EMPTY]
+        moves = [coords[i] for i in range(self.__boardsize ** 2) if self.colors[i] == empty and i not in pruned]
+        return moves if moves else list(self.empties)
+
     def check_win(self, movecount: int) -> Color:
         """ Check whether or not the game has come to a close
 
@@ -211,10 +284,10 @@ class Board:
         if (movecount < self.__boardsize*2-1):
             return Color.EMPTY
         # check if white has won
-        if self.bi_bfs(Edges.TOP, Edges.BOTTOM):
+        if self.connected(Edges.TOP, Edges.BOTTOM):
             return Color.WHITE
         # check if black has won
-        elif self.bi_bfs(Edges.LEFT, Edges.RIGHT):
+        elif self.connected(Edges.LEFT, Edges.RIGHT):
             return Color.BLACK
         # return no one has won
         return Color.EMPTY
@@ -247,6 +320,9 @@ class Board:
     def set(self, coord: Coord, color: Color) -> bool:
         """ Set a piece on an empty cell of the board
 
+        Bridge statuses are left alone (see play), and the undo log is
+        cleared, since it no longer leads back from this position
+
         Parameters:
             coord: (Coord) coordinate to place the piece on
             color: (Color) what colour piece to place
@@ -254,32 +330,149 @@ class Board:
         Returns: (bool)
             True if successful, False if the cell was not empty
         """
-        if self.cells[coord].color != Color.EMPTY:
+        if not self.__place(coord, color):
             return False
-        self.cells[coord].color = color
-        if color == Color.BLACK:
-            self.blacks[coord] = self.empties.pop(coord)
-        elif color == Color.WHITE:
-            self.whites[coord] = self.empties.pop(coord)
-        else:
-            return False  # attempted to set a cell to empty. use unset()
+        self.__history.clear()
         return True
 
     def unset(self, coord: Coord) -> bool:
         """ Remove a piece from the board
 
+        Like set, this leaves bridge statuses alone and clears the undo log
+
         Parameters:
             coord: (Coord) coordinate to remove the piece from
 
         Returns: (bool)
             True if successful, False if there was no piece there
         """
+        if not self.__remove(coord):
+            return False
+        self.__history.clear()
+        return True
+
+    def play(self, coord: Coord, color: Color) -> bool:
+        """ Make a move: set a piece, update the two-bridges around it and log both for undo
+
+        Parameters:
+            coord: (Coord) coordinate to place the piece on
+            color: (Color) what colour piece to place
+
+        Returns: (bool)
+            True if successful, False if the cell was not empty
+        """
+        if not self.__place(coord, color):
+            return False
+        changes = []
+        self.update_bridges(coord, changes)
+        self.__history.append((coord, changes))
+        return True
+
+    def undo(self) -> Coord:
+        """ Take back the latest move made with play
+
+        Only the bridges the move changed are touched, each put back to the
+        status it had, so the cost is the size of the move's log entry
+
+        Returns: (Coord)
+            the cell that was emptied, None if there is no move to take back
+        """
+        if not self.__history:
+            return None
+        coord, changes = self.__history.pop()
+        self.__remove(coord)
+        for bridge, status in changes:
+            current = bridge.status
+            bridge.status = status
+            self.__index_jeopardy(bridge, current)
+        return coord
+
+    def last_played(self) -> Coord:
+        """ Get the move undo would take back
+
+        Returns: (Coord)
+            the cell of the latest move made with play, None if there is none
+        """
+        return self.__history[-1][0] if self.__history else None
+
+    def refresh_bridge(self, bridge: TwoBridge, changes: list = None) -> None:
+        """ Recompute one TwoBridge status and keep the jeopardy index in step
+
+        Parameters:
+            bridge: (TwoBridge) the bridge to update
+            changes: (list) if given, (bridge, old status) is appended when the status changes
+        """
+        old_status = bridge.status
+        if bridge.update_status(self) == old_status:
+            return
+        self.__index_jeopardy(bridge, old_status)
+        if changes is not None:
+            changes.append((bridge, old_status))
+
+    def update_bridges(self, coord: Coord, changes: list = None) -> None:
+        """ Update the TwoBridge statuses of nearby cells after a move (or an unset)
+
+        Uses the topology's reverse index, so each bridge the cell is an
+        origin, dest or carrier of is updated exactly once per colour
+
+        Parameters:
+            coord: (Coord) the coordinate of the cell that changed
+            changes: (list) if given, collects (bridge, old status) of every bridge that changed
+        """
+        topology = self.topology
+        white_bridges = self.bridges[Color.WHITE]
+        black_bridges = self.bridges[Color.BLACK]
+        index = topology.index[coord]
+        for k in range(topology.affected_start[index], topology.affected_start[index+1]):
+            b = topology.affected[k]
+            self.refresh_bridge(white_bridges[b], changes)
+            self.refresh_bridge(black_bridges[b], changes)
+
+    def __index_jeopardy(self, bridge: TwoBridge, old_status: Status) -> None:
+        """ Add a bridge to or drop it from the jeopardy index after its status changed
+
+        Parameters:
+            bridge: (TwoBridge) the bridge, already holding its new status
+            old_status: (Status) the status it had before
+        """
+        # both directions of a bridge share one entry, keyed by its unordered ends
+        key = frozenset((bridge.origin, bridge.dest))
+        if bridge.status == Status.JEOPARDY:
+            self.jeopardy[bridge.color][key] = bridge
+        elif old_status == Status.JEOPARDY:
+            self.jeopardy[bridge.color].pop(key, None)
+
+    def __place(self, coord: Coord, color: Color) -> bool:
+        if self.cells[coord].color != Color.EMPTY or color == Color.EMPTY:
+            return False  # attempted to set a cell to empty. use unset()
+        index = self.topology.index[coord]
+        self.cells[coord].color = color
+        self.colors[index] = COLOR_CODES[color]
+        self.__toggle_hash(index, color)
+        if color == Color.BLACK:
+            self.blacks[coord] = self.empties.pop(coord)
+        else:
+            self.whites[coord] = self.empties.pop(coord)
+        self.__placed.append((coord, self.__join_groups(coord)))
+        return True
+
+    def __remove(self, coord: Coord) -> bool:
         if self.cells[coord].color == Color.EMPTY:
             return False
         old_color = self.cells[coord].color
+        index = self.topology.index[coord]
         self.cells[coord].color = Color.EMPTY
+        self.colors[index] = COLOR_CODES[Color.EMPTY]
+        self.__toggle_hash(index, old_color)
         if old_color == Color.BLACK:
             self.empties[coord] = self.blacks.pop(coord)
         else:
             self.empties[coord] = self.whites.pop(coord)
+
+        # undoing the latest stone is a cheap rollback, anything else needs a rebuild
+        if self.__placed[-1][0] == coord:
+            self.__groups.rollback(self.__placed.pop()[1])
+        else:
+            self.__placed = [entry for entry in self.__placed if entry[0] != coord]
+            self.__rebuild_groups()
         return True
@@ -0,0 +1,133 @@
+# book.py
+
+import os
+import struct
+from constants import *
+
+BOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+HEADER = struct.Struct("<4sHH")  # magic, version, board size
+RECORD = struct.Struct("<QH")    # position key, cell id of the reply
+MAGIC = b"HXBK"
+VERSION = 1
+SWAP = 0xFFFF
+
+# xored into the position key when black is to move; the swap rule means
+# either colour can face the same stones, so the stones alone are not enough
+SIDE_KEYS = {Color.WHITE: 0, Color.BLACK: 0x9E3779B97F4A7C15}
+
+
+def book_path(size: int) -> str:
+    return os.path.join(BOOK_DIR, "hex{}.book".format(size))
+
+
+def book_key(board: object, to_move: Color) -> tuple:
+    """ Get the key a position is stored under, folded with its 180 degree rotation
+
+    Parameters:
+        board: (Board) the board in current gamestate
+        to_move: (Color) player to move
+
+    Returns:
+        key (int): canonical zobrist key mixed with the side to move
+        rotated (bool): True if the key is that of the rotated position, so
+            moves are stored in the rotated frame
+    """
+    key = board.key(canonical=True)
+    return key ^ SIDE_KEYS[to_move], key != board.key()
+
+
+class OpeningBook:
+    __cache = dict()
+
+    def __init__(self, size: int, path: str = None) -> None:
+        """ Create an OpeningBook object: replies to known positions, read from disk
+
+        The file is a header followed by fixed-size (key, move) records. It
+        is only read the first time a position is looked up, so bots that
+        never reach the opening (or sizes without a book) pay nothing.
+
+        Parameters:
+            size: (int) size of the game board
+            path: (str) book file, defaults to books/hex<size>.book
+        """
+        self.size = size
+        self.path = path if path is not None else book_path(size)
+        self.__moves = None
+
+    @staticmethod
+    def get(size: int) -> object:
+        """ Get the shared book for a board size, so every bot reads the file once
+
+        Parameters:
+            size: (int) size of the game board
+
+        Returns: (OpeningBook)
+            the cached book for this size
+        """
+        if size not in OpeningBook.__cache:
+            OpeningBook.__cache[size] = OpeningBook(size)
+        return OpeningBook.__cache[size]
+
+    def __load(self) -> dict:
+        """ Read the book file into a key -> move table
+
+        Returns: (dict[int, int])
+            cell id (or SWAP) by position key; empty if there is no usable book
+        """
+        self.__moves = dict()
+        if not os.path.exists(self.path):
+            return self.__moves
+        with open(self.path, "rb") as file:
+            data = file.read()
+        if len(data) < HEADER.size:
+            return self.__moves
+        magic, version, size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or size != self.size:
+            return self.__moves
+        for key, move in RECORD.iter_unpack(memoryview(data)[HEADER.size:]):
+            self.__moves[key] = move
+        return self.__moves
+
+    def __len__(self) -> int:
+        moves = self.__moves if self.__moves is not None else self.__load()
+        return len(moves)
+
+    def lookup(self, board: object, to_move: Color) -> str:
+        """ Find the book reply to a position
+
+        Parameters:
+            board: (Board) the board in current gamestate
+            to_move: (Color) player to move
+
+        Returns: (str)
+            human-readable move, "swap", or None if the position is not in the
+            book or its reply is no longer legal
+        """
+        moves = self.__moves if self.__moves is not None else self.__load()
+        if not moves or board.getsize() != self.size:
+            return None
+        key, rotated = book_key(board, to_move)
+        move = moves.get(key)
+        if move is None:
+            return None
+        if move == SWAP:
+            return "swap"
+        if rotated:
+            move = board.topology.rotation[move]
+        if board.colors[move] != COLOR_CODES[Color.EMPTY]:
+            return None
+        return str(board.topology.coords[move])
+
+    @staticmethod
+    def write(path: str, size: int, moves: dict) -> None:
+        """ Write a book file
+
+        Parameters:
+            path: (str) file to write
+            size: (int) size of the game board
+            moves: (dict[int, int]) cell id (or SWAP) by position key
+        """
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, size))
+            for key in sorted(moves):
+                file.write(RECORD.pack(key, moves[key]))
@@ -1,31 +1,82 @@
 # bot.py
 
 from random import choice, seed
+from time import perf_counter
+from threading import Event, Thread
 from constants import *
 from coord import Coord
 from board import Board
 from cell import Cell
-import heapq
-
-seed(42)  # Get same results temporarily
+from twobridge import TwoBridge
+from pathfinder import shortest_path
+from transposition import TranspositionTable
+from mcts import MCTS
+from parallel import RootParallelSearch
+from timemanager import TimeManager
+from book import OpeningBook
+from hsearch import HSearch, carrier_limit
+from stats import CommandStats
+
+SEED = 42
+seed(SEED)  # Get same results temporarily
+
+# an opponent needing more stones than this has never had an edge-to-edge
+# connection, so the must-play search is not run (or kept up to date) for them
+MUST_PLAY_COST = 3
+# share of the move's remaining time the must-play search may take
+MUST_PLAY_SHARE = 0.25
 
 # Note: BLACK goes left->right, WHITE goes top->bottom in our orientation
 # the acute corner is bottom-left
 # numbers run across the upwards, letters run rightwards (like a chessboard)
 
 class HexBot:
-    def __init__(self, color: Color, board_size: int = 10) -> None:
+    def __init__(
+            self,
+            color: Color,
+            board_size: int = 10,
+            tt_size: int = 1 << 16,
+            strategy: str = "classic",
+            move_time: float = 1.0,
+            workers: int = 1,
+            merge: str = "sum",
+            game_time: float = None,
+            ponder: bool = False,
+            hsearch: bool = False,
+            max_carrier: int = None
+            ) -> None:
         """ Create a HexBot object
 
         Parameters:
             color: (Color) what colour tiles this bot is playing
             board_size: (int) gameboard dimensions (default 10)
+            tt_size: (int) number of entries in the transposition table (default 65536)
+            strategy: (str) "classic" for the path heuristics, "mcts" for tree search
+            move_time: (float) most seconds any move may take (default 1.0)
+            workers: (int) processes the mcts strategy searches with (default 1)
+            merge: (str) how parallel root results are combined, "sum" or "vote"
+            game_time: (float) seconds on our clock for the whole game (default untimed)
+            ponder: (bool) keep the mcts search running on the opponent's time (default False)
+            hsearch: (bool) have the classic strategy block the opponent's virtual connections,
+                found by H-search (default False)
+            max_carrier: (int) most cells in a virtual connection's carrier (default 10 up
+                to 13x13, 8 on larger boards)
         """
         self.color = color
+        self.tt = TranspositionTable(tt_size)
+        self.strategy = strategy
+        self.clock = TimeManager(game_time, move_time)
+        self.mcts = None
+        self.parallel = RootParallelSearch(workers, merge) if workers > 1 else None
+        self.pondering = ponder
+        self.use_hsearch = hsearch
+        self.max_carrier = max_carrier
+        self.__ponder_thread = None
+        self.__ponder_stop = Event()
+        self.latencies = CommandStats()
         self.opp = Color.BLACK if color == Color.WHITE else Color.WHITE
         self.move_count = 0
         self.swap_happened = False
-        self.jeopardized = 0
         self.init_board(board_size)
 
         self.pub = {
@@ -37,6 +88,8 @@ class HexBot:
             "sety": self.sety,
             "unset": self.unset,
             "check_win": self.check_win,
+            "time_left": self.time_left,
+            "stats": self.stats,
         }
 
         self.argnums = {
@@ -48,6 +101,8 @@ class HexBot:
             "sety": 1,
             "unset": 1,
             "check_win": 0,
+            "time_left": 1,
+            "stats": (0, 1),  # (fewest, most) for commands with an optional argument
         }
 
     def is_cmd(self, cmd: list) -> bool:
@@ -62,7 +117,9 @@ class HexBot:
         assert len(cmd)
         if cmd[0] not in self.pub:
             return False
-        if len(cmd) - 1 != self.argnums[cmd[0]]:
+        count = self.argnums[cmd[0]]
+        fewest, most = count if isinstance(count, tuple) else (count, count)
+        if not fewest <= len(cmd) - 1 <= most:
             return False
         return True
 
@@ -72,10 +129,15 @@ class HexBot:
         Parameters:
             cmd (list[str]): A space-separated list of the commands given on the command line
         """
+        start = perf_counter()
+        # any command may change the position, so background search always ends first
+        self.stop_ponder()
         if len(cmd) > 1:
             self.pub[cmd[0]](cmd[1])
         else:
             self.pub[cmd[0]]()
+        if cmd[0] != "stats":
+            self.latencies.record(cmd[0], perf_counter() - start)
 
     def init_board(self, board_size: int) -> None:
         """ Tells the bot to reset the game to an empty board with a specified side length
@@ -83,9 +145,44 @@ class HexBot:
         Parameters:
             board_size: (int) The width & height of the hex game board to create
         """
-        self.board_size = int(board_size)
-        self.board = Board(self.board_size)
+        board_size = int(board_size)
+        # reuse the current board in place when the size is unchanged; geometry is shared per size
+        if getattr(self, "board", None) is not None and self.board_size == board_size:
+            self.board.reset()
+        else:
+            self.board_size = board_size
+            self.board = Board(self.board_size)
+            self.book = OpeningBook.get(self.board_size)
+            self.hsearch = dict()  # virtual connections by colour, built when first needed
         self.move_count = 0
+        # searches of a reused board are kept; they derive their connections again when next asked
+        for search in self.hsearch.values():
+            search.invalidate()
+        self.tt.clear()  # keys do not encode the size; every empty board has key 0
+        self.clock.reset()
+
+    def time_left(self, seconds: str) -> None:
+        """ Tells the bot how much time is left on its game clock
+
+        Parameters:
+            seconds: (str) remaining time in seconds, eg. "93.5"
+        """
+        self.clock.set_remaining(float(seconds))
+
+    def stats(self, option: str = None) -> None:
+        """ Report how long each command has taken so far
+
+        Parameters:
+            option: (str) nothing to print a line per command, "reset" to clear the
+                counts, anything else is a path to write the histograms to as JSON
+        """
+        if option is None:
+            for line in self.latencies.summary():
+                print(line)
+        elif option == "reset":
+            self.latencies.reset()
+        else:
+            self.latencies.dump(option)
 
     def show_board(self) -> None:
         """ Prints the board to stdout
@@ -96,31 +193,27 @@ class HexBot:
         print("Move count:", self.move_count)
         self.board.display()
 
+    @property
+    def jeopardized(self) -> int:
+        """ Number of two-bridges (either colour) with one carrier taken by the opponent
+        """
+        return len(self.board.jeopardy[Color.WHITE]) + len(self.board.jeopardy[Color.BLACK])
+
+    def refresh_twobridge(self, bridge: TwoBridge) -> None:
+        """ Recompute one TwoBridge status and keep the board's jeopardy index in step
+
+        Parameters:
+            bridge: (TwoBridge) the bridge to update
+        """
+        self.board.refresh_bridge(bridge)
+
     def update_twobridges(self, coord: Coord) -> None:
-        """ Update the TwoBridge statuses of nearby cells after a move
+        """ Update the TwoBridge statuses of nearby cells after a move (or an unset)
 
         Parameters:
             coord: (Coord) the coordinate of the cell that was just played on
         """
-        temp_jeopardy = 0
-        # update TwoBridge statuses of this cell and its reciprocal twobridges
-        for dest in self.board.cells[coord].white_twobridges:
-            # TODO: record the new status and act on it if in jeopardy
-            temp_jeopardy += 1 if self.board.cells[coord].white_twobridges[dest].update_status(self.board) == Status.JEOPARDY else 0
-            temp_jeopardy += 1 if self.board.cells[coord].black_twobridges[dest].update_status(self.board) == Status.JEOPARDY else 0
-            temp_jeopardy += 1 if self.board.cells[dest].white_twobridges[coord].update_status(self.board) == Status.JEOPARDY else 0
-            temp_jeopardy += 1 if self.board.cells[dest].black_twobridges[coord].update_status(self.board) == Status.JEOPARDY else 0
-
-        # update the relevant TwoBridge statuses of this cell's neighbours
-        for neighbour in self.board.cells[coord].neighbours:
-            for n_dest in self.board.cells[neighbour].white_twobridges:
-                if coord not in self.board.cells[neighbour].white_twobridges[n_dest].depends:
-                    continue
-                temp_jeopardy += 1 if self.board.cells[neighbour].white_twobridges[n_dest].update_status(self.board) == Status.JEOPARDY else 0
-                temp_jeopardy += 1 if self.board.cells[neighbour].black_twobridges[n_dest].update_status(self.board) == Status.JEOPARDY else 0
-
-        self.jeopardized += temp_jeopardy/2
-        return
+        self.board.update_bridges(coord)
 
     def set_piece(self, coord: Coord, color: Color) -> bool:
         """ Set a piece on an empty cell of our gameboard
@@ -132,10 +225,16 @@ class HexBot:
         Returns: (bool)
             True if successful, False if the cell was not empty
         """
-        if not self.board.set(coord, color):
+        # the search tree can follow the move if it was rooted at this exact position
+        follow = self.mcts is not None and self.mcts.root is not None and \
+            self.mcts.to_move == COLOR_CODES[color] and self.mcts.colors == self.board.colors
+        if not self.board.play(coord, color):
             return False
         self.move_count += 1
-        self.update_twobridges(coord)
+        for search in self.hsearch.values():
+            search.play(coord, color)
+        if follow:
+            self.mcts.advance(self.board.topology.index[coord])
         return True
 
     def seto(self, move: str) -> bool:
@@ -148,7 +247,7 @@ class HexBot:
             True if successful, False if the tile was not empty
         """
         # note: move must be of type str to conform with the driver code
-        coord = Coord(*Coord.str2cart(move))
+        coord = self.board.parse(move)
         return self.set_piece(coord, self.opp)
 
     def sety(self, move: str) -> bool:
@@ -160,7 +259,7 @@ class HexBot:
         Returns: (bool)
             True if successful, False if the tile was not empty
         """
-        coord = Coord(*Coord.str2cart(move))
+        coord = self.board.parse(move)
         return self.set_piece(coord, self.color)
 
     def swap(self) -> bool:
@@ -185,10 +284,17 @@ class HexBot:
         Returns: (bool)
             True if the move has been unmade, False if the tile was alr empty
         """
-        coord = Coord(*Coord.str2cart(move))
-        if not self.board.unset(coord):
+        coord = self.board.parse(move)
+        # the latest move is taken back from the board's undo log; any other needs its bridges redone
+        if self.board.last_played() == coord:
+            self.board.undo()
+        elif self.board.unset(coord):
+            self.update_twobridges(coord)
+        else:
             return False
-        self.update_twobridges(coord)
+        self.move_count -= 1
+        for search in self.hsearch.values():
+            search.unplay(coord)
         return True
 
     def check_win(self) -> None:
@@ -209,277 +315,26 @@ class HexBot:
     def early_move(self) -> str:
         """ Determine what move to make if it is early game
 
+        Looks the position up in the opening book; positions the book does
+        not cover get a random move
+
         Returns: (str)
-            Human-readable coordinate on which we decide to make our move
+            Human-readable coordinate on which we decide to make our move, or "swap"
         """
-        white_bad_moves = ["a1", "a2", "a3", "a4", "a5", "a6", "a7", "a8", "a9", \
-                           "j10", "j9", "j8", "j7", "j6", "j5", "j4", "j3", "j2", \
-                            "b1", "b2", "i9", "i10"]
-
-        black_bad_moves = ["a1", "b1", "c1", "d1", "e1", "f1", "g1", "h1", "i1", \
-                           "j10", "i10", "h10", "g10", "f10", "e10", "d10", "c10", "b10", \
-                            "a2", "b2", "i9", "j9"]
-
-        if self.move_count == 0:
-            return "b2"
-
-        if self.move_count == 1:
-            if self.color == Color.WHITE:
-                for coord in self.board.blacks:
-                    if coord not in (Edges.LEFT, Edges.RIGHT):
-                        first_move = coord
-                return "e6" if first_move in white_bad_moves else "swap"
-            else:
-                for coord in self.board.whites:
-                    if coord not in (Edges.TOP, Edges.BOTTOM):
-                        first_move = coord
-                return "f5" if first_move in black_bad_moves else "swap"
-
-        if self.move_count == 2:
-            if not self.swap_happened:
-                # they DID NOT swap move. fight for control, ideally blocking
-                # we have a piece on b2, they have a piece somewhere
-                if self.color == Color.WHITE:
-                    for coord in self.board.blacks:
-                        if coord not in (Edges.LEFT, Edges.RIGHT):
-                            their_move = coord
-                    # if they played centrally, perform classic block on their far side
-                    if str(their_move) in ("d5"):
-                        return "g4"
-                    elif str(their_move) in ("e5"):
-                        return "h4"
-                    elif str(their_move) in ("f5"):
-                        return "c6"
-                    elif str(their_move) in ("g5"):
-                        return "d6"
-                    elif str(their_move) in ("d6"):
-                        return "g5"
-                    elif str(their_move) in ("e6"):
-                        return "h5"
-                    elif str(their_move) in ("f6"):
-                        return "c7"
-                    elif str(their_move) in ("g6"):
-                        return "d7"
-                    elif str(their_move) in ("d7", "e7"):
-                        return "g6"
-                    elif str(their_move) in ("f7"):
-                        return "c7"
-                    elif str(their_move) in ("g7"):
-                        return "d7"
-                    elif str(their_move) in ("d4"):
-                        return "g4"
-                    elif str(their_move) in ("e4"):
-                        return "h4"
-                    elif str(their_move) in ("f4", "g4"):
-                        return "d5"
-                    # if they didn't centrally, then we claim the centre
-                    else:
-                        return "e6"
-                else:
-                    for coord in self.board.whites:
-                        if coord not in (Edges.TOP, Edges.BOTTOM):
-                            their_move = coord
-                    # if they played centrally, perform classic block on their far side
-                    if str(their_move) in ("e4"):
-                        return "d7"
-                    elif str(their_move) in ("e5"):
-                        return "d8"
-                    elif str(their_move) in ("e6"):
-                        return "f3"
-                    elif str(their_move) in ("e7"):
-                        return "f4"
-                    elif str(their_move) in ("f4"):
-                        return "e7"
-                    elif str(their_move) in ("f5"):
-                        return "e8"
-                    elif str(their_move) in ("f6"):
-                        return "g3"
-                    elif str(their_move) in ("f7"):
-                        return "g4"
-                    elif str(their_move) in ("g4", "g5"):
-                        return "f7"
-                    elif str(their_move) in ("g6"):
-                        return "g3"
-                    elif str(their_move) in ("g7"):
-                        return "g4"
-                    elif str(their_move) in ("d4"):
-                        return "d7"
-                    elif str(their_move) in ("d5"):
-                        return "d8"
-                    elif str(their_move) in ("d6", "d7"):
-                        return "e4"
-                    # if they didn't centrally, then we claim the centre
-                    else:
-                        return "f5"
-            else:
-                # swap move occurred. claim centre
-                # this means opponent has a piece in b2 now
-                # (or they didn't swap, but didn't play centrally)
-                return "e6" if self.color == Color.WHITE else "f5"
-
-        if self.move_count == 3:
-            if not self.swap_happened:
-                if self.color == Color.WHITE:
-                    for coord in self.board.blacks:
-                        if coord not in (Edges.LEFT, Edges.RIGHT):
-                            if str(coord) not in white_bad_moves:
-                                last_move = coord
-                                break
-                    else:
-                        for coord in self.board.blacks:
-                            if coord not in (Edges.LEFT, Edges.RIGHT):
-                                last_move = coord
-                    if last_move.gety() > 6:
-                        if self.board.cells[Coord(4, 7)].color == Color.BLACK:
-                            return "f7"
-                        elif self.board.cells[Coord(5, 7)].color == Color.BLACK:
-                            return "d7"
-                        elif self.board.cells[Coord(4, 9)].color == Color.BLACK:
-                            return "g7"
-                        elif self.board.cells[Coord(3, 9)].color == Color.BLACK:
-                            return "f7"
-                        elif self.board.cells[Coord(4, 8)].color == Color.BLACK:
-                            return "f7"
-                        else:
-                            return "d8"
-                    else:
-                        if self.board.cells[Coord(5, 5)].color == Color.BLACK:
-                            return "f5"
-                        elif self.board.cells[Coord(6, 5)].color == Color.BLACK:
-                            return "e5"
-                        for x in range(1, 11):
-                            if self.board.cells[Coord(x, 5)].color == Color.BLACK or \
-                                    self.board.cells[Coord(x, 6)].color == Color.BLACK:
-                                return "f4"
-                        right_of_f = False
-                        for x in range(1, 6):
-                            for y in range(6, 11):
-                                if self.board.cells[Coord(x, y)].color == Color.BLACK:
-                                    right_of_f = True
-                        if not right_of_f:
-                            return "h3"
-                        else:
-                            return "e3"
-                else:  # we are black
-                    for coord in self.board.whites:
-                        if coord not in (Edges.TOP, Edges.BOTTOM):
-                            if str(coord) not in black_bad_moves:
-                                last_move = coord
-                                break
-                    else:
-                        for coord in self.board.blacks:
-                            if coord not in (Edges.TOP, Edges.BOTTOM):
-                                last_move = coord
-                    if last_move.getx() > 6:
-                        if self.board.cells[Coord(7, 4)].color == Color.WHITE:
-                            return "g6"
-                        elif self.board.cells[Coord(7, 5)].color == Color.WHITE:
-                            return "g4"
-                        elif self.board.cells[Coord(9, 4)].color == Color.WHITE:
-                            return "g7"
-                        elif self.board.cells[Coord(9, 3)].color == Color.WHITE:
-                            return "g6"
-                        elif self.board.cells[Coord(8, 4)].color == Color.WHITE:
-                            return "g6"
-                        else:
-                            return "h4"
-                    else:
-                        if self.board.cells[Coord(5, 5)].color == Color.WHITE:
-                            return "e6"
-                        elif self.board.cells[Coord(6, 5)].color == Color.WHITE:
-                            return "e5"
-                        for y in range(1, 11):
-                            if self.board.cells[Coord(5, y)].color == Color.WHITE or \
-                                    self.board.cells[Coord(6, y)].color == Color.WHITE:
-                                return "d6"
-                        above_6 = False
-                        for x in range(1, 5):
-                            for y in range(6, 11):
-                                if self.board.cells[Coord(x, y)].color == Color.WHITE:
-                                    above_6 = True
-                        if not above_6:
-                            return "c8"
-                        else:
-                            return "c5"
-            else:  # swap happened
-                if self.color == Color.WHITE:
-                    for coord in self.board.blacks:
-                        if coord not in (Edges.LEFT, Edges.RIGHT):
-                            their_move = coord
-                    # if they played centrally, perform classic block on their far side
-                    if str(their_move) in ("d5"):
-                        return "g4"
-                    elif str(their_move) in ("e5"):
-                        return "h4"
-                    elif str(their_move) in ("f5"):
-                        return "c6"
-                    elif str(their_move) in ("g5"):
-                        return "d6"
-                    elif str(their_move) in ("d6"):
-                        return "g5"
-                    elif str(their_move) in ("e6"):
-                        return "h5"
-                    elif str(their_move) in ("f6"):
-                        return "c7"
-                    elif str(their_move) in ("g6"):
-                        return "d7"
-                    elif str(their_move) in ("d7", "e7"):
-                        return "g6"
-                    elif str(their_move) in ("f7"):
-                        return "c7"
-                    elif str(their_move) in ("g7"):
-                        return "d7"
-                    elif str(their_move) in ("d4"):
-                        return "g4"
-                    elif str(their_move) in ("e4"):
-                        return "h4"
-                    elif str(their_move) in ("f4", "g4"):
-                        return "d5"
-                    # if they didn't centrally, then we claim the centre
-                    else:
-                        return "e6"
-                else:
-                    for coord in self.board.whites:
-                        if coord not in (Edges.TOP, Edges.BOTTOM):
-                            their_move = coord
-                    # if they played centrally, perform classic block on their far side
-                    if str(their_move) in ("e4"):
-                        return "d7"
-                    elif str(their_move) in ("e5"):
-                        return "d8"
-                    elif str(their_move) in ("e6"):
-                        return "f3"
-                    elif str(their_move) in ("e7"):
-                        return "f4"
-                    elif str(their_move) in ("f4"):
-                        return "e7"
-                    elif str(their_move) in ("f5"):
-                        return "e8"
-                    elif str(their_move) in ("f6"):
-                        return "g3"
-                    elif str(their_move) in ("f7"):
-                        return "g4"
-                    elif str(their_move) in ("g4", "g5"):
-                        return "f7"
-                    elif str(their_move) in ("g6"):
-                        return "g3"
-                    elif str(their_move) in ("g7"):
-                        return "g4"
-                    elif str(their_move) in ("d4"):
-                        return "d7"
-                    elif str(their_move) in ("d5"):
-                        return "d8"
-                    elif str(their_move) in ("d6", "d7"):
-                        return "e4"
-                    # if they didn't centrally, then we claim the centre
-                    else:
-                        return "f5"
-
-        return str(choice(self.board.empties))
+        move = self.book.lookup(self.board, self.color)
+        if move == "swap" and self.move_count != 1:
+            move = None  # swapping is only legal as the second move of the game
+        if move is not None:
+            return move
+        return str(choice(list(self.board.empties)))
 
     def dijkstra(self, start: Cell, goal: Cell, player: Color) -> tuple:
         """ Returns an optimal path between start and goal
 
+        Runs the 0-1 BFS in pathfinder.py; no state is stored on the Cells.
+        Results are cached in the transposition table by position, so a
+        position seen before (eg. after an unset) is not searched again.
+
         Parameters:
             start (Cell): state from where to start search from
             goal (Cell): state we are trying to reach from start
@@ -489,132 +344,26 @@ class HexBot:
             (list[Coord]): a list that contains the coords in order that form an optimal path from start to goal
             g_value (int): an integer that represents the number of pieces that need to be played to secure this path
         """
+        key = hash((self.board.key(), start.coord, goal.coord, player))
+        result = self.tt.get(key)
+        if result is None:
+            result = shortest_path(self.board, start.coord, goal.coord, player)
+            self.tt.put(key, result, depth=len(result[0]))
+        return result
 
-        # start state has initial g value of 0; add to open and closed lists
-        open = []
-        start.g = 0
-        heapq.heappush(open, start)
-        closed = dict()
-        closed[start.coord] = start
-        
-        # what is to be returned if no path is found (indicates something has gone wrong)
-        final_g = -1
-        path = []
-
-        # run dijkstra's
-        while len(open)> 0:
-            # get the cheapest value in the open list, if it is the goal state, return it
-            state = heapq.heappop(open) 
-            if state == goal:
-                # we have reached edge, meaning we found a path; create a list of all previous nodes and their parents
-                final_g = state.g
-
-                if player == Color.WHITE:
-                    path.append(state.coord)
-                    while state.white_parent != state.coord:
-                        # while parent is not itself (while it isn't start state):
-                        path.append(state.white_parent)     # add parent to path
-                        state = self.board.cells[state.white_parent]     # set the state to be the parent
-                else:
-                    path.append(state.coord)
-                    while state.black_parent != state.coord:
-                        path.append(state.black_parent)
-                        state = self.board.cells[state.black_parent]
-
-                # return path (from start to goal) and number of pieces that need to be played
-                path.reverse()
-                return path, final_g
-            
-            # if cheapest is not goal state, check its children (neighbours and twobridges)
-            # calculate and save each child's g-value seperately (don't update cell directly)
-            children = []
-            g_values = []
-
-            # check all direct neighbours
-            for node in self.board.cells[state.coord].neighbours:
-                if self.board.cells[node].color == Color.EMPTY:
-                    # if neighbour is empty, cost of 1 to claim the space
-                    children.append(node)
-                    g_values.append(state.g+1) 
-                elif self.board.cells[node].color == player:
-                    # if the neighbour is friendly piece, then the cost of claiming the space is zero
-                    children.append(node)
-                    g_values.append(state.g+0)
-
-            # check two bridges of players color
-            if player == Color.WHITE:
-                for destcoord in self.board.cells[state.coord].white_twobridges:
-                    bridge = self.board.cells[state.coord].white_twobridges[destcoord]
-                    if bridge.status == Status.SUCCESS:
-                        # if twobridged, then we are connected at cost of 0
-                        children.append(bridge.dest)
-                        g_values.append(state.g+0)
-                    elif bridge.status == Status.READY:
-                        # if all empty, dest connects to origin in 1 move
-                        children.append(bridge.dest)
-                        g_values.append(state.g+1)
-                    elif bridge.status == Status.TO_BE:
-                        # if TO_BE, then check whether it is because of piece in dest or orig
-                        if state.color == player:
-                            # 'forwards' twobridge
-                            children.append(bridge.dest)
-                            g_values.append(state.g+1)
-                        else:
-                            # 'backwards' twobridge
-                            children.append(bridge.dest)
-                            g_values.append(state.g+0)
-
-            else:
-                for destcoord in self.board.cells[state.coord].black_twobridges:
-                    bridge = self.board.cells[state.coord].black_twobridges[destcoord]
-                    if bridge.status == Status.SUCCESS:
-                        children.append(bridge.dest)
-                        g_values.append(state.g+0)
-                    elif bridge.status == Status.READY:
-                        # if all empty, dest connects to origin in 1 move
-                        children.append(bridge.dest)
-                        g_values.append(state.g+1)
-                    elif bridge.status == Status.TO_BE:
-                        # if TO_BE, then check whether it is because of piece in dest or orig
-                        if state.color == player:
-                            # 'forwards' twobridge
-                            children.append(bridge.dest)
-                            g_values.append(state.g+1)
-                        else:
-                            # 'backwards' twobridge
-                            children.append(bridge.dest)
-                            g_values.append(state.g+0)
-            
-            for i in range(len(children)):
-                child = children[i]
-                current_g = g_values[i]
-
-                # if the child (Coord) not in closed list:
-                #       update corresponding Cell with parent and g-value and add to open and closed
-                if child not in closed:
-                    if player == Color.WHITE:
-                        self.board.cells[child].white_parent = state.coord  
-                        self.board.cells[child].g = current_g 
-                    else:
-                        self.board.cells[child].black_parent = state.coord  
-                        self.board.cells[child].g = current_g 
-                    heapq.heappush(open, self.board.cells[child])
-                    closed[child] = self.board.cells[child]
-
-                # if child in closed, but we found a better path to it, update accordingly
-                elif current_g < closed[child].g:
-                    if player == Color.WHITE:
-                        self.board.cells[child].white_parent = state.coord  
-                    else:
-                        self.board.cells[child].black_parent = state.coord  
-                    self.board.cells[child].g = current_g
+    def connections(self, color: Color) -> HSearch:
+        """ Get the virtual connections of a player; moves are followed when it is next asked
 
-                    # closed and open are lists of Cells, so by updating the cell, the lists are updated
-                    # open must be reheapified to ensure integrity of heap
-                    heapq.heapify(open)
+        Parameters:
+            color: (Color) player whose connections to get
 
-        # if the loop has exited and no solution found, there is no solution, so return accordingly
-        return path, final_g
+        Returns: (HSearch)
+            the player's connection search
+        """
+        if color not in self.hsearch:
+            limit = self.max_carrier if self.max_carrier is not None else carrier_limit(self.board_size)
+            self.hsearch[color] = HSearch(self.board, color, max_carrier=limit)
+        return self.hsearch[color]
 
     def late_move(self) -> str:
         """ Determine what move to make if several pieces are already on the board
@@ -622,27 +371,13 @@ class HexBot:
         Returns:
             moveToPlay(str): position of where to make move
         """
-        moveToPlay = ""
-        
-        # if we have more than 0 jeopordized twobridges, we want to save/destroy it/them; saving/destroying is priority move
-        # loop through and find where we are jeopardized; set moveToPlay to the last one found
-        if self.jeopardized > 0:
-            for coord in self.board.cells:
-                for destcoord in self.board.cells[coord].white_twobridges:
-                    bridge = self.board.cells[coord].white_twobridges[destcoord]
-                    if bridge.status == Status.JEOPARDY:
-                        for depcoord in bridge.depends:
-                            if self.board.cells[depcoord].color == Color.EMPTY:
-                                moveToPlay = depcoord
-                for destcoord in self.board.cells[coord].black_twobridges:
-                    bridge = self.board.cells[coord].black_twobridges[destcoord]
-                    if bridge.status == Status.JEOPARDY:
-                        for depcoord in bridge.depends:
-                            if self.board.cells[depcoord].color == Color.EMPTY:
-                                moveToPlay = depcoord
-            self.jeopardized -= 1
-            # resolve a jeopardized two bridge
-            return str(moveToPlay)
+        # if any twobridge is jeopardized, saving/destroying it is the priority move
+        # the board keeps an index of them, so no scan is needed; ours are saved first
+        for color in (self.color, self.opp):
+            for bridge in self.board.jeopardy[color].values():
+                for depcoord in bridge.depends:
+                    if self.board.cells[depcoord].color == Color.EMPTY:
+                        return str(depcoord)
 
         # get the path and cost of path for both ourselves and of our opponents            
         if self.color == Color.WHITE:
@@ -677,7 +412,9 @@ class HexBot:
                             self.board.cells[playerPath[i-1]].white_twobridges[playerPath[i]].status == Status.READY:
                         # if dijkstra returned a TO_BE or READY, then add dest with weight 4 and deps at weight 1
                         playerMoves.append((self.board.cells[playerPath[i-1]].white_twobridges[playerPath[i]].depends[0], 1))
-                        playerMoves.append((playerPath[i], 4))
+                        if node.color == Color.EMPTY:
+                            # a 'backwards' TO_BE bridge already has its dest filled
+                            playerMoves.append((playerPath[i], 4))
                     else:
                         # if two bridge was not a TO_BE or READY, then it must have been SUCCESS, which means
                         playerMoves.append((self.board.cells[playerPath[i-1]].white_twobridges[playerPath[i]].depends[0], 0.5))
@@ -695,7 +432,9 @@ class HexBot:
                             self.board.cells[oppPath[i-1]].black_twobridges[oppPath[i]].status == Status.READY:
                         # if dijkstra returned a TO_BE or READY, then add dest with weight 4 and deps at weight 1
                         oppMoves.append((self.board.cells[oppPath[i-1]].black_twobridges[oppPath[i]].depends[0], 1))
-                        oppMoves.append((oppPath[i], 4))
+                        if node.color == Color.EMPTY:
+                            # a 'backwards' TO_BE bridge already has its dest filled
+                            oppMoves.append((oppPath[i], 4))
                     else:
                         # if two bridge was not a TO_BE or READY, then it must have been SUCCESS, which means
                         oppMoves.append((self.board.cells[oppPath[i-1]].black_twobridges[oppPath[i]].depends[0], 0.5))
@@ -714,7 +453,9 @@ class HexBot:
                             self.board.cells[playerPath[i-1]].black_twobridges[playerPath[i]].status == Status.READY:
                         # if dijkstra returned a TO_BE or READY, then add dest with weight 4 and deps at weight 1
                         playerMoves.append((self.board.cells[playerPath[i-1]].black_twobridges[playerPath[i]].depends[0], 1))
-                        playerMoves.append((playerPath[i], 4))
+                        if node.color == Color.EMPTY:
+                            # a 'backwards' TO_BE bridge already has its dest filled
+                            playerMoves.append((playerPath[i], 4))
                     else:
                         # if two bridge was not a TO_BE or READY, then it must have been SUCCESS, which means
                         playerMoves.append((self.board.cells[playerPath[i-1]].black_twobridges[playerPath[i]].depends[0], 0.5))
@@ -732,7 +473,9 @@ class HexBot:
                             self.board.cells[oppPath[i-1]].white_twobridges[oppPath[i]].status == Status.READY:
                         # if dijkstra returned a TO_BE or READY, then add dest with weight 4 and deps at weight 1
                         oppMoves.append((self.board.cells[oppPath[i-1]].white_twobridges[oppPath[i]].depends[0], 1))
-                        oppMoves.append((oppPath[i], 4))
+                        if node.color == Color.EMPTY:
+                            # a 'backwards' TO_BE bridge already has its dest filled
+                            oppMoves.append((oppPath[i], 4))
                     else:
                         # if two bridge was not a TO_BE or READY, then it must have been SUCCESS, which means
                         oppMoves.append((self.board.cells[oppPath[i-1]].white_twobridges[oppPath[i]].depends[0], 0.5))
@@ -770,6 +513,22 @@ class HexBot:
         # elif oppCost == 0, play to win (opp has garunteed win, play offensively to through them off)
         # else play offensively, we have the advantage (group with oppCost == 0)
 
+        # if the opponent can already connect their edges (or can with their next move),
+        # only a move inside every one of those connections' carriers can stop them;
+        # the search is skipped when they are far from connecting or it runs out of time
+        must_play = 0
+        if self.use_hsearch and 0 <= oppCost <= MUST_PLAY_COST:
+            deadline = perf_counter() + self.clock.time_left() * MUST_PLAY_SHARE
+            must_play = self.connections(self.opp).must_play(deadline)
+        if must_play:
+            index = self.board.topology.index
+            blocking = [move for move in playerMoves if must_play >> index[move[0]] & 1]
+            if not blocking:
+                blocking = [move for move in oppMoves if must_play >> index[move[0]] & 1]
+            if not blocking:
+                blocking = [(coord, 0) for coord in self.connections(self.opp).coords(must_play)]
+            playerMoves = blocking
+
         # find the coord with the max weight in playerMoves
         # initialize the moveToPlay to be first of playerMoves to compare other values against
         moveToPlay = playerMoves[0][0]
@@ -782,15 +541,69 @@ class HexBot:
 
         return str(moveToPlay)
 
+    def mcts_move(self) -> str:
+        """ Determine what move to make by Monte Carlo tree search
+
+        Searches from the current position until the time manager's budget
+        for this move runs out, on several processes at once when the bot was
+        created with workers > 1
+
+        Returns: (str)
+            Human-readable coordinate on which we decide to make our move
+        """
+        if self.parallel is not None:
+            move = self.parallel.search(self.board, self.color, self.clock.time_left())
+            return str(self.board.topology.coords[move])
+        if self.mcts is None or self.mcts.topology is not self.board.topology:
+            self.mcts = MCTS(self.board.topology)
+        # keep the tree (warmed up by pondering, or by the last search) if it followed the game here
+        if self.mcts.root is None or self.mcts.colors != self.board.colors or \
+                self.mcts.to_move != COLOR_CODES[self.color]:
+            self.mcts.set_position(self.board.colors, self.color)
+        move = self.mcts.search(self.clock.time_left())
+        return str(self.board.topology.coords[move])
+
+    def start_ponder(self) -> None:
+        """ Keep searching the current position in the background while the opponent thinks
+
+        Only the single-process mcts strategy ponders; the tree then follows
+        the opponent's reply, so the next search starts from a warm subtree
+        """
+        if not self.pondering or self.strategy != "mcts" or self.parallel is not None or self.mcts is None:
+            return
+        self.stop_ponder()
+        self.__ponder_stop.clear()
+        self.__ponder_thread = Thread(target=self.mcts.search, args=(float("inf"), self.__ponder_stop), daemon=True)
+        self.__ponder_thread.start()
+
+    def stop_ponder(self) -> None:
+        """ Stop the background search, if one is running
+        """
+        if self.__ponder_thread is None:
+            return
+        self.__ponder_stop.set()
+        self.__ponder_thread.join()
+        self.__ponder_thread = None
+
     def make_move(self) -> None:
         """ Generates a move, plays it for itself, and prints it to stdout
 
-        For now, the move is randomly selected from all empty positions
+        The "mcts" strategy searches every move; "classic" uses the opening
+        replies and then the path heuristics. Either way the time taken is
+        charged to the game clock.
         """
-        if self.move_count >= 4:
+        self.clock.start_move(self.move_count, len(self.board.empties))
+        if self.strategy == "mcts":
+            move = self.mcts_move()
+        elif self.move_count >= 4:
             move = self.late_move()
         else:
             move = self.early_move()
-        self.sety(str(move))
+        if move == "swap":
+            self.swap()
+        else:
+            self.sety(str(move))
+        self.clock.end_move()
         print(move)
+        self.start_ponder()
         return
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+# build_book.py
+
+"""
+Builds the opening book read by book.py.
+
+The replies come from the hand-written 10x10 opening rules the bot used
+before it had a book. Every position those rules can be asked about in the
+first four moves is played out, and the rules' answer is stored under the
+position's key. A position and its 180 degree rotation share a key, so the
+book gives both the same reply even where the rules do not; build() says
+which reply is kept.
+"""
+import argparse
+from constants import *
+from coord import Coord
+from board import Board
+from book import OpeningBook, SWAP, book_key, book_path
+
+
+def legacy_move(board: Board, color: Color, move_count: int, swap_happened: bool) -> str:
+    """ The hand-written 10x10 opening rules
+
+    Parameters:
+        board: (Board) the board in current gamestate
+        color: (Color) colour we are playing
+        move_count: (int) number of moves played so far
+        swap_happened: (bool) whether either player has swapped
+
+    Returns: (str)
+        human-readable move, "swap", or None if the rules have no answer
+    """
+    white_bad_moves = ["a1", "a2", "a3", "a4", "a5", "a6", "a7", "a8", "a9", \
+                       "j10", "j9", "j8", "j7", "j6", "j5", "j4", "j3", "j2", \
+                        "b1", "b2", "i9", "i10"]
+
+    black_bad_moves = ["a1", "b1", "c1", "d1", "e1", "f1", "g1", "h1", "i1", \
+                       "j10", "i10", "h10", "g10", "f10", "e10", "d10", "c10", "b10", \
+                        "a2", "b2", "i9", "j9"]
+
+    if move_count == 0:
+        return "b2"
+
+    if move_count == 1:
+        first_move = None
+        if color == Color.WHITE:
+            for coord in board.blacks:
+                if coord not in (Edges.LEFT, Edges.RIGHT):
+                    first_move = coord
+            if first_move is None:
+                return None
+            return "e6" if str(first_move) in white_bad_moves else "swap"
+        else:
+            for coord in board.whites:
+                if coord not in (Edges.TOP, Edges.BOTTOM):
+                    first_move = coord
+            if first_move is None:
+                return None
+            return "f5" if str(first_move) in black_bad_moves else "swap"
+
+    if move_count == 2:
+        if not swap_happened:
+            # they DID NOT swap move. fight for control, ideally blocking
+            # we have a piece on b2, they have a piece somewhere
+            if color == Color.WHITE:
+                their_move = None
+                for coord in board.blacks:
+                    if coord not in (Edges.LEFT, Edges.RIGHT):
+                        their_move = coord
+                if their_move is None:
+                    return None
+                # if they played centrally, perform classic block on their far side
+                if str(their_move) in ("d5"):
+                    return "g4"
+                elif str(their_move) in ("e5"):
+                    return "h4"
+                elif str(their_move) in ("f5"):
+                    return "c6"
+                elif str(their_move) in ("g5"):
+                    return "d6"
+                elif str(their_move) in ("d6"):
+                    return "g5"
+                elif str(their_move) in ("e6"):
+                    return "h5"
+                elif str(their_move) in ("f6"):
+                    return "c7"
+                elif str(their_move) in ("g6"):
+                    return "d7"
+                elif str(their_move) in ("d7", "e7"):
+                    return "g6"
+                elif str(their_move) in ("f7"):
+                    return "c7"
+                elif str(their_move) in ("g7"):
+                    return "d7"
+                elif str(their_move) in ("d4"):
+                    return "g4"
+                elif str(their_move) in ("e4"):
+                    return "h4"
+                elif str(their_move) in ("f4", "g4"):
+                    return "d5"
+                # if they didn't centrally, then we claim the centre
+                else:
+                    return "e6"
+            else:
+                their_move = None
+                for coord in board.whites:
+                    if coord not in (Edges.TOP, Edges.BOTTOM):
+                        their_move = coord
+                if their_move is None:
+                    return None
+                # if they played centrally, perform classic block on their far side
+                if str(their_move) in ("e4"):
+                    return "d7"
+                elif str(their_move) in ("e5"):
+                    return "d8"
+                elif str(their_move) in ("e6"):
+                    return "f3"
+                elif str(their_move) in ("e7"):
+                    return "f4"
+                elif str(their_move) in ("f4"):
+                    return "e7"
+                elif str(their_move) in ("f5"):
+                    return "e8"
+                elif str(their_move) in ("f6"):
+                    return "g3"
+                elif str(their_move) in ("f7"):
+                    return "g4"
+                elif str(their_move) in ("g4", "g5"):
+                    return "f7"
+                elif str(their_move) in ("g6"):
+                    return "g3"
+                elif str(their_move) in ("g7"):
+                    return "g4"
+                elif str(their_move) in ("d4"):
+                    return "d7"
+                elif str(their_move) in ("d5"):
+                    return "d8"
+                elif str(their_move) in ("d6", "d7"):
+                    return "e4"
+                # if they didn't centrally, then we claim the centre
+                else:
+                    return "f5"
+        else:
+            # swap move occurred. claim centre
+            # this means opponent has a piece in b2 now
+            # (or they didn't swap, but didn't play centrally)
+            return "e6" if color == Color.WHITE else "f5"
+
+    if move_count == 3:
+        if not swap_happened:
+            if color == Color.WHITE:
+                last_move = None
+                for coord in board.blacks:
+                    if coord not in (Edges.LEFT, Edges.RIGHT):
+                        if str(coord) not in white_bad_moves:
+                            last_move = coord
+                            break
+                else:
+                    for coord in board.blacks:
+                        if coord not in (Edges.LEFT, Edges.RIGHT):
+                            last_move = coord
+                if last_move is None:
+                    return None
+                if last_move.gety() > 6:
+                    if board.cells[Coord(4, 7)].color == Color.BLACK:
+                        return "f7"
+                    elif board.cells[Coord(5, 7)].color == Color.BLACK:
+                        return "d7"
+                    elif board.cells[Coord(4, 9)].color == Color.BLACK:
+                        return "g7"
+                    elif board.cells[Coord(3, 9)].color == Color.BLACK:
+                        return "f7"
+                    elif board.cells[Coord(4, 8)].color == Color.BLACK:
+                        return "f7"
+                    else:
+                        return "d8"
+                else:
+                    if board.cells[Coord(5, 5)].color == Color.BLACK:
+                        return "f5"
+                    elif board.cells[Coord(6, 5)].color == Color.BLACK:
+                        return "e5"
+                    for x in range(1, 11):
+                        if board.cells[Coord(x, 5)].color == Color.BLACK or \
+                                board.cells[Coord(x, 6)].color == Color.BLACK:
+                            return "f4"
+                    right_of_f = False
+                    for x in range(1, 6):
+                        for y in range(6, 11):
+                            if board.cells[Coord(x, y)].color == Color.BLACK:
+                                right_of_f = True
+                    if not right_of_f:
+                        return "h3"
+                    else:
+                        return "e3"
+            else:  # we are black
+                last_move = None
+                for coord in board.whites:
+                    if coord not in (Edges.TOP, Edges.BOTTOM):
+                        if str(coord) not in black_bad_moves:
+                            last_move = coord
+                            break
+                else:
+                    for coord in board.whites:
+                        if coord not in (Edges.TOP, Edges.BOTTOM):
+                            last_move = coord
+                if last_move is None:
+                    return None
+                if last_move.getx() > 6:
+                    if board.cells[Coord(7, 4)].color == Color.WHITE:
+                        return "g6"
+                    elif board.cells[Coord(7, 5)].color == Color.WHITE:
+                        return "g4"
+                    elif board.cells[Coord(9, 4)].color == Color.WHITE:
+                        return "g7"
+                    elif board.cells[Coord(9, 3)].color == Color.WHITE:
+                        return "g6"
+                    elif board.cells[Coord(8, 4)].color == Color.WHITE:
+                        return "g6"
+                    else:
+                        return "h4"
+                else:
+                    if board.cells[Coord(5, 5)].color == Color.WHITE:
+                        return "e6"
+                    elif board.cells[Coord(6, 5)].color == Color.WHITE:
+                        return "e5"
+                    for y in range(1, 11):
+                        if board.cells[Coord(5, y)].color == Color.WHITE or \
+                                board.cells[Coord(6, y)].color == Color.WHITE:
+                            return "d6"
+                    above_6 = False
+                    for x in range(1, 5):
+                        for y in range(6, 11):
+                            if board.cells[Coord(x, y)].color == Color.WHITE:
+                                above_6 = True
+                    if not above_6:
+                        return "c8"
+                    else:
+                        return "c5"
+        else:  # swap happened
+            if color == Color.WHITE:
+                their_move = None
+                for coord in board.blacks:
+                    if coord not in (Edges.LEFT, Edges.RIGHT):
+                        their_move = coord
+                if their_move is None:
+                    return None
+                # if they played centrally, perform classic block on their far side
+                if str(their_move) in ("d5"):
+                    return "g4"
+                elif str(their_move) in ("e5"):
+                    return "h4"
+                elif str(their_move) in ("f5"):
+                    return "c6"
+                elif str(their_move) in ("g5"):
+                    return "d6"
+                elif str(their_move) in ("d6"):
+                    return "g5"
+                elif str(their_move) in ("e6"):
+                    return "h5"
+                elif str(their_move) in ("f6"):
+                    return "c7"
+                elif str(their_move) in ("g6"):
+                    return "d7"
+                elif str(their_move) in ("d7", "e7"):
+                    return "g6"
+                elif str(their_move) in ("f7"):
+                    return "c7"
+                elif str(their_move) in ("g7"):
+                    return "d7"
+                elif str(their_move) in ("d4"):
+                    return "g4"
+                elif str(their_move) in ("e4"):
+                    return "h4"
+                elif str(their_move) in ("f4", "g4"):
+                    return "d5"
+                # if they didn't centrally, then we claim the centre
+                else:
+                    return "e6"
+            else:
+                their_move = None
+                for coord in board.whites:
+                    if coord not in (Edges.TOP, Edges.BOTTOM):
+                        their_move = coord
+                if their_move is None:
+                    return None
+                # if they played centrally, perform classic block on their far side
+                if str(their_move) in ("e4"):
+                    return "d7"
+                elif str(their_move) in ("e5"):
+                    return "d8"
+                elif str(their_move) in ("e6"):
+                    return "f3"
+                elif str(their_move) in ("e7"):
+                    return "f4"
+                elif str(their_move) in ("f4"):
+                    return "e7"
+                elif str(their_move) in ("f5"):
+                    return "e8"
+                elif str(their_move) in ("f6"):
+                    return "g3"
+                elif str(their_move) in ("f7"):
+                    return "g4"
+                elif str(their_move) in ("g4", "g5"):
+                    return "f7"
+                elif str(their_move) in ("g6"):
+                    return "g3"
+                elif str(their_move) in ("g7"):
+                    return "g4"
+                elif str(their_move) in ("d4"):
+                    return "d7"
+                elif str(their_move) in ("d5"):
+                    return "d8"
+                elif str(their_move) in ("d6", "d7"):
+                    return "e4"
+                # if they didn't centrally, then we claim the centre
+                else:
+                    return "f5"
+
+    return None
+
+
+def opponent(color: Color) -> Color:
+    return Color.BLACK if color == Color.WHITE else Color.WHITE
+
+
+def play(board: Board, stones: list) -> Board:
+    """ Reset a board and play stones on it in order
+
+    Parameters:
+        board: (Board) board to set up
+        stones: (list[tuple[str, Color]]) moves in the order they were played
+
+    Returns: (Board)
+        the same board
+    """
+    board.reset()
+    for name, color in stones:
+        board.set(board.parse(name), color)
+    return board
+
+
+def positions(size: int) -> list:
+    """ Enumerate the positions the opening rules are asked about
+
+    Yields everything up to our second move: the empty board, every first
+    stone (swap or reply), every answer to our first stone with and without
+    a swap, and every second opponent stone after our reply or our swap.
+
+    Parameters:
+        size: (int) size of the game board
+
+    Returns: (list[tuple[list, Color, int, bool]])
+        (stones played, colour to move, move count, swap happened)
+    """
+    cells = [str(Coord(x, y)) for x in range(1, size+1) for y in range(1, size+1)]
+    board = Board(size)
+    found = []
+    for color in (Color.WHITE, Color.BLACK):
+        opp = opponent(color)
+        found.append(([], color, 0, False))
+        # they swapped our first stone: it is theirs now
+        found.append(([("b2", opp)], color, 2, True))
+        for first in cells:
+            found.append(([(first, opp)], color, 1, False))
+            if first != "b2":
+                found.append(([("b2", color), (first, opp)], color, 2, False))
+            # our reply (or swap) to their first stone, then every second stone of theirs
+            reply = legacy_move(play(board, [(first, opp)]), color, 1, False)
+            for second in cells:
+                if reply == "swap":
+                    # we took over their stone; they now play the other colour
+                    if second != first:
+                        found.append(([(first, color), (second, opp)], color, 3, True))
+                elif second not in (first, reply):
+                    found.append(([(first, opp), (reply, color), (second, opp)], color, 3, False))
+    return found
+
+
+def build(size: int) -> tuple:
+    """ Run the opening rules on every position and collect the replies
+
+    The rules are not symmetric, so a position and its 180 degree rotation,
+    which share a key, often get different replies; a few positions are
+    also reached both with and without a swap. Such conflicts are settled
+    the same way every time: the reply the rules give for the canonical
+    orientation wins over the rotated one, then the reply for the earlier
+    move of the game, then the one found first.
+
+    Parameters:
+        size: (int) size of the game board
+
+    Returns:
+        moves (dict[int, int]): cell id (or SWAP) by position key
+        conflicts (int): keys that were given more than one different reply
+    """
+    board = Board(size)
+    moves = dict()
+    ranks = dict()
+    conflicted = set()
+    for stones, color, move_count, swap_happened in positions(size):
+        play(board, stones)
+        move = legacy_move(board, color, move_count, swap_happened)
+        if move is None:
+            continue
+        key, rotated = book_key(board, color)
+        if move == "swap":
+            value = SWAP
+        else:
+            cell = board.topology.index[board.parse(move)]
+            if board.colors[cell] != COLOR_CODES[Color.EMPTY]:
+                continue  # the rule's reply is already taken
+            value = board.topology.rotation[cell] if rotated else cell
+        rank = (rotated, move_count)
+        if key in moves:
+            if moves[key] != value:
+                conflicted.add(key)
+            if ranks[key] <= rank:
+                continue
+        moves[key] = value
+        ranks[key] = rank
+    return moves, len(conflicted)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book from the hand-written opening rules")
+    parser.add_argument("--size", type=int, default=10,
+                        help="Board size; the rules are written for 10x10")
+    parser.add_argument("--output", default=None, metavar="PATH",
+                        help="Book file to write (default books/hex<size>.book)")
+    args = parser.parse_args()
+
+    path = args.output if args.output is not None else book_path(args.size)
+    moves, conflicts = build(args.size)
+    OpeningBook.write(path, args.size, moves)
+    print("{}: {} positions, {} conflicting keys settled".format(path, len(moves), conflicts))
+
+
+if __name__ == "__main__":
+    main()
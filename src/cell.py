@@ -9,7 +9,8 @@ class Cell:
             self,
             coord: Coord,
             color: Color,
-            boardsize: int
+            boardsize: int,
+            populate: bool = True
             ) -> None:
         """ Create a Cell object 
 
@@ -17,6 +18,8 @@ class Cell:
             coord: (Coord) coordinates of this cell
             color: (Color) colour/whether this cell is empty
             boardsize: (int) size of the square board
+            populate: (bool) compute neighbours and two-bridges; False when the
+                caller fills them in from a shared Topology
         """
         self.coord = coord
         self.color = color
@@ -24,11 +27,9 @@ class Cell:
         self.white_twobridges = dict()
         self.black_twobridges = dict()
         self.__boardsize = boardsize
-        self.g = 0
-        self.black_parent = self.coord
-        self.white_parent = self.coord
-        self.__populate_neighbours()
-        self.__populate_twobridges()
+        if populate:
+            self.__populate_neighbours()
+            self.__populate_twobridges()
 
     def __populate_neighbours(self) -> None:
         """ Calculates the direct neighbours of this cell
@@ -151,8 +152,5 @@ class Cell:
             self.white_twobridges[dest] = TwoBridge(self.coord, dest, deps, Color.WHITE, Status.READY)
             self.black_twobridges[dest] = TwoBridge(self.coord, dest, deps, Color.BLACK, Status.READY)
 
-    def __lt__(self, other: object) -> bool:
-        return self.g < other.g
-
     def __hash__(self) -> int:
         return hash(self.coord)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# client.py
+
+"""
+A stand-in for main.py that forwards the game to a running daemon.
+
+Speaks the usual text protocol on stdin/stdout, so a referee can start it
+exactly like main.py ("client.py white"), but it imports nothing of the
+engine: every command goes over the daemon's Unix socket and the answer
+comes back already computed. Start the daemon with "main.py --daemon".
+"""
+import argparse
+import socket
+import sys
+from itertools import chain
+from protocol import default_socket, read_framed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a game on a running Deus Hex Machina daemon")
+    parser.add_argument("color", metavar="<COLOR>", choices=["white", "black"],
+                        help="This bot's color. White is left->right")
+    parser.add_argument("--socket", default=None, metavar="PATH",
+                        help="The daemon's socket (default in $XDG_RUNTIME_DIR, or a private temporary directory)")
+    args = parser.parse_args()
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        path = args.socket if args.socket is not None else default_socket()
+        connection.connect(path)
+    except OSError as error:
+        print("cannot reach the daemon: {}".format(error), file=sys.stderr)
+        sys.exit(1)
+    stream = connection.makefile("rwb")
+
+    # the colour opens the game, then every command is passed on as it arrives
+    for line in chain([args.color], sys.stdin):
+        line = line.strip()
+        if not line:
+            continue
+        stream.write((line + "\n").encode())
+        stream.flush()
+        if line == "quit":
+            break
+        answer = read_framed(stream)
+        if answer is None:
+            break  # the daemon went away
+        if answer:
+            print(answer, flush=True)
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
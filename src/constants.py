@@ -19,8 +19,14 @@ class Status(Enum):
     JEOPARDY = 4    # orig+dest friendly, 1dep hostile
 
 
+# compact codes for the array-backed board core (a bytearray cannot hold -1)
+COLOR_CODES = {Color.EMPTY: 0, Color.WHITE: 1, Color.BLACK: 2}
+CODE_COLORS = (Color.EMPTY, Color.WHITE, Color.BLACK)
+
+
+# each edge has a -1 in it, so it can never be a cell of a board, whatever its size
 class Edges:
     LEFT = Coord(0, -1)
-    RIGHT = Coord(999, -1)
+    RIGHT = Coord(-2, -1)
     BOTTOM = Coord(-1, 0)
-    TOP = Coord(-1, 999)
+    TOP = Coord(-1, -2)
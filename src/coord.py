@@ -2,19 +2,35 @@
 
 
 class Coord:
-    def __init__(self, x: int, y: int) -> None:
-        """ Create a Coord object
+    __slots__ = ("__x", "__y", "__name")
+    __pool = dict()
+
+    def __new__(cls, x: int, y: int) -> object:
+        """ Create a Coord object, or return the existing one for (x, y)
+
+        Coords are interned flyweights: there is exactly one object per pair,
+        so equal coords are identical and comparisons rarely go past 'is'
 
         Parameters:
             x: (int) position across (left to right). converted to letter
             y: (int) position upwards. remains as number
         """
-        # may need to revise parameters later
-        self.__x = x
-        self.__y = y
-        self.__name = Coord.cart2str(x, y)
+        coord = cls.__pool.get((x, y))
+        if coord is None:
+            coord = object.__new__(cls)
+            coord.__x = x
+            coord.__y = y
+            coord.__name = None  # built on first use by __str__
+            cls.__pool[(x, y)] = coord
+        return coord
+
+    def __reduce__(self) -> tuple:
+        # unpickling goes back through __new__, so the copy is interned too
+        return (Coord, (self.__x, self.__y))
 
     def __str__(self) -> str:
+        if self.__name is None:
+            self.__name = Coord.cart2str(self.__x, self.__y)
         return self.__name
 
     def getx(self) -> int:
@@ -24,42 +40,54 @@ class Coord:
         return self.__y
 
     def __hash__(self) -> int:
-        return self.__x * 32 + self.__y
+        # distinct for every pair from -2 up to 65533, so boards of any practical size never collide
+        return ((self.__x + 2) << 16) | (self.__y + 2)
 
     def __eq__(self, __o: object) -> bool:
-        return self.__x == __o.getx() and self.__y == __o.gety()
+        if self is __o:
+            return True
+        if not isinstance(__o, Coord):
+            return NotImplemented
+        return self.__x == __o.__x and self.__y == __o.__y
 
     @staticmethod
     def cart2str(x: int, y: int) -> str:
         """ Convert a cartesian pair to a chess-style string
 
+        Columns past z carry on as in a spreadsheet: aa, ab,... az, ba,...
+
         Parameters:
-            x: (int) position across. converted to letter
+            x: (int) position across. converted to letters
             y: (int) position downwards. remains as number
 
         Returns: (str)
-            chess-style coordinate eg. "b5"
+            chess-style coordinate eg. "b5" or "ab31"
         """
         if x <= 0:
-            letter = '-'
-        elif x > 26:
-            letter = '+'
+            letters = '-'
         else:
-            letter = chr(ord('a') + x - 1)
+            letters = ''
+            while x > 0:
+                x, digit = divmod(x - 1, 26)
+                letters = chr(ord('a') + digit) + letters
         if y < 0:
             y = 0
-        return letter + str(y)
+        return letters + str(y)
 
     @staticmethod
     def str2cart(name: str) -> tuple:
         """ Convert a chess-style string to a cartesian pair
 
         Parameters:
-            name: (str) chess-style string eg. "b5"
+            name: (str) chess-style string eg. "b5" or "ab31"
 
         Returns: (tuple[int, int])
             equivalent x and y coordinates
         """
-        x = ord(name[0]) - ord('a') + 1
-        y = int(name[1:])
+        x = 0
+        split = 0
+        while split < len(name) and name[split].isalpha():
+            x = x * 26 + ord(name[split]) - ord('a') + 1
+            split += 1
+        y = int(name[split:])
         return (x, y)
@@ -0,0 +1,128 @@
+# daemon.py
+
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+from random import seed
+from bot import HexBot, SEED
+from book import OpeningBook
+from constants import Color
+from inferior import rings
+from protocol import run_captured, write_framed
+from topology import Topology
+
+WARM_SIZES = tuple(range(5, 20))
+
+
+def claim_socket(path: str) -> None:
+    """ Make sure a daemon may bind to 'path'
+
+    A socket left by a daemon that did not shut down cleanly is removed.
+    A socket that still answers belongs to a running daemon, and anything
+    else at 'path' is not ours to delete; both stop the start.
+
+    Parameters:
+        path: (str) file name of the socket
+
+    Raises: (FileExistsError)
+        if 'path' is a live daemon's socket or not a socket at all
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError("{} exists and is not a socket".format(path))
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)  # nobody listens: left over from a daemon that died
+        return
+    finally:
+        probe.close()
+    raise FileExistsError("a daemon is already serving on {}".format(path))
+
+
+class GameHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        """ Play one game over a connection
+
+        The first line names our colour ("white" or "black"); every line after
+        that is a bot command. Each gets one framed answer (see protocol.py),
+        the first line an empty one once the bot is ready. This runs in a
+        forked copy of the daemon, so the bot built in advance for that
+        colour is this game's own.
+        """
+        first = self.rfile.readline().decode().split()
+        if not first:
+            return  # closed without a word, eg. another daemon checking the socket is live
+        if first[0] not in ("white", "black"):
+            write_framed(self.wfile, "error expected: <white|black>")
+            return
+        bot = self.server.bots[Color.WHITE if first[0] == "white" else Color.BLACK]
+        seed(SEED)  # fork reseeds the random module; play exactly as a fresh main.py would
+        write_framed(self.wfile, "")
+        try:
+            for raw in self.rfile:
+                cmd = raw.decode().split()
+                if not cmd:
+                    continue
+                if cmd[0] == "quit":
+                    break
+                if bot.is_cmd(cmd):
+                    write_framed(self.wfile, run_captured(bot, cmd))
+                else:
+                    write_framed(self.wfile, "error unknown command: " + " ".join(cmd))
+        finally:
+            bot.stop_ponder()
+            if bot.parallel is not None:
+                bot.parallel.close()
+
+
+class EngineDaemon(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    def __init__(self, path: str, options: dict = None, sizes: tuple = WARM_SIZES) -> None:
+        """ Create an EngineDaemon object: a warm engine serving games over a Unix socket
+
+        Everything that does not depend on the game is built once, up front:
+        the imports, the topology and inferior-cell rings of every board size
+        in 'sizes', their opening books, and a bot of each colour. Each
+        connection is then served by a forked copy of this process, so a
+        game starts with all of it in place and games run side by side
+        without sharing any state. The socket is readable and writable by
+        this user only.
+
+        Parameters:
+            path: (str) file name of the socket
+            options: (dict) keyword arguments for every HexBot, eg. strategy or move_time
+            sizes: (tuple[int, ...]) board sizes to prepare
+
+        Raises: (FileExistsError)
+            if another daemon serves on 'path' or 'path' is not a socket
+        """
+        claim_socket(path)  # before warming up, so a refused start fails fast
+        self.options = options if options is not None else dict()
+        for size in sizes:
+            rings(Topology.get(size))
+            len(OpeningBook.get(size))
+        self.bots = {color: HexBot(color, **self.options) for color in (Color.WHITE, Color.BLACK)}
+        self.__pid = os.getpid()
+        super().__init__(path, GameHandler)
+        os.chmod(path, 0o600)
+
+    def serve(self) -> None:
+        """ Serve games until interrupted or terminated, then remove the socket
+        """
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # forked game processes inherit this; only the daemon itself owns the socket
+            if os.getpid() == self.__pid:
+                self.server_close()
+                os.unlink(self.server_address)
@@ -0,0 +1,432 @@
+# hsearch.py
+
+from collections import deque
+from time import perf_counter
+from constants import *
+from coord import Coord
+
+# carriers are capped at every size, see carrier_limit; boards above
+# LARGE_BOARD keep only the more local connections
+LARGE_BOARD = 13
+SMALL_CARRIER = 10
+LOCAL_CARRIER = 8
+
+
+def carrier_limit(size: int) -> int:
+    """ Get the default carrier limit for a board size
+
+    Without a limit the closure keeps ever larger connections, and its
+    work per move grows far faster than the board
+
+    Parameters:
+        size: (int) size of the game board
+
+    Returns: (int)
+        most cells in a carrier
+    """
+    return SMALL_CARRIER if size <= LARGE_BOARD else LOCAL_CARRIER
+
+
+class HSearch:
+    def __init__(
+            self,
+            board: object,
+            color: Color,
+            max_vcs: int = 4,
+            max_scs: int = 8,
+            max_carrier: int = None
+            ) -> None:
+        """ Create a HSearch object: virtual connections of one player
+
+        Nodes are the player's stone groups (edges included) and the empty
+        cells. A virtual connection (VC) between two nodes can be completed
+        whatever the opponent does; a semi-connection (SC) needs one more
+        move first, its key. Both are kept with their carrier: the empty
+        cells the connection relies on, as a bitset over cell ids.
+
+        Connections are built from adjacency with two rules:
+            AND: x-z and z-y with disjoint carriers give x-y, a VC if z is
+                one of our groups, an SC keyed on z if z is empty
+            OR: SCs between x and y whose carriers have nothing in common
+                give a VC, the opponent cannot cut them all with one move
+
+        Moves update the stored connections in place instead of searching
+        again: an opponent stone drops the connections whose carrier it
+        lands in, our own stone shrinks those carriers, promotes the SCs it
+        was the key of and merges groups, and only the connections that
+        changed are combined again. Both wait for the next query: play only
+        queues the move, so following a game costs nothing while nobody
+        asks. A query can be given a deadline; the closure then stops when
+        it passes and picks up where it left off on the next query.
+
+        With max_carrier set, connections whose carrier holds more cells are
+        not kept. Every connection then stays within a fixed distance of its
+        endpoints, so the number of them, and the work per move, grows with
+        the number of cells rather than with its square; large boards need
+        this.
+
+        Parameters:
+            board: (Board) the board to follow
+            color: (Color) player whose connections are searched
+            max_vcs: (int) most VCs kept between any two nodes
+            max_scs: (int) most SCs kept between any two nodes
+            max_carrier: (int) most cells in a carrier, None for no limit
+        """
+        self.board = board
+        self.color = color
+        self.max_vcs = max_vcs
+        self.max_scs = max_scs
+        self.max_carrier = max_carrier
+        self.cells = board.getsize() ** 2  # ids below this are board cells, the rest are edges
+        self.__pending = deque()  # moves played on the board since the connections were last updated
+        self.__stale = False  # True when the connections must be derived again from the board
+        self.rebuild()
+
+    def invalidate(self) -> None:
+        """ Have the next query derive every connection again, eg. after a stone was removed
+        """
+        self.__stale = True
+
+    def rebuild(self) -> None:
+        """ Throw every connection away and derive them again from the board
+        """
+        self.__pending.clear()
+        self.__stale = False
+        topology = self.board.topology
+        code = COLOR_CODES[self.color]
+        empty = COLOR_CODES[Color.EMPTY]
+        colors = self.board.colors
+
+        # node_of: group representative of our stones, the cell itself if empty, -1 for the opponent
+        self.node_of = [-1] * len(colors)
+        self.groups = dict()
+        for i in range(len(colors)):
+            if colors[i] == empty:
+                self.node_of[i] = i
+            elif colors[i] == code and self.node_of[i] == -1:
+                group = [i]
+                self.node_of[i] = i
+                stack = [i]
+                while stack:
+                    node = stack.pop()
+                    for other in topology.neighbours(node):
+                        if colors[other] == code and self.node_of[other] == -1:
+                            self.node_of[other] = i
+                            group.append(other)
+                            stack.append(other)
+                self.groups[i] = group
+
+        self.vcs = dict()
+        self.scs = dict()
+        self.__queue = deque()
+        for i in range(len(colors)):
+            if colors[i] != empty:
+                continue
+            for other in topology.neighbours(i):
+                node = self.node_of[other]
+                if node >= 0 and node != i:
+                    self.__add_vc(i, node, 0)
+
+    def play(self, coord: Coord, color: Color) -> None:
+        """ Note a stone placed on the board; the connections follow it on the next query
+
+        Parameters:
+            coord: (Coord) cell that was played
+            color: (Color) colour of the stone
+        """
+        if not self.__stale:
+            self.__pending.append((coord, color))
+
+    def unplay(self, coord: Coord) -> None:
+        """ Note a stone taken off the board
+
+        A move still waiting to be followed is simply dropped, so taking
+        back the latest move before the next query costs nothing; any other
+        stone has the next query derive the connections again
+
+        Parameters:
+            coord: (Coord) cell that was emptied
+        """
+        if self.__pending and self.__pending[-1][0] == coord:
+            self.__pending.pop()
+        else:
+            self.invalidate()
+
+    def __update(self, deadline: float = None) -> bool:
+        """ Bring the connections up to date with the board, then close them under AND/OR
+
+        Parameters:
+            deadline: (float) perf_counter() time to stop at, None to run to the end
+
+        Returns: (bool)
+            True if the connections are complete for the current position
+        """
+        if self.__stale:
+            self.rebuild()
+        while self.__pending:
+            if deadline is not None and perf_counter() > deadline:
+                return False
+            coord, color = self.__pending.popleft()
+            self.__follow(coord, color)
+        return self.__closure(deadline)
+
+    def __follow(self, coord: Coord, color: Color) -> None:
+        """ Update the connections for one stone placed on the board
+
+        Parameters:
+            coord: (Coord) cell that was played
+            color: (Color) colour of the stone
+        """
+        move = self.board.topology.index[coord]
+        if self.node_of[move] != move or move in self.groups:
+            return  # not an empty cell as far as we know; nothing to follow
+        if color == self.color:
+            self.__play_own(move)
+        else:
+            self.__play_opponent(move)
+
+    def __play_opponent(self, move: int) -> None:
+        """ Drop the node of a cell the opponent took and every connection relying on it
+
+        Parameters:
+            move: (int) cell id of the opponent's stone
+        """
+        bit = 1 << move
+        self.node_of[move] = -1
+        for table in (self.vcs, self.scs):
+            for other in table.pop(move, dict()):
+                table[other].pop(move, None)
+        # one pass over every connection; the carrier test is written out per table to keep it cheap
+        for x in self.vcs:
+            for y, connections in self.vcs[x].items():
+                if x < y:
+                    connections[:] = [c for c in connections if not c & bit]
+        for x in self.scs:
+            for y, connections in self.scs[x].items():
+                if x < y:
+                    connections[:] = [c for c in connections if not c[0] & bit]
+
+    def __play_own(self, move: int) -> None:
+        """ Turn a cell into one of our stones, merging it with the groups around it
+
+        Parameters:
+            move: (int) cell id of our stone
+        """
+        bit = 1 << move
+        merged = {move}
+        for other in self.board.topology.neighbours(move):
+            node = self.node_of[other]
+            if node >= 0 and node in self.groups:
+                merged.add(node)
+        group = min(merged)
+        members = [move]
+        for node in merged:
+            members.extend(self.groups.pop(node, ()))
+        for cell in members:
+            self.node_of[cell] = group
+        self.groups[group] = members
+
+        # take out every connection touching the merged nodes or relying on the cell
+        vcs = []
+        scs = []
+        for table, found in ((self.vcs, vcs), (self.scs, scs)):
+            for x in list(table):
+                for y in list(table[x]):
+                    if x > y:
+                        continue
+                    connections = table[x][y]
+                    touched = x in merged or y in merged
+                    kept = []
+                    for connection in connections:
+                        if touched or self.__carrier(connection) & bit:
+                            found.append((x, y, connection))
+                        else:
+                            kept.append(connection)
+                    connections[:] = kept
+            for node in merged:
+                for other in table.pop(node, dict()):
+                    if other not in merged:
+                        table[other].pop(node, None)
+
+        # put them back with the group as endpoint and the stone out of the carrier
+        for x, y, carrier in vcs:
+            x = group if x in merged else x
+            y = group if y in merged else y
+            if x != y:
+                self.__add_vc(x, y, carrier & ~bit)
+        for x, y, (carrier, key) in scs:
+            x = group if x in merged else x
+            y = group if y in merged else y
+            if x == y:
+                continue
+            if key == move:
+                self.__add_vc(x, y, carrier & ~bit)
+            else:
+                self.__add_sc(x, y, carrier & ~bit, key)
+
+    @staticmethod
+    def __carrier(connection: object) -> int:
+        return connection[0] if isinstance(connection, tuple) else connection
+
+    def __bit(self, node: int) -> int:
+        return 1 << node if node < self.cells and node not in self.groups else 0
+
+    def __add_vc(self, x: int, y: int, carrier: int) -> bool:
+        """ Store a VC unless a smaller one already covers it, and queue it for combining
+
+        Returns: (bool)
+            True if the VC was new
+        """
+        if self.max_carrier is not None and carrier.bit_count() > self.max_carrier:
+            return False
+        row = self.vcs.setdefault(x, dict())
+        connections = row.get(y)
+        if connections is None:
+            connections = row[y] = []
+            self.vcs.setdefault(y, dict())[x] = connections
+        for other in connections:
+            if other & carrier == other:
+                return False
+        connections[:] = [other for other in connections if other & carrier != carrier]
+        if len(connections) >= self.max_vcs:
+            return False
+        connections.append(carrier)
+        self.__queue.append((x, y, carrier))
+        return True
+
+    def __add_sc(self, x: int, y: int, carrier: int, key: int) -> None:
+        """ Store an SC unless it is covered, then try to OR it into a VC
+        """
+        if self.max_carrier is not None and carrier.bit_count() > self.max_carrier:
+            return
+        for other in self.vcs.get(x, dict()).get(y, ()):
+            if other & carrier == other:
+                return
+        row = self.scs.setdefault(x, dict())
+        connections = row.get(y)
+        if connections is None:
+            connections = row[y] = []
+            self.scs.setdefault(y, dict())[x] = connections
+        for other, _ in connections:
+            if other & carrier == other:
+                return
+        connections[:] = [other for other in connections if other[0] & carrier != carrier]
+        if len(connections) >= self.max_scs:
+            return
+        connections.append((carrier, key))
+
+        # OR rule: gather SCs until the intersection of their carriers is empty
+        union = carrier
+        common = carrier
+        for other, _ in connections[:-1]:
+            if common & other != common:
+                union |= other
+                common &= other
+                if not common:
+                    self.__add_vc(x, y, union)
+                    return
+
+    def __closure(self, deadline: float = None) -> bool:
+        """ Apply the AND rule to every queued VC until nothing new is found
+
+        Parameters:
+            deadline: (float) perf_counter() time to stop at, None to run to the end
+
+        Returns: (bool)
+            True if the queue ran dry, False if the deadline came first
+        """
+        queue = self.__queue
+        vcs = self.vcs
+        while queue:
+            if deadline is not None and perf_counter() > deadline:
+                return False
+            x, y, carrier = queue.popleft()
+            if carrier not in vcs.get(x, dict()).get(y, ()):
+                continue  # replaced by a smaller VC since it was queued
+            for end, middle in ((x, y), (y, x)):
+                own = middle in self.groups
+                end_bit = self.__bit(end)
+                middle_bit = self.__bit(middle)
+                for other, connections in list(vcs.get(middle, dict()).items()):
+                    if other == end:
+                        continue
+                    other_bit = self.__bit(other)
+                    if carrier & other_bit:
+                        continue
+                    for second in list(connections):
+                        if second & carrier or second & end_bit:
+                            continue
+                        if own:
+                            self.__add_vc(end, other, carrier | second)
+                        else:
+                            self.__add_sc(end, other, carrier | second | middle_bit, middle)
+        return True
+
+    def __node(self, coord: Coord) -> int:
+        return self.node_of[self.board.topology.index[coord]]
+
+    def connections(self, a: Coord, b: Coord) -> tuple:
+        """ Get the connections between two cells or edges
+
+        Parameters:
+            a: (Coord) first cell or edge
+            b: (Coord) second cell or edge
+
+        Returns:
+            vcs (list[int]): carriers of the VCs, empty if there are none
+            scs (list[tuple[int, int]]): (carrier, key) of the SCs
+        """
+        self.__update()
+        x, y = self.__node(a), self.__node(b)
+        if x < 0 or y < 0 or x == y:
+            return [], []
+        return list(self.vcs.get(x, dict()).get(y, ())), list(self.scs.get(x, dict()).get(y, ()))
+
+    def edges(self) -> tuple:
+        """ Get the player's own two edges
+
+        Returns: (tuple[Coord, Coord])
+            the edges this player connects
+        """
+        if self.color == Color.WHITE:
+            return Edges.TOP, Edges.BOTTOM
+        return Edges.LEFT, Edges.RIGHT
+
+    def must_play(self, deadline: float = None) -> int:
+        """ Get the cells the opponent has to play in to stop this player winning
+
+        Parameters:
+            deadline: (float) perf_counter() time to give up at, None for no limit
+
+        Returns: (int)
+            bitset of cell ids in every edge-to-edge connection's carrier, 0 if the
+            player has no edge-to-edge connection, all the connections are already
+            unbreakable or complete, or the search did not finish by the deadline
+        """
+        if not self.__update(deadline):
+            return 0
+        vcs, scs = self.connections(*self.edges())
+        carriers = vcs + [carrier for carrier, _ in scs]
+        if not carriers:
+            return 0
+        region = carriers[0]
+        for carrier in carriers[1:]:
+            region &= carrier
+        return region
+
+    def coords(self, carrier: int) -> list:
+        """ Turn a carrier bitset into the cells it holds
+
+        Parameters:
+            carrier: (int) bitset of cell ids
+
+        Returns: (list[Coord])
+            the cells, in id order
+        """
+        coords = self.board.topology.coords
+        found = []
+        while carrier:
+            low = carrier & -carrier
+            found.append(coords[low.bit_length() - 1])
+            carrier ^= low
+        return found
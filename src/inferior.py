@@ -0,0 +1,171 @@
+# inferior.py
+
+from constants import *
+from coord import Coord
+
+# neighbour offsets in the order they go round a cell; offset k faces offset k+3
+RING = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+NOWHERE = -1  # off the board past a corner, where two edges meet
+
+# ring of neighbour ids for every board cell, by board size
+_rings = dict()
+
+
+def rings(topology: object) -> list:
+    """ Get the neighbours of every board cell in ring order
+
+    A neighbour off the board is the edge it lies beyond; past a corner it
+    belongs to neither edge and is NOWHERE
+
+    Parameters:
+        topology: (Topology) geometry of the board
+
+    Returns: (list[tuple[int, ...]])
+        six neighbour ids for each board cell id
+    """
+    size = topology.size
+    if size not in _rings:
+        table = []
+        for coord in topology.coords[:size*size]:
+            ring = []
+            for dx, dy in RING:
+                x, y = coord.getx() + dx, coord.gety() + dy
+                outside = [edge for edge, off in ((topology.left, x < 1), (topology.right, x > size),
+                                                  (topology.bottom, y < 1), (topology.top, y > size)) if off]
+                if not outside:
+                    ring.append(topology.index[Coord(x, y)])
+                elif len(outside) == 1:
+                    ring.append(outside[0])
+                else:
+                    ring.append(NOWHERE)
+            table.append(tuple(ring))
+        _rings[size] = table
+    return _rings[size]
+
+
+def dead_to(ring: tuple, colors: bytearray) -> int:
+    """ Check a cell against the dead-cell patterns
+
+    With X and Y the two colours, a cell is dead if its neighbours hold
+        four X in a row,
+        three X in a row and a Y facing the middle one, or
+        two X in a row facing two Y in a row.
+    A dead cell can be given to either player without changing the result.
+
+    Parameters:
+        ring: (tuple[int, ...]) the cell's neighbours in ring order
+        colors: (bytearray) colour codes by cell id
+
+    Returns: (int)
+        colour code of the X that kills the cell, 0 if it is not dead
+    """
+    around = [colors[node] if node != NOWHERE else -1 for node in ring]
+    for k in range(6):
+        x = around[k]
+        if x <= 0 or around[(k+1) % 6] != x:
+            continue
+        y = 3 - x
+        if around[(k+2) % 6] == x:
+            if around[(k+3) % 6] == x or around[(k+4) % 6] == y:
+                return x
+        if around[(k+3) % 6] == y and around[(k+4) % 6] == y:
+            return x
+    return 0
+
+
+def captured_by(topology: object, colors: bytearray, cell: int) -> tuple:
+    """ Check whether a cell lies in a small empty region walled in by one colour
+
+    A region of one or two empty cells with only X around it is X's: X
+    answers any Y move in it with the other cell, so it can be filled with
+    X right away.
+
+    Parameters:
+        topology: (Topology) geometry of the board
+        colors: (bytearray) colour codes by cell id
+        cell: (int) id of an empty cell
+
+    Returns:
+        color (int): colour code of the capturer, 0 if not captured
+        region (tuple[int, ...]): ids of the empty cells in the region
+    """
+    empty = COLOR_CODES[Color.EMPTY]
+    region = [cell]
+    for node in topology.neighbours(cell):
+        if colors[node] == empty:
+            region.append(node)
+    if len(region) > 2:
+        return 0, ()
+    owner = 0
+    for member in region:
+        for node in topology.neighbours(member):
+            code = colors[node]
+            if code == empty:
+                if node not in region:
+                    return 0, ()
+            elif owner == 0:
+                owner = code
+            elif code != owner:
+                return 0, ()
+    return owner, tuple(region)
+
+
+class InferiorCells:
+    def __init__(self, topology: object, colors: bytearray) -> None:
+        """ Create an InferiorCells object: the dead and captured cells of a position
+
+        Dead and captured cells are filled in as they are found, the dead
+        ones with the colour that killed them and the captured ones with
+        their capturer, and the board is scanned again until nothing
+        changes, since filling one cell can settle its neighbours.
+
+        Parameters:
+            topology: (Topology) geometry of the board
+            colors: (bytearray) colour codes by cell id
+        """
+        empty = COLOR_CODES[Color.EMPTY]
+        ring = rings(topology)
+        self.fill = bytearray(colors)
+        self.dead = set()
+        self.captured = {COLOR_CODES[Color.WHITE]: set(), COLOR_CODES[Color.BLACK]: set()}
+
+        changed = True
+        while changed:
+            changed = False
+            for cell in range(topology.size ** 2):
+                if self.fill[cell] != empty:
+                    continue
+                killer = dead_to(ring[cell], self.fill)
+                if killer:
+                    self.dead.add(cell)
+                    self.fill[cell] = killer
+                    changed = True
+                    continue
+                owner, region = captured_by(topology, self.fill, cell)
+                if owner:
+                    for member in region:
+                        self.captured[owner].add(member)
+                        self.fill[member] = owner
+                    changed = True
+
+    def dominated(self, color: Color) -> set:
+        """ Cells a player gains nothing by playing: those the opponent has captured
+
+        Parameters:
+            color: (Color) player to move
+
+        Returns: (set[int])
+            cell ids
+        """
+        return self.captured[3 - COLOR_CODES[color]]
+
+    def pruned(self, color: Color) -> set:
+        """ Every empty cell a player can leave out of their candidate moves
+
+        Parameters:
+            color: (Color) player to move
+
+        Returns: (set[int])
+            cell ids of dead, captured and dominated cells
+        """
+        return self.dead | self.captured[COLOR_CODES[color]] | self.dominated(color)
@@ -7,15 +7,58 @@ This is the driver code used to interact with the Hex bot.
 from bot import HexBot
 from constants import Color
 import argparse
+import sys
 
 def main():
     parser = argparse.ArgumentParser(description="Deus Hex Machina: A Hex-playing bot")
-    parser.add_argument("color", metavar="<COLOR>", choices=["white", "black"],
+    parser.add_argument("color", metavar="<COLOR>", choices=["white", "black"], nargs="?",
                         help="This bot's color. White is left->right")
+    parser.add_argument("--strategy", choices=["classic", "mcts"], default="classic",
+                        help="How moves are chosen: path heuristics or Monte Carlo tree search")
+    parser.add_argument("--move-time", type=float, default=1.0, metavar="SECONDS",
+                        help="Most thinking time allowed for any single move")
+    parser.add_argument("--game-time", type=float, default=None, metavar="SECONDS",
+                        help="Total thinking time for the whole game; budgets each move from it")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Worker processes for the mcts strategy (root-parallel search)")
+    parser.add_argument("--merge", choices=["sum", "vote"], default="sum",
+                        help="How worker results are combined: summed root visits or one vote per worker")
+    parser.add_argument("--ponder", action="store_true",
+                        help="Keep the mcts search running while the opponent thinks (ignored with --server)")
+    parser.add_argument("--hsearch", action="store_true",
+                        help="Have the classic strategy block the opponent's virtual connections (slower)")
+    parser.add_argument("--server", action="store_true",
+                        help="Play many games at once; every command starts with a game id (see server.py)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Stay resident and play games for client.py over a Unix socket (see daemon.py)")
+    parser.add_argument("--socket", default=None, metavar="PATH",
+                        help="Socket the daemon listens on (default in $XDG_RUNTIME_DIR, "
+                             "or a private temporary directory)")
     args = parser.parse_args()
 
+    options = dict(strategy=args.strategy, move_time=args.move_time, workers=args.workers,
+                   merge=args.merge, game_time=args.game_time, ponder=args.ponder,
+                   hsearch=args.hsearch)
+    # the server and daemon modules (and socketserver) are only loaded when asked for
+    if args.server:
+        from server import GameServer
+        GameServer(options).serve()
+        return
+    if args.daemon:
+        from daemon import EngineDaemon
+        from protocol import default_socket
+        try:
+            daemon = EngineDaemon(args.socket if args.socket is not None else default_socket(), options)
+        except OSError as error:
+            print("cannot start the daemon: {}".format(error), file=sys.stderr)
+            sys.exit(1)
+        daemon.serve()
+        return
+    if args.color is None:
+        parser.error("the <COLOR> argument is required unless --server or --daemon is given")
+
     color = Color.WHITE if args.color == "white" else Color.BLACK
-    bot = HexBot(color)
+    bot = HexBot(color, **options)
 
     help_items = [
         ["Command", "Example", "Description"],
@@ -27,6 +70,8 @@ def main():
         ["swap", "swap", "Uses the opening \"swap\" move in Hex"],
         ["unset {}", "unset a1", "Tells the bot to set a tile as unused"],
         ["check_win", "check_win", "Tells the bot to check if the game is over. Returns 1 if itself has won, -1 if the opponent has won, 0 if the game has not terminated"],
+        ["time_left {}", "time_left 93.5", "Tells the bot how many seconds are left on its game clock"],
+        ["stats [reset|{path}]", "stats", "Prints per-command latencies; 'reset' clears them, a path dumps the histograms as JSON"],
         ["quit", "quit", "The game is over"]
     ]
 
@@ -45,6 +90,7 @@ def main():
             print("\nNote that draws are impossible in hex, so no response for a draw is required")
 
         cmd = get_cmd()
+    bot.stop_ponder()
     return
 
 
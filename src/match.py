@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# match.py
+
+"""
+Plays matches between two bot configurations and reports how they compare.
+
+Each side is either a HexBot built in this process from keyword options, or
+a separate program (eg. main.py) driven over stdin/stdout with the usual
+init_board/seto/make_move/check_win commands. Games run across a process
+pool; colours and the first move alternate between games, and a "swap"
+reply is passed on to the other side.
+"""
+import argparse
+import json
+import shlex
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil, sqrt
+from random import Random
+from time import perf_counter
+from constants import *
+from coord import Coord
+from bot import HexBot
+from protocol import run_captured
+
+# commands that answer with a line of output; every other command is silent
+ANSWERS = ("make_move", "check_win")
+
+
+class InProcessPlayer:
+    def __init__(self, color: Color, size: int, options: dict) -> None:
+        """ Create an InProcessPlayer object: a HexBot running in this process
+
+        Parameters:
+            color: (Color) colour the bot plays
+            size: (int) size of the game board
+            options: (dict) keyword arguments for HexBot
+        """
+        self.bot = HexBot(color, board_size=size, **options)
+
+    def command(self, cmd: list) -> str:
+        """ Run a command and collect what it prints
+
+        Parameters:
+            cmd: (list[str]) command and its arguments
+
+        Returns: (str)
+            the command's output, stripped
+        """
+        return run_captured(self.bot, cmd).strip()
+
+    def close(self) -> None:
+        self.bot.stop_ponder()
+        if self.bot.parallel is not None:
+            self.bot.parallel.close()
+
+
+class SubprocessPlayer:
+    def __init__(self, color: Color, size: int, program: list) -> None:
+        """ Create a SubprocessPlayer object: a bot program speaking the text protocol
+
+        Parameters:
+            color: (Color) colour the bot plays, passed as its last argument
+            size: (int) size of the game board
+            program: (list[str]) command line that starts the bot
+        """
+        name = "white" if color == Color.WHITE else "black"
+        self.process = subprocess.Popen(program + [name], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        text=True, bufsize=1)
+        self.command(["init_board", str(size)])
+
+    def command(self, cmd: list) -> str:
+        """ Send a command and read its answer, if it has one
+
+        Parameters:
+            cmd: (list[str]) command and its arguments
+
+        Returns: (str)
+            the answer line, stripped, or "" for silent commands
+        """
+        self.process.stdin.write(" ".join(cmd) + "\n")
+        self.process.stdin.flush()
+        if cmd[0] not in ANSWERS:
+            return ""
+        return self.process.stdout.readline().strip()
+
+    def close(self) -> None:
+        try:
+            self.process.stdin.write("quit\n")
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait()
+
+
+def make_player(config: dict, color: Color, size: int) -> object:
+    """ Start the player a configuration describes
+
+    Parameters:
+        config: (dict) {"program": [...]} for a subprocess, {"options": {...}} for a HexBot
+        color: (Color) colour the player starts as
+        size: (int) size of the game board
+
+    Returns: (InProcessPlayer | SubprocessPlayer)
+        the player
+    """
+    if config.get("program"):
+        return SubprocessPlayer(color, size, config["program"])
+    return InProcessPlayer(color, size, config.get("options", dict()))
+
+
+def play_game(configs: tuple, size: int, game: int, opening: int, seed: int) -> dict:
+    """ Play one game between the two configurations
+
+    Side 0 is white in even games; white moves first in games 0, 1, 4, 5,...
+    A side that answers with an illegal move, or not at all, loses.
+
+    Parameters:
+        configs: (tuple[dict, dict]) the two sides
+        size: (int) size of the game board
+        game: (int) number of this game in the match
+        opening: (int) random moves played for each game before the bots take over
+        seed: (int) seed of the match; the opening depends on it and on the game number
+
+    Returns: (dict)
+        winner (0 or 1), moves, latencies (per side, seconds per make_move),
+        forfeit (bool) and swapped (bool)
+    """
+    colors = [Color.WHITE, Color.BLACK] if game % 2 == 0 else [Color.BLACK, Color.WHITE]
+    players = [make_player(configs[side], colors[side], size) for side in (0, 1)]
+    latencies = [[], []]
+    empties = {str(Coord(x, y)) for x in range(1, size+1) for y in range(1, size+1)}
+    first = Color.WHITE if game // 2 % 2 == 0 else Color.BLACK
+    turn = colors.index(first)
+    moves = 0
+    swapped = False
+    winner = None
+    forfeit = False
+
+    try:
+        rng = Random(seed * 1000003 + game)
+        for _ in range(opening):
+            move = rng.choice(sorted(empties))
+            empties.discard(move)
+            players[turn].command(["sety", move])
+            players[1-turn].command(["seto", move])
+            moves += 1
+            turn = 1 - turn
+
+        while winner is None:
+            start = perf_counter()
+            move = players[turn].command(["make_move"])
+            latencies[turn].append(perf_counter() - start)
+            moves += 1
+            if move == "swap" and moves == 2 and not swapped:
+                swapped = True
+                colors.reverse()
+                players[1-turn].command(["swap"])
+            elif move in empties:
+                empties.discard(move)
+                players[1-turn].command(["seto", move])
+            else:
+                winner = 1 - turn
+                forfeit = True
+                break
+            result = players[0].command(["check_win"])
+            if result == "1":
+                winner = 0
+            elif result == "-1":
+                winner = 1
+            elif not empties:
+                break  # a full board always has a winner; the bots disagree with the rules
+            turn = 1 - turn
+    finally:
+        for player in players:
+            player.close()
+
+    return {"winner": winner, "moves": moves, "latencies": latencies, "forfeit": forfeit, "swapped": swapped}
+
+
+def wilson(wins: int, games: int, z: float = 1.96) -> tuple:
+    """ Wilson score interval of a win rate
+
+    Parameters:
+        wins: (int) games won
+        games: (int) games played
+        z: (float) standard score of the confidence level (1.96 for 95%)
+
+    Returns: (tuple[float, float])
+        lower and upper bound
+    """
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    centre = (p + z*z / (2*games)) / (1 + z*z / games)
+    half = z * sqrt(p * (1 - p) / games + z*z / (4*games*games)) / (1 + z*z / games)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def percentile(values: list, fraction: float) -> float:
+    """ Nearest-rank percentile
+
+    Parameters:
+        values: (list[float]) samples, sorted
+        fraction: (float) eg. 0.95 for p95
+
+    Returns: (float)
+        the sample at that rank, 0 if there are none
+    """
+    if not values:
+        return 0.0
+    rank = min(len(values) - 1, max(0, ceil(fraction * len(values)) - 1))
+    return values[rank]
+
+
+def summarise(results: list, elapsed: float) -> dict:
+    """ Combine the games of a match into a report
+
+    Parameters:
+        results: (list[dict]) what play_game returned for every game
+        elapsed: (float) wall-clock seconds the match took
+
+    Returns: (dict)
+        per side: wins, win rate and its 95% interval, moves per second of
+        thinking time and make_move latency percentiles; plus match totals
+    """
+    games = len(results)
+    report = {"games": games, "seconds": elapsed, "sides": []}
+    decided = [result for result in results if result["winner"] is not None]
+    for side in (0, 1):
+        wins = sum(1 for result in decided if result["winner"] == side)
+        latencies = sorted(t for result in results for t in result["latencies"][side])
+        thinking = sum(latencies)
+        low, high = wilson(wins, len(decided))
+        report["sides"].append({
+            "wins": wins,
+            "win_rate": wins / len(decided) if decided else 0.0,
+            "interval": [low, high],
+            "forfeits": sum(1 for result in results if result["forfeit"] and result["winner"] != side),
+            "moves": len(latencies),
+            "moves_per_second": len(latencies) / thinking if thinking else 0.0,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+        })
+    report["undecided"] = games - len(decided)
+    report["swaps"] = sum(1 for result in results if result["swapped"])
+    report["moves_per_second"] = sum(result["moves"] for result in results) / elapsed if elapsed else 0.0
+    return report
+
+
+def run_match(configs: tuple, size: int, games: int, workers: int = 1, opening: int = 0, seed: int = 0) -> dict:
+    """ Play a whole match, spreading the games over worker processes
+
+    Parameters:
+        configs: (tuple[dict, dict]) the two sides, see make_player
+        size: (int) size of the game board
+        games: (int) number of games
+        workers: (int) processes to play games in; 1 plays them here
+        opening: (int) random moves at the start of every game
+        seed: (int) seed for the random openings
+
+    Returns: (dict)
+        the report, see summarise
+    """
+    start = perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(play_game, configs, size, game, opening, seed) for game in range(games)]
+            results = [future.result() for future in futures]
+    else:
+        results = [play_game(configs, size, game, opening, seed) for game in range(games)]
+    return summarise(results, perf_counter() - start)
+
+
+def parse_options(text: str) -> dict:
+    """ Parse HexBot options written as "key=value,key=value"
+
+    Values that read as numbers become numbers; "none", "true" and "false" are
+    understood, anything else stays a string
+
+    Parameters:
+        text: (str) the options
+
+    Returns: (dict)
+        keyword arguments for HexBot
+    """
+    options = dict()
+    for item in filter(None, text.split(",")):
+        key, _, value = item.partition("=")
+        lowered = value.lower()
+        if lowered in ("none", "true", "false"):
+            options[key.strip()] = {"none": None, "true": True, "false": False}[lowered]
+            continue
+        for kind in (int, float):
+            try:
+                options[key.strip()] = kind(value)
+                break
+            except ValueError:
+                pass
+        else:
+            options[key.strip()] = value
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a match between two bot configurations")
+    for side in ("a", "b"):
+        parser.add_argument("--" + side, default="", metavar="OPTIONS",
+                            help="HexBot options for side {}, eg. strategy=mcts,move_time=0.2".format(side))
+        parser.add_argument("--{}-program".format(side), default=None, metavar="COMMAND",
+                            help="Run side {} as a program instead, eg. \"python3 main.py\"; "
+                                 "its colour is appended to the command".format(side))
+    parser.add_argument("--size", type=int, default=10, help="Board size")
+    parser.add_argument("--games", type=int, default=20, help="Number of games")
+    parser.add_argument("--workers", type=int, default=1, help="Games played at once, each in its own process")
+    parser.add_argument("--opening", type=int, default=0, metavar="N",
+                        help="Random moves at the start of every game, so deterministic bots vary")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random openings")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    configs = tuple(
+        {"program": shlex.split(program)} if program else {"options": parse_options(options)}
+        for options, program in ((args.a, args.a_program), (args.b, args.b_program))
+    )
+    report = run_match(configs, args.size, args.games, args.workers, args.opening, args.seed)
+
+    print("{} games on {}x{} in {:.1f}s ({:.1f} moves/s overall, {} swaps, {} undecided)".format(
+        report["games"], args.size, args.size, report["seconds"], report["moves_per_second"],
+        report["swaps"], report["undecided"]))
+    for name, side in zip("AB", report["sides"]):
+        print("{}: {:3} wins  {:6.1%}  95% CI [{:5.1%}, {:5.1%}]  {:3} forfeits  "
+              "{:7.1f} moves/s  p50 {:.3f}s  p95 {:.3f}s  p99 {:.3f}s".format(
+                  name, side["wins"], side["win_rate"], side["interval"][0], side["interval"][1],
+                  side["forfeits"], side["moves_per_second"], side["p50"], side["p95"], side["p99"]))
+    if args.json is not None:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
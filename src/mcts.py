@@ -0,0 +1,317 @@
+# mcts.py
+
+from math import log, sqrt
+from random import Random
+from constants import *
+from timer import Timer
+from inferior import InferiorCells
+
+
+class Node:
+    __slots__ = ("move", "player", "parent", "children", "visits", "wins", "rave_visits", "rave_wins")
+
+    def __init__(self, move: int, player: int, parent: object) -> None:
+        """ Create a Node object: one move in the search tree
+
+        Parameters:
+            move: (int) cell id of the move that leads to this node (-1 for the root)
+            player: (int) colour code of the player who made that move
+            parent: (Node) node this move was played from, None for the root
+        """
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = None  # expanded on the second visit
+        self.visits = 0
+        self.wins = 0
+        self.rave_visits = 0
+        self.rave_wins = 0
+
+
+class MCTS:
+    def __init__(
+            self,
+            topology: object,
+            exploration: float = 0.4,
+            rave_equivalence: float = 300,
+            seed: int = None
+            ) -> None:
+        """ Create a MCTS object: a UCT search with RAVE over random playouts
+
+        Playouts fill the board at random, except that a player whose
+        two-bridge has just been intruded on always answers in the other
+        carrier cell. That single rule keeps playouts from throwing away
+        the connections the rest of the bot relies on.
+
+        Parameters:
+            topology: (Topology) geometry of the board being searched
+            exploration: (float) UCT exploration constant
+            rave_equivalence: (float) visit count at which RAVE and real results weigh the same
+            seed: (int) seed for this engine's random number stream
+        """
+        self.topology = topology
+        self.exploration = exploration
+        self.rave_equivalence = rave_equivalence
+        self.rng = Random(seed)
+        self.playouts = 0
+        self.root = None
+        self.root_moves = None
+        self.colors = None
+        self.to_move = 0
+
+        # for every cell, the two-bridges it is a carrier of: (end, end, other carrier)
+        # bridges exist in both directions, so keep the one leaving the lower id
+        self.responses = []
+        for i in range(topology.cell_count()):
+            responses = []
+            for b in topology.bridges_of(i, topology.CARRIER):
+                origin = topology.bridge_origin[b]
+                dest = topology.bridge_dest[b]
+                if origin < dest:
+                    other = topology.bridge_dep1[b] if topology.bridge_dep0[b] == i else topology.bridge_dep0[b]
+                    responses.append((origin, dest, other))
+            self.responses.append(responses)
+
+    def set_position(self, colors: bytearray, to_move: Color) -> None:
+        """ Start a fresh tree at a new root position
+
+        Parameters:
+            colors: (bytearray) colour codes by cell id, eg. Board.colors
+            to_move: (Color) player to move in this position
+        """
+        self.colors = bytearray(colors)
+        self.to_move = COLOR_CODES[to_move]
+        self.root = Node(-1, 3 - self.to_move, None)
+        self.root_moves = self.__candidates()
+        self.playouts = 0
+
+    def advance(self, move: int) -> None:
+        """ Play a move at the root, keeping the statistics gathered beneath it
+
+        Parameters:
+            move: (int) cell id of the move played from the root position
+        """
+        self.colors[move] = self.to_move
+        self.to_move = 3 - self.to_move
+        child = None
+        if self.root.children is not None:
+            for node in self.root.children:
+                if node.move == move:
+                    child = node
+                    break
+        if child is None:
+            child = Node(move, 3 - self.to_move, None)
+        child.parent = None
+        self.root = child
+        self.root_moves = self.__candidates()
+
+    def __candidates(self) -> list:
+        """ Get the root moves left after dropping dead, captured and dominated cells
+
+        Returns: (list[int])
+            cell ids the root expands to
+        """
+        pruned = InferiorCells(self.topology, self.colors).pruned(CODE_COLORS[self.to_move])
+        moves = [i for i in range(self.topology.size ** 2) if self.colors[i] == 0 and i not in pruned]
+        return moves if moves else [i for i in range(len(self.colors)) if self.colors[i] == 0]
+
+    def search(self, budget: float, stop: object = None) -> int:
+        """ Run playouts from the root until the time budget runs out
+
+        Stops early once the most visited move can no longer be overtaken
+
+        Parameters:
+            budget: (float) seconds to search for
+            stop: (threading.Event) optional flag that ends the search early
+
+        Returns: (int)
+            cell id of the most visited move, -1 if there is no legal move
+        """
+        timer = Timer()
+        iterations = 0
+        # always run at least one iteration so the root has children to choose from
+        while iterations == 0 or timer.get_time() < budget:
+            if stop is not None and stop.is_set():
+                break
+            self.iterate()
+            iterations += 1
+            if iterations % 64 == 0 and self.__decided(iterations, timer.get_time(), budget):
+                break
+        return self.best_move()
+
+    def __decided(self, iterations: int, elapsed: float, budget: float) -> bool:
+        """ Check whether the rest of the budget could still change the best move
+
+        Parameters:
+            iterations: (int) iterations run so far in this search
+            elapsed: (float) seconds spent so far
+            budget: (float) seconds the search may take
+
+        Returns: (bool)
+            True if no other root move can catch up with the most visited one
+        """
+        if not self.root.children or len(self.root.children) < 2:
+            return True
+        remaining = iterations / max(elapsed, 1e-9) * (budget - elapsed)
+        first, second = 0, 0
+        for child in self.root.children:
+            if child.visits > first:
+                first, second = child.visits, first
+            elif child.visits > second:
+                second = child.visits
+        return first - second > remaining
+
+    def iterate(self) -> None:
+        """ Run one selection, expansion, playout and backpropagation step
+        """
+        colors = bytearray(self.colors)
+        node = self.root
+        last = -1
+
+        # selection: descend through expanded nodes
+        while node.children:
+            node = self.__select(node)
+            colors[node.move] = node.player
+            last = node.move
+
+        # expansion: a leaf grows its children the second time it is reached
+        # the root only grows the moves that survived the inferior cell analysis
+        if node.children is None and (node.visits > 0 or node is self.root):
+            player = 3 - node.player
+            if node is self.root:
+                node.children = [Node(i, player, node) for i in self.root_moves]
+            else:
+                node.children = [Node(i, player, node) for i in range(len(colors)) if colors[i] == 0]
+            if node.children:
+                node = node.children[self.rng.randrange(len(node.children))]
+                colors[node.move] = node.player
+                last = node.move
+
+        winner = self.__playout(colors, 3 - node.player, last)
+        self.playouts += 1
+
+        # backpropagation, with all-moves-as-first credit for the siblings on the path
+        while node is not None:
+            node.visits += 1
+            if node.player == winner:
+                node.wins += 1
+            if node.children:
+                for child in node.children:
+                    if colors[child.move] == child.player:
+                        child.rave_visits += 1
+                        if child.player == winner:
+                            child.rave_wins += 1
+            node = node.parent
+
+    def best_move(self) -> int:
+        """ Get the most visited move at the root
+
+        Returns: (int)
+            cell id of the move, -1 if the root has no children
+        """
+        if not self.root.children:
+            return -1
+        return max(self.root.children, key=lambda child: child.visits).move
+
+    def root_stats(self) -> dict:
+        """ Get the visit and win counts of every move at the root
+
+        Returns: (dict[int, tuple[int, int]])
+            (visits, wins) by cell id
+        """
+        if not self.root.children:
+            return dict()
+        return {child.move: (child.visits, child.wins) for child in self.root.children}
+
+    def __select(self, node: object) -> object:
+        """ Pick the child with the best UCT-RAVE value
+
+        Parameters:
+            node: (Node) an expanded node
+
+        Returns: (Node)
+            the child to descend into
+        """
+        log_visits = log(node.visits + 1)
+        best = None
+        best_value = -1.0
+        for child in node.children:
+            if child.visits == 0 and child.rave_visits == 0:
+                value = 10.0  # try unseen moves first
+            else:
+                # beta shifts the weight from the RAVE estimate to the real one as visits grow
+                beta = child.rave_visits / (child.rave_visits + child.visits +
+                                            child.rave_visits * child.visits / self.rave_equivalence + 1e-9)
+                value = 0.0
+                if child.visits:
+                    value += (1 - beta) * child.wins / child.visits + \
+                        self.exploration * sqrt(log_visits / child.visits)
+                else:
+                    value += self.exploration
+                if child.rave_visits:
+                    value += beta * child.rave_wins / child.rave_visits
+            if value > best_value:
+                best = child
+                best_value = value
+        return best
+
+    def __playout(self, colors: bytearray, to_move: int, last: int) -> int:
+        """ Fill the board at random and report who wins
+
+        Parameters:
+            colors: (bytearray) position to fill in place
+            to_move: (int) colour code of the player to move
+            last: (int) cell id of the previous move, -1 if none
+
+        Returns: (int)
+            colour code of the winner
+        """
+        empties = [i for i in range(len(colors)) if colors[i] == 0]
+        self.rng.shuffle(empties)
+        position = {cell: i for i, cell in enumerate(empties)}
+        responses = self.responses
+
+        for i in range(len(empties)):
+            move = empties[i]
+            # save a two-bridge the opponent just intruded on
+            if last >= 0:
+                for end0, end1, other in responses[last]:
+                    if colors[end0] == to_move and colors[end1] == to_move and colors[other] == 0:
+                        # swap the reply into this turn's slot
+                        j = position[other]
+                        empties[i], empties[j] = other, move
+                        position[move] = j
+                        move = other
+                        break
+            colors[move] = to_move
+            last = move
+            to_move = 3 - to_move
+
+        return COLOR_CODES[Color.WHITE] if self.__white_connected(colors) else COLOR_CODES[Color.BLACK]
+
+    def __white_connected(self, colors: bytearray) -> bool:
+        """ Check whether white joins top and bottom on a filled board
+
+        Parameters:
+            colors: (bytearray) colour codes by cell id
+
+        Returns: (bool)
+            True if white has won, False if black has
+        """
+        topology = self.topology
+        nbrs = topology.nbrs
+        nbr_start = topology.nbr_start
+        white = COLOR_CODES[Color.WHITE]
+        goal = topology.bottom
+        seen = {topology.top}
+        stack = [topology.top]
+        while stack:
+            node = stack.pop()
+            for k in range(nbr_start[node], nbr_start[node+1]):
+                child = nbrs[k]
+                if child == goal:
+                    return True
+                if colors[child] == white and child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return False
@@ -0,0 +1,101 @@
+# parallel.py
+
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from constants import *
+from mcts import MCTS
+from topology import Topology
+
+# one engine per board size in each worker process, so the bridge tables are built once
+_engines = dict()
+
+
+def _search_worker(size: int, colors: bytes, to_move: Color, budget: float, seed: int) -> tuple:
+    """ Search a position in a worker process
+
+    Parameters:
+        size: (int) size of the game board
+        colors: (bytes) colour codes by cell id
+        to_move: (Color) player to move
+        budget: (float) seconds to search for
+        seed: (int) seed for this worker's random number stream
+
+    Returns:
+        stats (dict[int, tuple[int, int]]): (visits, wins) by cell id at the root
+        playouts (int): number of playouts run
+    """
+    if size not in _engines:
+        _engines[size] = MCTS(Topology.get(size))
+    engine = _engines[size]
+    engine.rng.seed(seed)
+    engine.set_position(colors, to_move)
+    engine.search(budget)
+    return engine.root_stats(), engine.playouts
+
+
+class RootParallelSearch:
+    MERGES = ("sum", "vote")
+
+    def __init__(self, workers: int, merge: str = "sum", seed: int = None) -> None:
+        """ Create a RootParallelSearch object
+
+        Every worker process searches the same position with its own tree and
+        random stream; only the root statistics come back to be merged.
+
+        Parameters:
+            workers: (int) number of worker processes
+            merge: (str) "sum" adds the root visit counts of all workers,
+                "vote" gives each worker's most visited move one vote
+            seed: (int) seed from which the workers' seeds are drawn
+        """
+        if merge not in RootParallelSearch.MERGES:
+            raise ValueError("unknown merge policy: " + merge)
+        self.workers = workers
+        self.merge = merge
+        self.rng = Random(seed)
+        self.playouts = 0
+        self.__pool = None  # started on first use, then kept warm between moves
+
+    def search(self, board: object, to_move: Color, budget: float) -> int:
+        """ Search the board's position on every worker and merge the results
+
+        Parameters:
+            board: (Board) the board in current gamestate
+            to_move: (Color) player to move
+            budget: (float) seconds each worker searches for
+
+        Returns: (int)
+            cell id of the chosen move, -1 if there is no legal move
+        """
+        if self.__pool is None:
+            self.__pool = ProcessPoolExecutor(self.workers)
+        colors = bytes(board.colors)
+        futures = [
+            self.__pool.submit(_search_worker, board.getsize(), colors, to_move, budget, self.rng.getrandbits(64))
+            for _ in range(self.workers)
+        ]
+        results = [future.result() for future in futures]
+        self.playouts = sum(playouts for _, playouts in results)
+
+        visits = dict()
+        votes = dict()
+        for stats, _ in results:
+            if not stats:
+                continue
+            for move, (count, _) in stats.items():
+                visits[move] = visits.get(move, 0) + count
+            best = max(stats, key=lambda move: stats[move][0])
+            votes[best] = votes.get(best, 0) + 1
+        if not visits:
+            return -1
+        if self.merge == "vote":
+            # most votes wins, total visits break ties
+            return max(votes, key=lambda move: (votes[move], visits[move]))
+        return max(visits, key=lambda move: visits[move])
+
+    def close(self) -> None:
+        """ Shut the worker processes down
+        """
+        if self.__pool is not None:
+            self.__pool.shutdown()
+            self.__pool = None
@@ -0,0 +1,109 @@
+# pathfinder.py
+
+from collections import deque
+from constants import *
+from coord import Coord
+
+
+def shortest_path(board: object, start: Coord, goal: Coord, player: Color) -> tuple:
+    """ Find a cheapest path between start and goal with a 0-1 BFS
+
+    Every step costs 0 or 1 stones, so a deque replaces the priority queue:
+    0-cost children go to the front, 1-cost children to the back. All search
+    state lives in arrays local to this call, so searches never interfere.
+
+    Step costs (same as the original dijkstra):
+        neighbour:  1 if empty, 0 if friendly, impassable if hostile
+        two-bridge: 0 if SUCCESS, 1 if READY,
+                    1 if TO_BE from a friendly cell ('forwards'), 0 otherwise ('backwards')
+
+    Parameters:
+        board: (Board) the board in current gamestate
+        start: (Coord) cell to start the search from
+        goal: (Coord) cell we are trying to reach from start
+        player: (Color) the player that this search is done on behalf of
+
+    Returns:
+        (list[Coord]): the coords in order that form an optimal path from start to goal, empty if none
+        cost (int): the number of pieces that need to be played to secure this path, -1 if none
+    """
+    topology = board.topology
+    colors = board.colors
+    bridges = board.bridges[player]
+    nbrs = topology.nbrs
+    nbr_start = topology.nbr_start
+    bridge_dest = topology.bridge_dest
+    bridge_start = topology.bridge_start
+    friendly = COLOR_CODES[player]
+    empty = COLOR_CODES[Color.EMPTY]
+    SUCCESS, READY, TO_BE = Status.SUCCESS, Status.READY, Status.TO_BE
+
+    count = topology.cell_count()
+    source = topology.index[start]
+    target = topology.index[goal]
+    unreached = count + 1  # larger than any real cost
+    dist = [unreached] * count
+    parent = [-1] * count
+    done = bytearray(count)
+
+    dist[source] = 0
+    parent[source] = source
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        if done[node]:
+            continue  # stale entry, node was already settled at a lower cost
+        done[node] = 1
+        if node == target:
+            break
+        g = dist[node]
+
+        # direct neighbours
+        for k in range(nbr_start[node], nbr_start[node+1]):
+            child = nbrs[k]
+            color = colors[child]
+            if color == empty:
+                cost = 1
+            elif color == friendly:
+                cost = 0
+            else:
+                continue
+            if g + cost < dist[child]:
+                dist[child] = g + cost
+                parent[child] = node
+                if cost:
+                    queue.append(child)
+                else:
+                    queue.appendleft(child)
+
+        # two-bridges of the player's colour
+        for b in range(bridge_start[node], bridge_start[node+1]):
+            status = bridges[b].status
+            if status == SUCCESS:
+                cost = 0
+            elif status == READY:
+                cost = 1
+            elif status == TO_BE:
+                cost = 1 if colors[node] == friendly else 0
+            else:
+                continue
+            child = bridge_dest[b]
+            if g + cost < dist[child]:
+                dist[child] = g + cost
+                parent[child] = node
+                if cost:
+                    queue.append(child)
+                else:
+                    queue.appendleft(child)
+
+    if not done[target]:
+        return [], -1
+
+    # walk the parents back from the goal, then flip so the path runs start -> goal
+    path = [goal]
+    node = target
+    while node != source:
+        node = parent[node]
+        path.append(topology.coords[node])
+    path.reverse()
+    return path, dist[target]
@@ -0,0 +1,123 @@
+# playouts.py
+
+from collections import deque
+from random import Random
+from constants import *
+
+
+class PlayoutStats:
+    def __init__(self, count: int, white_wins: int, white_owned: list, winner_owned: list) -> None:
+        """ Create a PlayoutStats object: the results of one batch of playouts
+
+        Parameters:
+            count: (int) number of playouts in the batch
+            white_wins: (int) playouts won by white
+            white_owned: (list[int]) by cell id, playouts in which the cell ended white
+            winner_owned: (list[int]) by cell id, playouts in which the cell ended in the winner's colour
+        """
+        self.count = count
+        self.white_wins = white_wins
+        self.white_owned = white_owned
+        self.winner_owned = winner_owned
+
+    def win_rate(self, color: Color) -> float:
+        """ Fraction of the playouts won by a player
+
+        Parameters:
+            color: (Color) player to report for
+
+        Returns: (float)
+            win rate between 0 and 1
+        """
+        wins = self.white_wins if color == Color.WHITE else self.count - self.white_wins
+        return wins / self.count
+
+
+def _biased_bits(rng: Random, count: int, probability: float, precision: int = 8) -> int:
+    """ Draw 'count' independent bits, each set with the given probability
+
+    Builds the mask from the binary expansion of the probability, one random
+    word per binary digit, so the cost does not depend on 'count' bits
+
+    Parameters:
+        rng: (Random) random number stream
+        count: (int) number of bits
+        probability: (float) chance of each bit being set
+        precision: (int) binary digits of the probability that are honoured
+
+    Returns: (int)
+        the random mask
+    """
+    if probability >= 1.0:
+        return (1 << count) - 1
+    # rounding must not reach 1 << precision: those digits would all be 0, a mask of "never"
+    digits = min(int(probability * (1 << precision) + 0.5), (1 << precision) - 1)
+    mask = 0
+    # from the least significant digit up: a 1 ors in a fresh word, a 0 ands one in
+    for _ in range(precision):
+        word = rng.getrandbits(count)
+        mask = (word | mask) if digits & 1 else (word & mask)
+        digits >>= 1
+    return mask
+
+
+def batch_playouts(board: object, to_move: Color, count: int = 4096, seed: int = None) -> PlayoutStats:
+    """ Run many random playouts of the board's position at once
+
+    The batch is bit-sliced: each cell holds one Python int whose bit k is
+    set when the cell is white in playout k. The fill, the flood fill from
+    the top edge and the statistics are all whole-int operations per cell,
+    so the work grows with the number of cells, not with count.
+
+    Each empty cell goes to the player to move with probability
+    ceil(m/2)/m (m empty cells), matching the share of an alternating fill.
+
+    Parameters:
+        board: (Board) the board in current gamestate
+        to_move: (Color) player to move
+        count: (int) number of playouts
+        seed: (int) seed for the random fill
+
+    Returns: (PlayoutStats)
+        win counts and per-cell ownership counts
+    """
+    rng = Random(seed)
+    topology = board.topology
+    colors = board.colors
+    nbrs = topology.nbrs
+    nbr_start = topology.nbr_start
+    full = (1 << count) - 1
+    white = COLOR_CODES[Color.WHITE]
+    empty = COLOR_CODES[Color.EMPTY]
+
+    empties = colors.count(empty)
+    share = (empties + 1) // 2 / empties if empties else 0.0
+    white_share = share if to_move == Color.WHITE else 1 - share
+
+    # whites[i]: playouts in which cell i is white
+    whites = []
+    for code in colors:
+        if code == empty:
+            whites.append(_biased_bits(rng, count, white_share))
+        else:
+            whites.append(full if code == white else 0)
+
+    # reach[i]: playouts in which cell i is joined to the top edge by white
+    reach = [0] * len(colors)
+    reach[topology.top] = full
+    queue = deque([topology.top])
+    while queue:
+        node = queue.popleft()
+        mask = reach[node]
+        for k in range(nbr_start[node], nbr_start[node+1]):
+            child = nbrs[k]
+            new = mask & whites[child] & ~reach[child]
+            if new:
+                reach[child] |= new
+                queue.append(child)
+
+    wins = reach[topology.bottom]
+    losses = full & ~wins
+    white_owned = [mask.bit_count() for mask in whites]
+    winner_owned = [((mask & wins) | (~mask & losses)).bit_count() for mask in whites]
+    return PlayoutStats(count, wins.bit_count(), white_owned, winner_owned)
@@ -0,0 +1,89 @@
+# protocol.py
+
+import contextlib
+import io
+import os
+import stat
+import tempfile
+
+
+def run_captured(bot: object, cmd: list) -> str:
+    """ Run a protocol command on a bot and collect what it prints
+
+    Lets one process serve many bots (or answer over a socket) while the
+    bots keep printing their answers as they do on stdin/stdout
+
+    Parameters:
+        bot: (HexBot) bot to run the command on
+        cmd: (list[str]) command and its arguments
+
+    Returns: (str)
+        everything the command printed, without the trailing newline
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        bot.run_command(cmd)
+    return output.getvalue().rstrip("\n")
+
+
+# a line holding only this ends every answer sent over a socket, so the
+# reader knows when to stop even for commands that print nothing
+TERMINATOR = "\x1e"
+SOCKET_NAME = "deus-hex-machina.sock"
+
+
+def default_socket() -> str:
+    """ Get the socket a daemon listens on when none is given
+
+    The socket lives in $XDG_RUNTIME_DIR when that is set. Otherwise it
+    goes in a directory of our own under the temporary directory, created
+    readable by this user only, so nobody else can replace or connect to it.
+
+    Returns: (str)
+        file name of the socket
+
+    Raises: (PermissionError)
+        if the fallback directory exists but is not a private directory of ours
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, SOCKET_NAME)
+    directory = os.path.join(tempfile.gettempdir(), "deus-hex-machina-{}".format(os.getuid()))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError("{} is not a directory only this user can use".format(directory))
+    return os.path.join(directory, SOCKET_NAME)
+
+
+def write_framed(writer: object, output: str) -> None:
+    """ Send an answer followed by the terminator line, and flush it
+
+    Parameters:
+        writer: (file) binary stream to write to
+        output: (str) the answer, possibly empty
+    """
+    text = output + "\n" if output else ""
+    writer.write((text + TERMINATOR + "\n").encode())
+    writer.flush()
+
+
+def read_framed(reader: object) -> str:
+    """ Read one answer, up to its terminator line
+
+    Parameters:
+        reader: (file) binary stream to read from
+
+    Returns: (str)
+        the answer without the terminator, None if the stream closed first
+    """
+    lines = []
+    for raw in reader:
+        line = raw.decode().rstrip("\n")
+        if line == TERMINATOR:
+            return "\n".join(lines)
+        lines.append(line)
+    return None
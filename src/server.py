@@ -0,0 +1,136 @@
+# server.py
+
+import sys
+from bot import HexBot
+from constants import Color
+from protocol import run_captured
+
+# board sizes a game may ask for; big enough for large-board analysis, small
+# enough that one request cannot take the memory every other game needs
+MIN_SIZE = 2
+MAX_SIZE = 99
+# transposition table entries per game unless the options say otherwise; a
+# bot on its own gets 65536, too much to multiply by hundreds of games
+GAME_TT_SIZE = 1 << 12
+
+
+def parse_size(text: str) -> int:
+    """ Read the board size of a request
+
+    Parameters:
+        text: (str) the size as sent
+
+    Returns: (int)
+        the size, None if it is not a whole number from MIN_SIZE to MAX_SIZE
+    """
+    if not text.isdigit() or not MIN_SIZE <= int(text) <= MAX_SIZE:
+        return None
+    return int(text)
+
+
+class GameServer:
+    def __init__(self, options: dict = None) -> None:
+        """ Create a GameServer object: many games, each with its own bot, in one process
+
+        Every request line starts with a game id, and every line of the answer
+        starts with the same id, so one referee can drive any number of games
+        over a single pipe:
+            <id> new <white|black> [size]   start a game
+            <id> <command> [argument]       any bot command, eg. "g7 make_move"
+            <id> end                        forget a game
+            quit                            stop the server
+        Board geometry and the opening book are shared by all games of a size.
+        A request that fails only gets an error line for its own game; the
+        other games carry on. Bots never ponder here: a thread per game
+        would have every game fight the others for the processor. Each game
+        gets a small transposition table (GAME_TT_SIZE entries) unless the
+        options give tt_size.
+
+        Parameters:
+            options: (dict) keyword arguments for every HexBot, eg. strategy or move_time
+        """
+        self.options = dict(options) if options is not None else dict()
+        self.options["ponder"] = False
+        self.options.setdefault("tt_size", GAME_TT_SIZE)
+        self.games = dict()
+
+    def handle(self, line: str) -> str:
+        """ Run one request and build its answer
+
+        Parameters:
+            line: (str) the request
+
+        Returns: (str)
+            the answer, each line prefixed with the game id; empty for commands
+            that print nothing, "<id> error ..." if the request failed
+        """
+        words = line.split()
+        if len(words) < 2:
+            return "error expected: <game id> <command> [argument]" if words else ""
+        game, cmd = words[0], words[1:]
+        try:
+            return self.__run(game, cmd)
+        except Exception as error:
+            return "{} error {}: {}".format(game, type(error).__name__, error)
+
+    def __run(self, game: str, cmd: list) -> str:
+        """ Run one game's command; see handle
+
+        Parameters:
+            game: (str) the game id
+            cmd: (list[str]) command and its arguments
+        """
+
+        if cmd[0] == "new":
+            if len(cmd) not in (2, 3) or cmd[1] not in ("white", "black"):
+                return game + " error expected: new <white|black> [size]"
+            size = parse_size(cmd[2] if len(cmd) == 3 else "10")
+            if size is None:
+                return self.__size_error(game)
+            if game in self.games:
+                self.end(game)
+            color = Color.WHITE if cmd[1] == "white" else Color.BLACK
+            self.games[game] = HexBot(color, board_size=size, **self.options)
+            return ""
+        if game not in self.games:
+            return game + " error unknown game"
+        if cmd[0] == "end":
+            self.end(game)
+            return ""
+
+        bot = self.games[game]
+        if not bot.is_cmd(cmd):
+            return game + " error unknown command: " + " ".join(cmd)
+        if cmd[0] == "init_board" and (len(cmd) != 2 or parse_size(cmd[1]) is None):
+            return self.__size_error(game)
+        output = run_captured(bot, cmd)
+        return "\n".join(game + " " + text for text in output.split("\n")) if output else ""
+
+    @staticmethod
+    def __size_error(game: str) -> str:
+        return game + " error board size must be a whole number from {} to {}".format(MIN_SIZE, MAX_SIZE)
+
+    def end(self, game: str) -> None:
+        bot = self.games.pop(game)
+        bot.stop_ponder()
+        if bot.parallel is not None:
+            bot.parallel.close()
+
+    def serve(self, reader: object = sys.stdin, writer: object = sys.stdout) -> None:
+        """ Answer requests line by line until "quit" or the end of input
+
+        Each answer is written in one piece and flushed straight away
+
+        Parameters:
+            reader: (file) where requests come from
+            writer: (file) where answers go
+        """
+        for line in reader:
+            if line.strip() == "quit":
+                break
+            answer = self.handle(line)
+            if answer:
+                writer.write(answer + "\n")
+                writer.flush()
+        for game in list(self.games):
+            self.end(game)
@@ -0,0 +1,99 @@
+# stats.py
+
+import json
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        """ Create a LatencyHistogram object: counts of timings in power-of-two buckets
+
+        Bucket k holds timings of [2^k, 2^(k+1)) microseconds (bucket 0 also
+        takes anything under a microsecond), so recording a timing is a
+        bit_length and an increment, and the histogram never grows past a
+        few dozen entries however long the bot runs.
+        """
+        self.buckets = []
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        bucket = max(int(seconds * 1e6).bit_length() - 1, 0)
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """ Estimate a percentile from the buckets
+
+        Parameters:
+            fraction: (float) eg. 0.95 for p95
+
+        Returns: (float)
+            upper bound in seconds of the bucket holding that rank, capped at the
+            largest timing seen
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min((1 << (bucket + 1)) / 1e6, self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class CommandStats:
+    def __init__(self) -> None:
+        """ Create a CommandStats object: a latency histogram per protocol command
+        """
+        self.histograms = dict()
+
+    def record(self, command: str, seconds: float) -> None:
+        histogram = self.histograms.get(command)
+        if histogram is None:
+            histogram = self.histograms[command] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def reset(self) -> None:
+        self.histograms.clear()
+
+    def summary(self) -> list:
+        """ Describe every command's latencies, one line each
+
+        Returns: (list[str])
+            lines of count, mean, p50/p95/p99 and max in milliseconds
+        """
+        lines = []
+        for command in sorted(self.histograms):
+            histogram = self.histograms[command]
+            lines.append("{:12} count {:7}  mean {:9.3f}ms  p50 {:9.3f}ms  p95 {:9.3f}ms  p99 {:9.3f}ms  max {:9.3f}ms".format(
+                command, histogram.count, histogram.mean() * 1e3, histogram.percentile(0.50) * 1e3,
+                histogram.percentile(0.95) * 1e3, histogram.percentile(0.99) * 1e3, histogram.max * 1e3))
+        return lines
+
+    def dump(self, path: str) -> None:
+        """ Write every histogram to a JSON file
+
+        Parameters:
+            path: (str) file to write
+        """
+        data = {
+            command: {
+                "count": histogram.count,
+                "total": histogram.total,
+                "max": histogram.max,
+                "buckets_us": {str(1 << bucket): count for bucket, count in enumerate(histogram.buckets) if count},
+            }
+            for command, histogram in self.histograms.items()
+        }
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2, sort_keys=True)
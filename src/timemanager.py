@@ -0,0 +1,95 @@
+# timemanager.py
+
+from timer import Timer
+
+
+class TimeManager:
+    def __init__(
+            self,
+            game_time: float = None,
+            move_time: float = None,
+            margin: float = 0.05
+            ) -> None:
+        """ Create a TimeManager object: decides how long each move may take
+
+        Parameters:
+            game_time: (float) seconds on our clock for the whole game, None if untimed
+            move_time: (float) hard limit in seconds for any single move, None if unlimited
+            margin: (float) seconds held back from every budget for move output and overhead,
+                at most a tenth of the budget
+        """
+        self.game_time = game_time
+        self.move_time = move_time
+        self.margin = margin
+        self.remaining = game_time
+        self.budget = 0.0
+        self.__timer = Timer()
+
+    def reset(self) -> None:
+        """ Refill the game clock for a new game
+        """
+        self.remaining = self.game_time
+
+    def set_remaining(self, seconds: float) -> None:
+        """ Overwrite our remaining game time, eg. with the referee's clock
+
+        Parameters:
+            seconds: (float) time left on our clock
+        """
+        self.remaining = max(0.0, float(seconds))
+
+    def start_move(self, move_count: int, empties: int) -> float:
+        """ Start the clock for a move and decide how long it may take
+
+        The game clock is shared evenly over the moves we still expect to
+        play (half of the empty cells, at least a few), weighted towards the
+        middle game: the first two moves and those played with under a
+        quarter of the board empty get half a share, moves while the board
+        is still mostly empty get one and a half.
+
+        Parameters:
+            move_count: (int) number of moves played so far
+            empties: (int) number of empty cells on the board
+
+        Returns: (float)
+            seconds the move may take
+        """
+        self.__timer.reset()
+        budget = self.move_time if self.move_time is not None else float("inf")
+        if self.remaining is not None:
+            moves_left = max(empties // 2, 4)
+            share = self.remaining / moves_left
+            if move_count < 2:
+                share *= 0.5
+            elif empties > move_count:
+                share *= 1.5
+            elif empties * 4 < empties + move_count:
+                share *= 0.5  # under a quarter of the board left
+            budget = min(budget, share, self.remaining / 2)
+        if budget == float("inf"):
+            budget = 1.0  # untimed and unlimited: fall back to a second per move
+        # the margin never takes more than a tenth, so short budgets still leave time to search
+        self.budget = max(0.0, budget - min(self.margin, budget * 0.1))
+        return self.budget
+
+    def elapsed(self) -> float:
+        return self.__timer.get_time()
+
+    def time_left(self) -> float:
+        """ Seconds left before the current move's deadline
+
+        Returns: (float)
+            time left, never negative
+        """
+        return max(0.0, self.budget - self.__timer.get_time())
+
+    def end_move(self) -> float:
+        """ Stop the clock for a move and charge it to the game clock
+
+        Returns: (float)
+            seconds the move took
+        """
+        spent = self.__timer.get_time()
+        if self.remaining is not None:
+            self.remaining = max(0.0, self.remaining - spent)
+        return spent
@@ -0,0 +1,245 @@
+# topology.py
+
+from array import array
+from random import Random
+from constants import *
+from coord import Coord
+from cell import Cell
+from twobridge import TwoBridge
+
+
+class Topology:
+    # roles a cell can play in a two-bridge
+    ORIGIN = 0
+    DEST = 1
+    CARRIER = 2
+
+    __cache = dict()
+
+    def __init__(self, size: int) -> None:
+        """ Create a Topology object: the immutable geometry of a board size
+
+        Every cell gets an integer id, the board cells first and the four edge
+        cells last. Neighbours and two-bridges are stored CSR-style: the entries
+        for cell i live in [start[i], start[i+1]) of the matching flat array.
+        Use Topology.get() so the geometry is built once per size and shared.
+
+        Parameters:
+            size: (int) size of the game board
+        """
+        self.size = size
+        cells = Topology.__build_cells(size)
+        self.coords = list(cells)
+        self.index = {coord: i for i, coord in enumerate(self.coords)}
+        self.names = {str(coord): coord for coord in self.coords[:size*size]}
+        self.top = self.index[Edges.TOP]
+        self.bottom = self.index[Edges.BOTTOM]
+        self.left = self.index[Edges.LEFT]
+        self.right = self.index[Edges.RIGHT]
+        self.initial_colors = bytes(COLOR_CODES[cells[coord].color] for coord in self.coords)
+
+        # 180 degree rotation; it maps each player's pair of edges onto itself
+        self.rotation = array('i', (self.index[Coord(size+1-coord.getx(), size+1-coord.gety())]
+                                    for coord in self.coords[:size*size]))
+        self.rotation.extend((self.bottom, self.top, self.right, self.left))
+
+        # zobrist keys per colour and cell id, seeded by size so keys are identical across processes
+        rng = Random(size)
+        self.zobrist = {color: [rng.getrandbits(64) for _ in self.coords] for color in (Color.WHITE, Color.BLACK)}
+
+        # neighbours of every cell, as ids and as Coord sets shared by every board (never mutate)
+        self.nbr_start = array('i', [0])
+        self.nbrs = array('i')
+        self.neighbour_sets = []
+        for coord in self.coords:
+            self.nbrs.extend(self.index[node] for node in cells[coord].neighbours)
+            self.nbr_start.append(len(self.nbrs))
+            self.neighbour_sets.append(cells[coord].neighbours)
+
+        # two-bridges leaving every cell; the white and black dicts share their keys
+        # and order, so one bridge id indexes both colours' TwoBridge objects
+        self.bridge_start = array('i', [0])
+        self.bridge_origin = array('i')
+        self.bridge_dest = array('i')
+        self.bridge_dep0 = array('i')
+        self.bridge_dep1 = array('i')
+        self.bridge_depends = []
+        self.initial_status = {Color.WHITE: [], Color.BLACK: []}
+        for i, coord in enumerate(self.coords):
+            for dest, bridge in cells[coord].white_twobridges.items():
+                self.bridge_origin.append(i)
+                self.bridge_dest.append(self.index[dest])
+                self.bridge_dep0.append(self.index[bridge.depends[0]])
+                self.bridge_dep1.append(self.index[bridge.depends[1]])
+                self.bridge_depends.append(bridge.depends)
+                self.initial_status[Color.WHITE].append(bridge.status)
+                self.initial_status[Color.BLACK].append(cells[coord].black_twobridges[dest].status)
+            self.bridge_start.append(len(self.bridge_dest))
+
+        # reverse index: for every cell, each bridge it takes part in and its role there
+        # (edge cells included), so a move touches exactly the bridges it can change
+        roles = [[] for _ in self.coords]
+        for b in range(len(self.bridge_dest)):
+            roles[self.bridge_origin[b]].append((b, Topology.ORIGIN))
+            roles[self.bridge_dest[b]].append((b, Topology.DEST))
+            roles[self.bridge_dep0[b]].append((b, Topology.CARRIER))
+            roles[self.bridge_dep1[b]].append((b, Topology.CARRIER))
+        self.affected_start = array('i', [0])
+        self.affected = array('i')
+        self.affected_role = array('b')
+        for entries in roles:
+            for b, role in entries:
+                self.affected.append(b)
+                self.affected_role.append(role)
+            self.affected_start.append(len(self.affected))
+
+    @staticmethod
+    def get(size: int) -> object:
+        """ Get the shared Topology for a board size, building it on first use
+
+        Parameters:
+            size: (int) size of the game board
+
+        Returns: (Topology)
+            the cached topology for this size
+        """
+        if size not in Topology.__cache:
+            Topology.__cache[size] = Topology(size)
+        return Topology.__cache[size]
+
+    @staticmethod
+    def __build_cells(size: int) -> dict:
+        """ Creates a template Cell object for every coord on the board, edges included
+
+        Not to be used anywhere except during initialization
+
+        Parameters:
+            size: (int) size of the game board
+
+        Returns: (dict[Coord, Cell])
+            every cell, the standard cells first and the edge cells last
+        """
+        cells = dict()
+        # create all the standard cells
+        for i in range(1, size+1):
+            for j in range(1, size+1):
+                coord = Coord(i, j)
+                cell = Cell(coord, Color.EMPTY, size)
+                cells[coord] = cell
+
+        # create the edge cells
+        top = Cell(Edges.TOP, Color.WHITE, size)
+        for x in range(1, size+1):
+            top.neighbours.add(Coord(x, size))
+        for x in range(2, size+1):
+            dest = Coord(x, size-1)
+            top.white_twobridges[dest] = TwoBridge(
+                Edges.TOP,
+                dest,
+                (Coord(x-1, size), Coord(x, size)),
+                Color.WHITE,
+                Status.TO_BE
+            )
+            top.black_twobridges[dest] = TwoBridge(
+                Edges.TOP,
+                dest,
+                (Coord(x-1, size), Coord(x, size)),
+                Color.BLACK,
+                Status.FAIL
+            )
+        bottom = Cell(Edges.BOTTOM, Color.WHITE, size)
+        for x in range (1, size+1):
+            bottom.neighbours.add(Coord(x, 1))
+        for x in range (1, size):
+            dest = Coord(x, 2)
+            bottom.white_twobridges[dest] = TwoBridge(
+                Edges.BOTTOM,
+                dest,
+                (Coord(x, 1), Coord(x+1, 1)),
+                Color.WHITE,
+                Status.TO_BE
+            )
+            bottom.black_twobridges[dest] = TwoBridge(
+                Edges.BOTTOM,
+                dest,
+                (Coord(x, 1), Coord(x+1, 1)),
+                Color.BLACK,
+                Status.FAIL
+            )
+        left = Cell(Edges.LEFT, Color.BLACK, size)
+        for y in range(1, size+1):
+            left.neighbours.add(Coord(1, y))
+        for y in range(1, size):
+            dest = Coord(2, y)
+            left.white_twobridges[dest] = TwoBridge(
+                Edges.LEFT,
+                dest,
+                (Coord(1, y), Coord(1, y+1)),
+                Color.WHITE,
+                Status.FAIL
+            )
+            left.black_twobridges[dest] = TwoBridge(
+                Edges.LEFT,
+                dest,
+                (Coord(1, y), Coord(1, y+1)),
+                Color.BLACK,
+                Status.TO_BE
+            )
+        right = Cell(Edges.RIGHT, Color.BLACK, size)
+        for y in range (1, size+1):
+            right.neighbours.add(Coord(size, y))
+        for y in range (2, size+1):
+            dest = Coord(size-1, y)
+            right.white_twobridges[dest] = TwoBridge(
+                Edges.RIGHT,
+                dest,
+                (Coord(size, y-1), Coord(size, y)),
+                Color.WHITE,
+                Status.FAIL
+            )
+            right.black_twobridges[dest] = TwoBridge(
+                Edges.RIGHT,
+                dest,
+                (Coord(size, y-1), Coord(size, y)),
+                Color.BLACK,
+                Status.TO_BE
+            )
+
+        cells[Edges.TOP] = top
+        cells[Edges.BOTTOM] = bottom
+        cells[Edges.LEFT] = left
+        cells[Edges.RIGHT] = right
+        return cells
+
+    def cell_count(self) -> int:
+        return len(self.coords)
+
+    def bridge_count(self) -> int:
+        return len(self.bridge_dest)
+
+    def bridges_of(self, i: int, role: int = None) -> list:
+        """ Get the bridges a cell takes part in
+
+        Parameters:
+            i: (int) id of the cell
+            role: (int) only bridges where the cell has this role (Topology.ORIGIN,
+                DEST or CARRIER); every role if None
+
+        Returns: (list[int])
+            bridge ids
+        """
+        start, end = self.affected_start[i], self.affected_start[i+1]
+        if role is None:
+            return list(self.affected[start:end])
+        return [self.affected[k] for k in range(start, end) if self.affected_role[k] == role]
+
+    def neighbours(self, i: int) -> array:
+        """ Get the ids of the direct neighbours of a cell
+
+        Parameters:
+            i: (int) id of the cell
+
+        Returns: (array[int])
+            ids of every neighbouring cell
+        """
+        return self.nbrs[self.nbr_start[i]:self.nbr_start[i+1]]
@@ -0,0 +1,78 @@
+# transposition.py
+
+
+class TranspositionTable:
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        """ Create a TranspositionTable object
+
+        A fixed-size table of two-entry buckets. A new entry goes into a free
+        slot of its bucket, otherwise it evicts the entry with the lower depth
+        (the older one on ties), so deep, expensive results survive longest.
+
+        Parameters:
+            capacity: (int) maximum number of entries held (rounded up to an even number)
+        """
+        self.__buckets = max(1, (capacity + 1) // 2)
+        # each slot is [key, depth, age, value], or None when free
+        self.__slots = [None] * (self.__buckets * 2)
+        self.__age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return sum(1 for slot in self.__slots if slot is not None)
+
+    def capacity(self) -> int:
+        return len(self.__slots)
+
+    def get(self, key: int) -> object:
+        """ Look up a position
+
+        Parameters:
+            key: (int) position key, eg. Board.key()
+
+        Returns: (object)
+            the stored value, or None if the position is not in the table
+        """
+        first = (key % self.__buckets) * 2
+        for slot in (self.__slots[first], self.__slots[first+1]):
+            if slot is not None and slot[0] == key:
+                self.hits += 1
+                return slot[3]
+        self.misses += 1
+        return None
+
+    def put(self, key: int, value: object, depth: int = 0) -> None:
+        """ Store a position, replacing an existing entry for the same key
+
+        Parameters:
+            key: (int) position key, eg. Board.key()
+            value: (object) anything worth remembering about the position
+            depth: (int) how much work the value cost; shallower entries are evicted first
+        """
+        self.__age += 1
+        self.stores += 1
+        first = (key % self.__buckets) * 2
+        slots = self.__slots
+        for i in (first, first+1):
+            if slots[i] is None or slots[i][0] == key:
+                slots[i] = [key, depth, self.__age, value]
+                return
+
+        # bucket is full: evict the shallower entry, or the older one on equal depth
+        a, b = slots[first], slots[first+1]
+        victim = first if (a[1], a[2]) <= (b[1], b[2]) else first+1
+        slots[victim] = [key, depth, self.__age, value]
+        self.evictions += 1
+
+    def clear(self) -> None:
+        """ Remove every entry and reset the counters
+        """
+        self.__slots = [None] * len(self.__slots)
+        self.__age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
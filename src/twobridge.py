@@ -1,7 +1,7 @@
 # twobridge.py
 
 from coord import Coord
-from constants import Color, Status
+from constants import Color, Status, COLOR_CODES
 
 
 class TwoBridge:
@@ -11,7 +11,8 @@ class TwoBridge:
             dest: Coord,
             depends: tuple,
             color: Color,
-            status: Status
+            status: Status,
+            ids: tuple = None
             ) -> None:
         """ Create a TwoBridge object
 
@@ -21,52 +22,92 @@ class TwoBridge:
             depends: (tuple[Coord, Coord]) coordinates of dependency cells
             color: (Color) which player this 2bridge is relevant for
             status: (Status) status of this cell's two-bridgedness
+            ids: (tuple[int, int, int, int]) cell ids of origin, both depends and dest,
+                looked up on first use if not given
         """
         self.origin = origin
         self.dest = dest
         self.depends = depends
         self.color = color
         self.status = status
+        self.ids = ids
 
     def update_status(self, board: object) -> Status:
         """ Update the status of this two-bridge based on the board state
 
+        The status is a pure function of the four cells' colours, so it is
+        read from STATUS_TABLES instead of being worked out each time
+
         Parameters:
             board: (Board) the board in current gamestate
 
         Returns: (Status)
             new status, after updating internally
         """
-        EMPTY = Color.EMPTY
-        FRIENDLY = self.color
-        HOSTILE = Color.BLACK if FRIENDLY == Color.WHITE else Color.WHITE
+        colors = board.colors
+        if self.ids is None:
+            index = board.topology.index
+            self.ids = (index[self.origin], index[self.depends[0]], index[self.depends[1]], index[self.dest])
+        origin, dep0, dep1, dest = self.ids
+        self.status = STATUS_TABLES[self.color][colors[origin]*27 + colors[dep0]*9 + colors[dep1]*3 + colors[dest]]
+        return self.status
 
-        ORIG_COLOR = board.cells[self.origin].color
-        DEP_COLORS = [board.cells[self.depends[i]].color for i in range(2)]
-        DEST_COLOR = board.cells[self.dest].color
 
-        if DEST_COLOR == HOSTILE or ORIG_COLOR == HOSTILE or \
-                all([DEP_COLORS[i] == HOSTILE for i in range(2)]) or \
-                ((ORIG_COLOR == EMPTY or DEST_COLOR == EMPTY) and \
-                    any([DEP_COLORS[i] == HOSTILE for i in range(2)])):
-            self.status = Status.FAIL
+def classify(orig: int, dep0: int, dep1: int, dest: int) -> Status:
+    """ Work out a two-bridge status from the relative colours of its cells
 
-        elif any([DEP_COLORS[i] == FRIENDLY for i in range(2)]):
-            self.status = Status.HALFWAY
+    Only used to build STATUS_TABLES
 
-        elif ORIG_COLOR == EMPTY and DEST_COLOR == EMPTY and \
-                all([DEP_COLORS[i] == EMPTY for i in range(2)]):
-            self.status = Status.READY
+    Parameters:
+        orig: (int) origin cell, one of EMPTY, FRIENDLY or HOSTILE below
+        dep0: (int) first dependency cell
+        dep1: (int) second dependency cell
+        dest: (int) destination cell
 
-        elif (ORIG_COLOR == EMPTY or DEST_COLOR == EMPTY) and all([DEP_COLORS[i] == EMPTY for i in range(2)]):
-            self.status = Status.TO_BE
+    Returns: (Status)
+        status of the two-bridge
+    """
+    EMPTY, FRIENDLY, HOSTILE = 0, 1, 2
+    DEP_COLORS = (dep0, dep1)
 
-        elif ORIG_COLOR == FRIENDLY and DEST_COLOR == FRIENDLY and \
-                all([DEP_COLORS[i] == EMPTY for i in range(2)]):
-            self.status = Status.SUCCESS
+    if dest == HOSTILE or orig == HOSTILE or \
+            all([DEP_COLORS[i] == HOSTILE for i in range(2)]) or \
+            ((orig == EMPTY or dest == EMPTY) and \
+                any([DEP_COLORS[i] == HOSTILE for i in range(2)])):
+        return Status.FAIL
 
-        elif ORIG_COLOR == FRIENDLY and DEST_COLOR == FRIENDLY and \
-                any([DEP_COLORS[i] == HOSTILE for i in range(2)]):
-            self.status = Status.JEOPARDY
+    elif any([DEP_COLORS[i] == FRIENDLY for i in range(2)]):
+        return Status.HALFWAY
 
-        return self.status
+    elif orig == EMPTY and dest == EMPTY:
+        return Status.READY
+
+    elif orig == EMPTY or dest == EMPTY:
+        return Status.TO_BE
+
+    elif all([DEP_COLORS[i] == EMPTY for i in range(2)]):
+        return Status.SUCCESS
+
+    return Status.JEOPARDY
+
+
+def _build_table(color: Color) -> tuple:
+    """ Tabulate the status of every colouring of a bridge's four cells
+
+    Parameters:
+        color: (Color) which player the table is for
+
+    Returns: (tuple[Status])
+        81 statuses, indexed by orig*27 + dep0*9 + dep1*3 + dest using COLOR_CODES
+    """
+    # map absolute colour codes to EMPTY/FRIENDLY/HOSTILE for this player
+    relative = [0] * 3
+    relative[COLOR_CODES[color]] = 1
+    relative[COLOR_CODES[Color.BLACK if color == Color.WHITE else Color.WHITE]] = 2
+    return tuple(
+        classify(relative[orig], relative[dep0], relative[dep1], relative[dest])
+        for orig in range(3) for dep0 in range(3) for dep1 in range(3) for dest in range(3)
+    )
+
+
+STATUS_TABLES = {Color.WHITE: _build_table(Color.WHITE), Color.BLACK: _build_table(Color.BLACK)}
@@ -0,0 +1,84 @@
+# unionfind.py
+
+
+class DisjointSet:
+    def __init__(self, size: int) -> None:
+        """ Create a DisjointSet object
+
+        Uses union by size without path compression, so every union can be
+        undone exactly with rollback()
+
+        Parameters:
+            size: (int) number of members, labelled 0 to size-1
+        """
+        self.__parent = list(range(size))
+        self.__size = [1] * size
+        self.__history = []
+
+    def find(self, x: int) -> int:
+        """ Find the representative of the set containing x
+
+        Parameters:
+            x: (int) member to look up
+
+        Returns: (int)
+            label of the root member of x's set
+        """
+        parent = self.__parent
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    def connected(self, a: int, b: int) -> bool:
+        """ Check whether two members are in the same set
+
+        Parameters:
+            a: (int) first member
+            b: (int) second member
+
+        Returns: (bool)
+            True if a and b share a set, False otherwise
+        """
+        return self.find(a) == self.find(b)
+
+    def union(self, a: int, b: int) -> bool:
+        """ Merge the sets containing a and b
+
+        Parameters:
+            a: (int) first member
+            b: (int) second member
+
+        Returns: (bool)
+            True if two sets were merged, False if they were already one
+        """
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+        # hang the smaller tree under the larger one to keep find() shallow
+        if self.__size[root_a] < self.__size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.__parent[root_b] = root_a
+        self.__size[root_a] += self.__size[root_b]
+        self.__history.append(root_b)
+        return True
+
+    def checkpoint(self) -> int:
+        """ Mark the current state so it can be returned to with rollback()
+
+        Returns: (int)
+            marker to pass to rollback()
+        """
+        return len(self.__history)
+
+    def rollback(self, checkpoint: int) -> None:
+        """ Undo every union made since checkpoint() returned 'checkpoint'
+
+        Parameters:
+            checkpoint: (int) marker previously returned by checkpoint()
+        """
+        while len(self.__history) > checkpoint:
+            child = self.__history.pop()
+            root = self.__parent[child]
+            self.__size[root] -= self.__size[child]
+            self.__parent[child] = child
@@ -0,0 +1,7 @@
+# conftest.py
+
+import os
+import sys
+
+# the engine's modules live flat in src/ and import one another by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
@@ -0,0 +1,65 @@
+# solver.py
+
+from constants import *
+from bitboard import BitBoard
+
+
+class Solver:
+    def __init__(self, size: int) -> None:
+        """ Create a Solver object: plays every small position out to the end
+
+        Parameters:
+            size: (int) size of the game board
+        """
+        self.layout = BitBoard(size).layout
+        self.__memo = dict()
+
+    def white_wins(self, whites: int, blacks: int, to_move: Color) -> bool:
+        """ Solve a position exactly
+
+        Parameters:
+            whites: (int) bit mask of white stones
+            blacks: (int) bit mask of black stones
+            to_move: (Color) player to move
+
+        Returns: (bool)
+            True if white wins with best play, False if black does
+        """
+        key = (whites, blacks, to_move)
+        if key in self.__memo:
+            return self.__memo[key]
+        layout = self.layout
+        if layout.flood(layout.top_row, whites) & layout.bottom_row:
+            result = True
+        elif layout.flood(layout.left_column, blacks) & layout.right_column:
+            result = False
+        else:
+            # the player to move loses unless one of their moves wins
+            result = to_move != Color.WHITE
+            moves = layout.board & ~(whites | blacks)
+            while moves:
+                move = moves & -moves
+                moves ^= move
+                if to_move == Color.WHITE:
+                    if self.white_wins(whites | move, blacks, Color.BLACK):
+                        result = True
+                        break
+                elif not self.white_wins(whites, blacks | move, Color.WHITE):
+                    result = False
+                    break
+        self.__memo[key] = result
+        return result
+
+    def wins(self, color: Color, whites: int, blacks: int, to_move: Color) -> bool:
+        """ Solve a position exactly for one player
+
+        Parameters:
+            color: (Color) player asked about
+            whites: (int) bit mask of white stones
+            blacks: (int) bit mask of black stones
+            to_move: (Color) player to move
+
+        Returns: (bool)
+            True if 'color' wins with best play
+        """
+        return self.white_wins(whites, blacks, to_move) == (color == Color.WHITE)
@@ -0,0 +1,39 @@
+# test_bitboard.py
+
+from random import Random
+from constants import *
+from coord import Coord
+from board import Board
+from bitboard import BitBoard
+
+
+def test_check_win_agrees_with_board():
+    rng = Random(3)
+    for size in (1, 2, 5, 8, 11):
+        for _ in range(10):
+            board, bits = Board(size), BitBoard(size)
+            cells = [Coord(x, y) for x in range(1, size+1) for y in range(1, size+1)]
+            rng.shuffle(cells)
+            color = Color.WHITE
+            for coord in cells:
+                board.set(coord, color)
+                bits.set(coord, color)
+                assert bits.check_win() == board.check_win(999)
+                assert bits.get(coord) == color
+                color = Color.BLACK if color == Color.WHITE else Color.WHITE
+            copy = BitBoard.from_board(board)
+            assert (copy.whites, copy.blacks) == (bits.whites, bits.blacks)
+            bits.unset(cells[0])
+            board.unset(cells[0])
+            assert bits.get(cells[0]) == Color.EMPTY
+            assert bits.check_win() == board.check_win(999)
+
+
+def test_neighbours_agree_with_topology():
+    size = 6
+    board, bits = Board(size), BitBoard(size)
+    for x in range(1, size+1):
+        for y in range(1, size+1):
+            coord = Coord(x, y)
+            on_board = [nb for nb in board.cells[coord].neighbours if 1 <= nb.getx() <= size and 1 <= nb.gety() <= size]
+            assert bits.neighbours(coord) == sum(bits.layout.bit(nb) for nb in on_board)
@@ -0,0 +1,81 @@
+# test_board.py
+
+from random import Random
+from constants import *
+from coord import Coord
+from board import Board
+
+
+def other(color: Color) -> Color:
+    return Color.BLACK if color == Color.WHITE else Color.WHITE
+
+
+def test_win_needs_a_connected_chain():
+    board = Board(3)
+    for y in (1, 2):
+        board.set(Coord(1, y), Color.WHITE)
+    assert board.check_win(999) == Color.EMPTY
+    board.set(Coord(1, 3), Color.WHITE)
+    assert board.check_win(999) == Color.WHITE
+    board.unset(Coord(1, 2))
+    assert board.check_win(999) == Color.EMPTY
+    for x in (1, 2, 3):
+        board.set(Coord(x, 2), Color.BLACK)
+    assert board.check_win(999) == Color.BLACK
+    assert board.connected(Edges.LEFT, Edges.RIGHT)
+    assert not board.connected(Edges.TOP, Edges.BOTTOM)
+
+
+def snapshot(board: Board) -> tuple:
+    """ Everything play() may change, in a comparable form
+    """
+    return (
+        bytes(board.colors), board.key(), board.key(True),
+        tuple(bridge.status for color in board.bridges for bridge in board.bridges[color]),
+        {color: {key: (bridge.origin, bridge.dest) for key, bridge in board.jeopardy[color].items()}
+         for color in board.jeopardy},
+        set(board.empties), set(board.whites), set(board.blacks), board.check_win(999),
+        board.connected(Edges.LEFT, Edges.RIGHT), board.connected(Edges.TOP, Edges.BOTTOM),
+    )
+
+
+def bridge_state(board: Board) -> tuple:
+    return (tuple(bridge.status for color in board.bridges for bridge in board.bridges[color]),
+            {color: set(board.jeopardy[color]) for color in board.jeopardy})
+
+
+def test_incremental_bridges_match_a_recompute():
+    for size in (5, 8):
+        for seed in range(5):
+            rng = Random(seed)
+            board = Board(size)
+            color = Color.WHITE
+            while board.empties and board.check_win(999) == Color.EMPTY:
+                board.play(rng.choice(sorted(board.empties, key=str)), color)
+                color = other(color)
+                incremental = bridge_state(board)
+                board.recompute_bridges()
+                assert bridge_state(board) == incremental
+
+
+def test_undo_restores_the_exact_state():
+    for size in (5, 8):
+        for seed in range(5):
+            rng = Random(seed)
+            board = Board(size)
+            saved = []
+            color = Color.WHITE
+            for _ in range(200):
+                if saved and rng.random() < 0.4:
+                    expected = saved.pop()
+                    board.undo()
+                    assert snapshot(board) == expected
+                elif board.empties:
+                    saved.append(snapshot(board))
+                    assert board.play(rng.choice(sorted(board.empties, key=str)), color)
+                    color = other(color)
+            while saved:
+                expected = saved.pop()
+                board.undo()
+                assert snapshot(board) == expected
+            assert board.undo() is None
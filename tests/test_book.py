@@ -0,0 +1,58 @@
+# test_book.py
+
+from constants import *
+from coord import Coord
+from board import Board
+from book import OpeningBook, SWAP, book_path
+from build_book import build, legacy_move
+
+
+def test_write_and_read_back(tmp_path):
+    board = Board(5)
+    board.set(Coord(2, 2), Color.BLACK)
+    key = board.key(canonical=True)
+    rotated = key != board.key()
+    reply = board.topology.index[Coord(2, 3)]
+    empty = Board(5)
+    path = str(tmp_path / "hex5.book")
+    OpeningBook.write(path, 5, {key: board.topology.rotation[reply] if rotated else reply,
+                                empty.key(canonical=True): SWAP})
+
+    book = OpeningBook(5, path)
+    assert len(book) == 2
+    assert book.lookup(board, Color.WHITE) == "b3"
+    assert book.lookup(board, Color.BLACK) is None  # the side to move is part of the key
+    assert book.lookup(empty, Color.WHITE) == "swap"
+
+    # the 180 degree rotation finds the same entry, with the reply rotated too
+    turned = Board(5)
+    turned.set(Coord(4, 4), Color.BLACK)
+    assert turned.key(canonical=True) == key
+    assert book.lookup(turned, Color.WHITE) == "d3"
+
+    # a reply that has since been taken is not offered
+    board.set(Coord(2, 3), Color.WHITE)
+    assert book.lookup(board, Color.WHITE) is None
+
+
+def test_unusable_files_give_an_empty_book(tmp_path):
+    assert len(OpeningBook(5, str(tmp_path / "missing.book"))) == 0
+    path = tmp_path / "hex5.book"
+    OpeningBook.write(str(path), 6, {1: 2})
+    assert len(OpeningBook(5, str(path))) == 0  # written for another size
+
+
+def test_shipped_book_is_what_the_builder_writes(tmp_path):
+    moves, _ = build(10)
+    path = tmp_path / "hex10.book"
+    OpeningBook.write(str(path), 10, moves)
+    with open(book_path(10), "rb") as shipped:
+        assert path.read_bytes() == shipped.read()
+    assert OpeningBook(10, str(path)).lookup(Board(10), Color.WHITE) == "b2"
+
+
+def test_the_rules_answer_none_where_they_have_nothing_to_say():
+    assert legacy_move(Board(10), Color.WHITE, 0, False) == "b2"
+    # a second move with no first stone on the board
+    assert legacy_move(Board(10), Color.WHITE, 1, False) is None
+    assert legacy_move(Board(10), Color.BLACK, 1, False) is None
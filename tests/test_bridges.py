@@ -0,0 +1,49 @@
+# test_bridges.py
+
+from random import Random
+from constants import *
+from bot import HexBot
+
+
+def scan(board: object) -> dict:
+    """ Jeopardized bridges found the slow way, by looking at every one
+    """
+    found = dict()
+    for color, bridges in board.bridges.items():
+        found[color] = {frozenset((bridge.origin, bridge.dest)) for bridge in bridges
+                        if bridge.status == Status.JEOPARDY}
+    return found
+
+
+def random_game(seed: int, size: int) -> object:
+    """ Play a bot's board full at random, taking a stone back now and then,
+    and yield after every change
+    """
+    rng = Random(seed)
+    bot = HexBot(Color.WHITE, size)
+    color = Color.WHITE
+    played = []
+    while bot.board.empties:
+        if played and rng.random() < 0.2:
+            bot.unset(str(played.pop(rng.randrange(len(played)))))
+        else:
+            coord = rng.choice(sorted(bot.board.empties, key=str))
+            bot.set_piece(coord, color)
+            played.append(coord)
+            color = Color.BLACK if color == Color.WHITE else Color.WHITE
+        yield bot
+
+
+def test_jeopardy_index_matches_a_scan():
+    for seed in range(4):
+        for bot in random_game(seed, 6):
+            assert {color: set(index) for color, index in bot.board.jeopardy.items()} == scan(bot.board)
+
+
+def test_incremental_statuses_match_a_recompute():
+    for seed in range(4):
+        for bot in random_game(seed, 6):
+            board = bot.board
+            statuses = [bridge.status for color in board.bridges for bridge in board.bridges[color]]
+            board.recompute_bridges()
+            assert [bridge.status for color in board.bridges for bridge in board.bridges[color]] == statuses
@@ -0,0 +1,40 @@
+# test_coord.py
+
+import pickle
+from coord import Coord
+from board import Board
+
+
+def test_coords_are_interned():
+    assert Coord(3, 4) is Coord(3, 4)
+    assert Coord(3, 4) == Coord(3, 4) and Coord(3, 4) != Coord(4, 3)
+    assert pickle.loads(pickle.dumps(Coord(3, 4))) is Coord(3, 4)
+
+
+def test_names_round_trip():
+    for x in range(1, 27):
+        for y in (1, 10, 26):
+            name = Coord.cart2str(x, y)
+            assert Coord.str2cart(name) == (x, y)
+    assert str(Coord(1, 1)) == "a1"
+    assert str(Coord(26, 12)) == "z12"
+
+
+def test_parse_uses_the_board_table():
+    board = Board(11)
+    for coord in board.topology.coords[:11*11]:
+        assert board.parse(str(coord)) is coord
+    assert board.parse("b2") is Coord(2, 2)
+
+
+def test_names_past_z_round_trip():
+    for x in (27, 52, 53, 99, 702, 703):
+        name = Coord.cart2str(x, 7)
+        assert Coord.str2cart(name) == (x, 7)
+    assert str(Coord(27, 3)) == "aa3"
+    assert str(Coord(53, 1)) == "ba1"
+
+
+def test_hashes_are_distinct():
+    coords = [Coord(x, y) for x in range(-2, 60) for y in range(-2, 60)]
+    assert len({hash(coord) for coord in coords}) == len(coords)
@@ -0,0 +1,65 @@
+# test_daemon.py
+
+import os
+import socket
+import stat
+import threading
+import pytest
+from daemon import EngineDaemon, claim_socket
+from protocol import read_framed
+
+
+def test_a_game_over_the_socket(tmp_path):
+    path = str(tmp_path / "engine.sock")
+    daemon = EngineDaemon(path, {"move_time": 0.1}, sizes=(4,))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path)
+        stream = connection.makefile("rwb")
+        for line, answer in (("white", ""), ("init_board 4", ""), ("seto a1", ""), ("check_win", "0"),
+                             ("fly", "error unknown command: fly")):
+            stream.write((line + "\n").encode())
+            stream.flush()
+            assert read_framed(stream) == answer
+        stream.write(b"make_move\n")
+        stream.flush()
+        assert len(read_framed(stream)) >= 2
+        stream.write(b"quit\n")
+        stream.flush()
+        assert read_framed(stream) is None
+        connection.close()
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+
+
+def test_a_stale_socket_is_replaced(tmp_path):
+    path = str(tmp_path / "engine.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()  # the file stays behind with nobody listening
+    claim_socket(path)
+    assert not os.path.exists(path)
+    claim_socket(path)  # nothing there is fine too
+
+
+def test_a_live_socket_or_another_file_is_left_alone(tmp_path):
+    path = str(tmp_path / "engine.sock")
+    live = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    live.bind(path)
+    live.listen(1)
+    try:
+        with pytest.raises(FileExistsError):
+            claim_socket(path)
+        assert os.path.exists(path)
+    finally:
+        live.close()
+
+    other = tmp_path / "notes.txt"
+    other.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        claim_socket(str(other))
+    assert other.read_text() == "keep me"
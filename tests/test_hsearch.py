@@ -0,0 +1,89 @@
+# test_hsearch.py
+
+from random import Random
+from time import perf_counter
+from constants import *
+from coord import Coord
+from board import Board
+from bitboard import BitBoard
+from hsearch import HSearch, carrier_limit
+from solver import Solver
+
+
+def other(color: Color) -> Color:
+    return Color.BLACK if color == Color.WHITE else Color.WHITE
+
+
+def test_connections_are_sound():
+    """ A virtual connection between the edges must be a win even with the
+    opponent to move, a semi-connection a win with its owner to move
+    """
+    rng = Random(5)
+    claims = 0
+    for size in (3, 4):
+        solver = Solver(size)
+        for _ in range(30):
+            board = Board(size)
+            searches = {color: HSearch(board, color) for color in (Color.WHITE, Color.BLACK)}
+            cells = [Coord(x, y) for x in range(1, size+1) for y in range(1, size+1)]
+            rng.shuffle(cells)
+            color = rng.choice((Color.WHITE, Color.BLACK))
+            for stones, coord in enumerate(cells[:rng.randrange(size*size - 2)], 1):
+                board.set(coord, color)
+                for search in searches.values():
+                    search.play(coord, color)
+                color = other(color)
+                if board.check_win(999) != Color.EMPTY:
+                    break
+                if stones < size + 2:
+                    continue  # keep the exhaustive solver to positions it finishes quickly
+                bits = BitBoard.from_board(board)
+                for player in (Color.WHITE, Color.BLACK):
+                    # the incrementally updated search and one built from scratch
+                    for search in (searches[player], HSearch(board, player)):
+                        vcs, scs = search.connections(*search.edges())
+                        if vcs:
+                            claims += 1
+                            assert solver.wins(player, bits.whites, bits.blacks, other(player))
+                        elif scs:
+                            assert solver.wins(player, bits.whites, bits.blacks, player)
+    assert claims > 0
+
+
+def test_queries_follow_queued_moves_and_honour_the_deadline():
+    board = Board(5)
+    search = HSearch(board, Color.WHITE)
+    for coord, color in ((Coord(3, 5), Color.WHITE), (Coord(3, 3), Color.WHITE),
+                         (Coord(3, 1), Color.WHITE), (Coord(2, 2), Color.BLACK)):
+        board.set(coord, color)
+        search.play(coord, color)
+    # a deadline already past gives up before following the moves
+    assert search.must_play(perf_counter() - 1) == 0
+    # c3 reaches the top through c4 or b4 and the bottom through c2 or d2:
+    # two pairs of disjoint routes, so a VC with nothing the opponent must answer
+    vcs, _ = search.connections(*search.edges())
+    assert vcs
+    assert search.must_play() == 0
+
+    # a stone taken back makes the next query start again from the board
+    board.unset(Coord(3, 3))
+    search.invalidate()
+    assert search.connections(*search.edges()) == HSearch(board, Color.WHITE).connections(*search.edges())
+
+
+def test_a_queued_move_taken_back_is_simply_dropped():
+    board = Board(5)
+    search = HSearch(board, Color.WHITE, max_carrier=carrier_limit(5))
+    before = search.connections(*search.edges())
+    board.set(Coord(3, 3), Color.BLACK)
+    search.play(Coord(3, 3), Color.BLACK)
+    board.unset(Coord(3, 3))
+    search.unplay(Coord(3, 3))
+    assert search.connections(*search.edges()) == before
+    # a followed move cannot be dropped; the search starts again from the board
+    board.set(Coord(3, 3), Color.BLACK)
+    search.play(Coord(3, 3), Color.BLACK)
+    search.connections(*search.edges())
+    board.unset(Coord(3, 3))
+    search.unplay(Coord(3, 3))
+    assert search.connections(*search.edges()) == before
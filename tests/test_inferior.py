@@ -0,0 +1,49 @@
+# test_inferior.py
+
+from random import Random
+from constants import *
+from coord import Coord
+from board import Board
+from bitboard import BitBoard
+from inferior import InferiorCells
+from solver import Solver
+
+
+def test_pruning_keeps_the_value_and_a_winning_move():
+    """ Filling dead and captured cells never changes who wins, and when the
+    player to move can win, a winning move survives the pruning
+    """
+    rng = Random(2)
+    pruned = 0
+    for size, games in ((3, 150), (4, 150), (5, 20)):
+        solver = Solver(size)
+        layout = solver.layout
+        cells = [Coord(x, y) for x in range(1, size+1) for y in range(1, size+1)]
+        for _ in range(games):
+            board = Board(size)
+            rng.shuffle(cells)
+            stones = rng.randrange(1, 8) if size == 3 else rng.randrange(size*size // 2, size*size - 1)
+            for coord in cells[:stones]:
+                board.set(coord, rng.choice((Color.WHITE, Color.BLACK)))
+            if board.check_win(999) != Color.EMPTY:
+                continue
+            inferior = InferiorCells(board.topology, board.colors)
+            bits = BitBoard.from_board(board)
+            filled = {code: sum(layout.bits[i] for i in range(size*size) if inferior.fill[i] == code)
+                      for code in (COLOR_CODES[Color.WHITE], COLOR_CODES[Color.BLACK])}
+            moves = [i for i in range(size*size) if board.colors[i] == COLOR_CODES[Color.EMPTY]]
+            for color in (Color.WHITE, Color.BLACK):
+                assert solver.white_wins(bits.whites, bits.blacks, color) == \
+                    solver.white_wins(filled[COLOR_CODES[Color.WHITE]], filled[COLOR_CODES[Color.BLACK]], color)
+                skip = inferior.pruned(color)
+                pruned += len(skip)
+                white = color == Color.WHITE
+                winning = [i for i in moves if solver.wins(
+                    color,
+                    bits.whites | (layout.bits[i] if white else 0),
+                    bits.blacks | (0 if white else layout.bits[i]),
+                    Color.BLACK if white else Color.WHITE)]
+                kept = [i for i in moves if i not in skip]
+                if winning and kept:
+                    assert any(i in winning for i in kept)
+    assert pruned > 0
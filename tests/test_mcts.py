@@ -0,0 +1,51 @@
+# test_mcts.py
+
+from constants import *
+from coord import Coord
+from board import Board
+from mcts import MCTS
+
+
+def winning_position() -> Board:
+    """ White to move on 3x3: a3 joins a1 and a2 to the top edge
+    """
+    board = Board(3)
+    board.set(Coord(1, 1), Color.WHITE)
+    board.set(Coord(1, 2), Color.WHITE)
+    board.set(Coord(3, 1), Color.BLACK)
+    return board
+
+
+def test_search_finds_the_winning_move():
+    board = winning_position()
+    engine = MCTS(board.topology, seed=1)
+    engine.set_position(board.colors, Color.WHITE)
+    move = engine.search(0.3)
+    assert board.topology.coords[move] == Coord(1, 3)
+    assert engine.playouts > 0
+    visits = engine.root_stats()
+    assert sum(count for count, _ in visits.values()) <= engine.playouts
+
+
+def test_advance_keeps_the_subtree():
+    board = winning_position()
+    engine = MCTS(board.topology, seed=2)
+    engine.set_position(board.colors, Color.WHITE)
+    engine.search(0.2)
+    move = engine.best_move()
+    child = [node for node in engine.root.children if node.move == move][0]
+    engine.advance(move)
+    assert engine.root is child
+    assert engine.root.parent is None
+    assert engine.colors[move] == COLOR_CODES[Color.WHITE]
+    assert engine.to_move == COLOR_CODES[Color.BLACK]
+
+
+def test_full_board_has_no_move():
+    board = Board(2)
+    for coord, color in ((Coord(1, 1), Color.WHITE), (Coord(1, 2), Color.BLACK),
+                         (Coord(2, 1), Color.BLACK), (Coord(2, 2), Color.WHITE)):
+        board.set(coord, color)
+    engine = MCTS(board.topology, seed=3)
+    engine.set_position(board.colors, Color.WHITE)
+    assert engine.search(0.05) == -1
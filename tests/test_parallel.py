@@ -0,0 +1,34 @@
+# test_parallel.py
+
+import pytest
+from constants import *
+from coord import Coord
+from parallel import RootParallelSearch
+from board import Board
+
+
+def test_unknown_merge_is_refused():
+    with pytest.raises(ValueError):
+        RootParallelSearch(2, merge="average")
+
+
+def winning_position() -> Board:
+    """ White to move on 3x3: a3 joins a1 and a2 to the top edge
+    """
+    board = Board(3)
+    board.set(Coord(1, 1), Color.WHITE)
+    board.set(Coord(1, 2), Color.WHITE)
+    board.set(Coord(3, 1), Color.BLACK)
+    return board
+
+
+@pytest.mark.parametrize("merge", RootParallelSearch.MERGES)
+def test_workers_agree_on_the_winning_move(merge):
+    board = winning_position()
+    search = RootParallelSearch(2, merge=merge, seed=1)
+    try:
+        move = search.search(board, Color.WHITE, 0.3)
+        assert board.topology.coords[move] == Coord(1, 3)
+        assert search.playouts > 0
+    finally:
+        search.close()
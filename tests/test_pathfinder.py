@@ -0,0 +1,92 @@
+# test_pathfinder.py
+
+import heapq
+from random import Random
+from constants import *
+from coord import Coord
+from board import Board
+from bot import HexBot
+from pathfinder import shortest_path
+
+
+def step_cost(board: Board, node: int, child: int, bridge: object, player: Color) -> int:
+    """ Cost of one step under shortest_path's rules, None if the step is not allowed
+    """
+    friendly = COLOR_CODES[player]
+    if bridge is None:
+        color = board.colors[child]
+        if color == COLOR_CODES[Color.EMPTY]:
+            return 1
+        return 0 if color == friendly else None
+    if bridge.status == Status.SUCCESS:
+        return 0
+    if bridge.status == Status.READY:
+        return 1
+    if bridge.status == Status.TO_BE:
+        return 1 if board.colors[node] == friendly else 0
+    return None
+
+
+def steps(board: Board, node: int, player: Color) -> list:
+    topology = board.topology
+    found = [(child, None) for child in topology.neighbours(node)]
+    for b in range(topology.bridge_start[node], topology.bridge_start[node+1]):
+        found.append((topology.bridge_dest[b], board.bridges[player][b]))
+    return found
+
+
+def reference_cost(board: Board, start: int, goal: int, player: Color) -> int:
+    """ The same search done with a plain dijkstra
+    """
+    dist = {start: 0}
+    heap = [(0, start)]
+    while heap:
+        g, node = heapq.heappop(heap)
+        if node == goal:
+            return g
+        if g > dist[node]:
+            continue
+        for child, bridge in steps(board, node, player):
+            cost = step_cost(board, node, child, bridge, player)
+            if cost is not None and g + cost < dist.get(child, g + cost + 1):
+                dist[child] = g + cost
+                heapq.heappush(heap, (g + cost, child))
+    return -1
+
+
+def test_costs_match_dijkstra_and_paths_add_up():
+    rng = Random(4)
+    for size in (3, 6, 9):
+        for _ in range(20):
+            # the bot keeps the bridge statuses the search reads up to date
+            bot = HexBot(Color.WHITE, size)
+            board = bot.board
+            for coord in rng.sample(sorted(board.empties, key=str), rng.randrange(size * size // 2)):
+                bot.set_piece(coord, rng.choice((Color.WHITE, Color.BLACK)))
+            index = board.topology.index
+            for player, (start, goal) in ((Color.WHITE, (Edges.TOP, Edges.BOTTOM)),
+                                          (Color.BLACK, (Edges.LEFT, Edges.RIGHT))):
+                colors = bytes(board.colors)
+                path, cost = shortest_path(board, start, goal, player)
+                assert bytes(board.colors) == colors
+                assert cost == reference_cost(board, index[start], index[goal], player)
+                if cost < 0:
+                    assert path == []
+                    continue
+                assert path[0] == start and path[-1] == goal
+                total = 0
+                for a, b in zip(path, path[1:]):
+                    costs = [step_cost(board, index[a], child, bridge, player)
+                             for child, bridge in steps(board, index[a], player) if child == index[b]]
+                    costs = [c for c in costs if c is not None]
+                    assert costs
+                    total += min(costs)
+                assert total == cost
+
+
+def test_a_wall_blocks_the_path():
+    bot = HexBot(Color.WHITE, 4)
+    for x in range(1, 5):
+        bot.set_piece(Coord(x, 2), Color.BLACK)
+    assert shortest_path(bot.board, Edges.TOP, Edges.BOTTOM, Color.WHITE) == ([], -1)
+    assert shortest_path(bot.board, Edges.LEFT, Edges.RIGHT, Color.BLACK)[1] == 0
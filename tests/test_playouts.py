@@ -0,0 +1,61 @@
+# test_playouts.py
+
+from random import Random
+from constants import *
+from coord import Coord
+from board import Board
+from playouts import _biased_bits, batch_playouts
+
+
+def test_biased_bits_follow_the_probability():
+    count = 1 << 14
+    assert _biased_bits(Random(1), count, 0.0) == 0
+    for probability in (0.25, 0.5, 0.75):
+        ones = _biased_bits(Random(2), count, probability).bit_count()
+        assert abs(ones / count - probability) < 0.02
+    assert _biased_bits(Random(3), count, 0.5) < 1 << count
+
+
+def test_a_won_position_is_always_won():
+    board = Board(3)
+    for y in range(1, 4):
+        board.set(Coord(2, y), Color.WHITE)
+    stats = batch_playouts(board, Color.BLACK, count=256, seed=1)
+    assert stats.win_rate(Color.WHITE) == 1.0
+    assert stats.win_rate(Color.BLACK) == 0.0
+    white = board.topology.index[Coord(2, 2)]
+    assert stats.white_owned[white] == stats.winner_owned[white] == 256
+
+
+def test_counts_are_consistent():
+    board = Board(5)
+    stats = batch_playouts(board, Color.BLACK, count=2048, seed=4)
+    assert 0 < stats.white_wins < stats.count
+    cells = board.topology.size ** 2
+    for i in range(cells):
+        assert 0 <= stats.white_owned[i] <= stats.count
+        assert 0 <= stats.winner_owned[i] <= stats.count
+    # black moves first, so white gets 12 of the 25 cells of an alternating fill
+    share = sum(stats.white_owned[:cells]) / (cells * stats.count)
+    assert abs(share - 12 / 25) < 0.01
+
+
+def test_certain_and_impossible_draws():
+    count = 1 << 10
+    for seed in range(5):
+        assert _biased_bits(Random(seed), count, 0.0) == 0
+        assert _biased_bits(Random(seed), count, 1.0) == (1 << count) - 1
+        # close enough to 1 to round up to every digit
+        assert _biased_bits(Random(seed), count, 0.999).bit_count() > count * 0.98
+        ones = _biased_bits(Random(seed), count, 0.3).bit_count()
+        assert 0 < ones < count
+
+
+def test_the_last_cell_goes_to_the_player_to_move():
+    # 2x2, white to move into the only empty cell, which wins for whoever takes it
+    board = Board(2)
+    board.set(Coord(1, 1), Color.WHITE)
+    board.set(Coord(2, 1), Color.BLACK)
+    board.set(Coord(2, 2), Color.BLACK)
+    assert batch_playouts(board, Color.WHITE, count=64, seed=1).win_rate(Color.WHITE) == 1.0
+    assert batch_playouts(board, Color.BLACK, count=64, seed=1).win_rate(Color.WHITE) == 0.0
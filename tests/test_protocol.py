@@ -0,0 +1,44 @@
+# test_protocol.py
+
+import io
+import os
+import stat
+import pytest
+import protocol
+from constants import *
+from bot import HexBot
+from protocol import SOCKET_NAME, default_socket, read_framed, run_captured, write_framed
+
+
+def test_framing_round_trip():
+    stream = io.BytesIO()
+    for answer in ("", "a1", "line one\nline two"):
+        write_framed(stream, answer)
+    stream.seek(0)
+    assert read_framed(stream) == ""
+    assert read_framed(stream) == "a1"
+    assert read_framed(stream) == "line one\nline two"
+    assert read_framed(stream) is None
+
+
+def test_run_captured_returns_the_printed_answer():
+    bot = HexBot(Color.WHITE, 4)
+    assert run_captured(bot, ["seto", "a1"]) == ""
+    assert run_captured(bot, ["check_win"]) == "0"
+
+
+def test_the_default_socket_is_private(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert default_socket() == str(tmp_path / SOCKET_NAME)
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setattr(protocol.tempfile, "gettempdir", lambda: str(tmp_path))
+    path = default_socket()
+    directory = os.path.dirname(path)
+    assert os.path.dirname(directory) == str(tmp_path)
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    assert default_socket() == path  # the directory is reused
+
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        default_socket()
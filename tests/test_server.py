@@ -0,0 +1,57 @@
+# test_server.py
+
+import io
+from server import GAME_TT_SIZE, GameServer
+
+
+def test_games_are_kept_apart():
+    server = GameServer({"move_time": 0.1})
+    assert server.handle("g1 new white 5") == ""
+    assert server.handle("g2 new black 7") == ""
+    assert server.handle("g1 seto c3") == ""
+    assert server.handle("g1 check_win") == "g1 0"
+    answer = server.handle("g2 make_move")
+    assert answer.startswith("g2 ") and len(answer.split()) == 2
+    assert server.games["g1"].board.getsize() == 5
+    assert server.games["g2"].board.getsize() == 7
+    assert server.handle("g1 end") == ""
+    assert server.handle("g1 check_win") == "g1 error unknown game"
+    assert server.handle("g2 fly") == "g2 error unknown command: fly"
+    assert server.handle("g2").startswith("error")
+    assert server.handle("") == ""
+
+
+def test_serve_answers_line_by_line():
+    server = GameServer({"move_time": 0.1})
+    reader = io.StringIO("a new white 4\nb new black 4\na check_win\nb seto a1\nquit\na check_win\n")
+    writer = io.StringIO()
+    server.serve(reader, writer)
+    assert writer.getvalue() == "a 0\n"
+    assert server.games == dict()
+
+
+def test_a_bad_request_only_fails_its_own_game():
+    server = GameServer({"move_time": 0.1, "ponder": True})
+    assert server.handle("g1 new white x").startswith("g1 error board size")
+    assert server.handle("g1 new white 1000").startswith("g1 error board size")
+    assert "g1" not in server.games
+    assert server.handle("g2 new black 5") == ""
+    assert server.handle("g2 seto z99").startswith("g2 error")
+    assert server.handle("g2 seto c3") == ""
+    assert server.handle("g2 check_win") == "g2 0"
+    assert not server.games["g2"].pondering
+
+
+def test_every_size_is_checked_and_tables_stay_small():
+    server = GameServer({"move_time": 0.1})
+    assert server.handle("g1 new white 5") == ""
+    assert server.handle("g1 init_board 1000").startswith("g1 error board size")
+    assert server.handle("g1 init_board x").startswith("g1 error board size")
+    assert server.games["g1"].board.getsize() == 5
+    assert server.handle("g1 init_board 7") == ""
+    assert server.games["g1"].board.getsize() == 7
+    assert server.games["g1"].tt.capacity() == GAME_TT_SIZE
+
+    server = GameServer({"tt_size": 64})
+    server.handle("g1 new black 5")
+    assert server.games["g1"].tt.capacity() == 64
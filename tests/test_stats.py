@@ -0,0 +1,38 @@
+# test_stats.py
+
+import json
+from stats import CommandStats, LatencyHistogram
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) == 0.0 and histogram.mean() == 0.0
+    for _ in range(90):
+        histogram.record(0.000003)  # 3us: bucket [2, 4)
+    for _ in range(10):
+        histogram.record(0.0011)    # 1100us: bucket [1024, 2048)
+    assert histogram.count == 100
+    assert histogram.buckets[1] == 90 and histogram.buckets[10] == 10
+    assert histogram.percentile(0.5) == 4e-6
+    assert histogram.percentile(0.95) == 0.0011  # capped at the largest timing
+    assert abs(histogram.mean() - (90 * 0.000003 + 10 * 0.0011) / 100) < 1e-12
+
+
+def test_command_stats_summary_and_dump(tmp_path):
+    stats = CommandStats()
+    stats.record("make_move", 0.5)
+    stats.record("seto", 0.0001)
+    stats.record("make_move", 0.25)
+    lines = stats.summary()
+    assert [line.split()[0] for line in lines] == ["make_move", "seto"]
+    assert lines[0].split()[2] == "2"
+
+    path = tmp_path / "stats.json"
+    stats.dump(str(path))
+    data = json.loads(path.read_text())
+    assert data["make_move"]["count"] == 2
+    assert data["make_move"]["max"] == 0.5
+    assert sum(data["seto"]["buckets_us"].values()) == 1
+
+    stats.reset()
+    assert stats.summary() == []
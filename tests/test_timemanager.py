@@ -0,0 +1,48 @@
+# test_timemanager.py
+
+from timemanager import TimeManager
+
+
+def test_move_time_alone_sets_the_budget():
+    clock = TimeManager(move_time=1.0)
+    assert abs(clock.start_move(10, 50) - 0.95) < 1e-9
+    assert 0 < clock.time_left() <= clock.budget
+    clock.end_move()
+    assert clock.remaining is None
+
+
+def test_game_clock_is_shared_over_the_moves_left():
+    clock = TimeManager(game_time=100.0)
+    opening = clock.start_move(0, 100)
+    middle = clock.start_move(10, 90)
+    assert opening < middle
+    # never more than half of what is left
+    clock.set_remaining(1.0)
+    assert clock.start_move(60, 2) <= 0.5
+
+
+def test_end_move_charges_the_game_clock():
+    clock = TimeManager(game_time=10.0)
+    clock.start_move(0, 100)
+    spent = clock.end_move()
+    assert clock.remaining == 10.0 - spent
+    clock.set_remaining(-3)
+    assert clock.remaining == 0.0
+    clock.reset()
+    assert clock.remaining == 10.0
+
+
+def test_short_budgets_keep_most_of_their_time():
+    clock = TimeManager(move_time=0.04)
+    assert abs(clock.start_move(10, 50) - 0.036) < 1e-9
+    clock = TimeManager(move_time=0.5)
+    assert abs(clock.start_move(10, 50) - 0.45) < 1e-9
+
+
+def test_a_nearly_full_board_gets_less_time():
+    clock = TimeManager(game_time=100.0)
+    late = clock.start_move(40, 20)
+    endgame = clock.start_move(52, 8)
+    # an even share of 100s over 4 moves would be 25s; under a quarter empty halves it
+    assert abs(late - 100.0 / 10) < 1
+    assert abs(endgame - 100.0 / 4 * 0.5) < 1
@@ -0,0 +1,50 @@
+# test_topology.py
+
+from constants import *
+from coord import Coord
+from board import Board
+from topology import Topology
+
+
+def test_neighbours_match_the_hex_grid():
+    for size in (1, 2, 5, 11):
+        topology = Board(size).topology
+        for i, coord in enumerate(topology.coords[:size*size]):
+            x, y = coord.getx(), coord.gety()
+            expected = {Coord(x+dx, y+dy) for dx, dy in ((-1, 1), (0, 1), (-1, 0), (1, 0), (0, -1), (1, -1))
+                        if 1 <= x+dx <= size and 1 <= y+dy <= size}
+            expected |= {edge for edge, touches in ((Edges.LEFT, x == 1), (Edges.RIGHT, x == size),
+                                                    (Edges.TOP, y == size), (Edges.BOTTOM, y == 1)) if touches}
+            ids = topology.neighbours(i)
+            assert {topology.coords[j] for j in ids} == expected
+            assert len(ids) == len(expected)
+            for j in ids:
+                assert i in topology.neighbours(j)
+
+
+def test_boards_of_a_size_share_one_topology():
+    assert Topology.get(6) is Topology.get(6)
+    assert Board(6).topology is Board(6).topology is Topology.get(6)
+    assert Topology.get(6) is not Topology.get(7)
+
+
+def test_rotation_is_an_involution():
+    for size in (4, 5):
+        topology = Topology.get(size)
+        for i in range(topology.cell_count()):
+            assert topology.rotation[topology.rotation[i]] == i
+        corner = topology.index[Coord(1, 1)]
+        assert topology.coords[topology.rotation[corner]] == Coord(size, size)
+
+
+def test_bridge_index_covers_every_role():
+    topology = Topology.get(7)
+    for b in range(topology.bridge_count()):
+        assert b in topology.bridges_of(topology.bridge_origin[b], Topology.ORIGIN)
+        assert b in topology.bridges_of(topology.bridge_dest[b], Topology.DEST)
+        assert b in topology.bridges_of(topology.bridge_dep0[b], Topology.CARRIER)
+        assert b in topology.bridges_of(topology.bridge_dep1[b], Topology.CARRIER)
+        # both carrier cells touch both ends of the bridge
+        for dep in (topology.bridge_dep0[b], topology.bridge_dep1[b]):
+            assert topology.bridge_origin[b] in topology.neighbours(dep)
+            assert topology.bridge_dest[b] in topology.neighbours(dep)
@@ -0,0 +1,66 @@
+# test_transposition.py
+
+from random import Random
+from constants import *
+from coord import Coord
+from board import Board
+from bot import HexBot
+from transposition import TranspositionTable
+
+
+def test_put_get_and_replace():
+    table = TranspositionTable(8)
+    assert table.get(5) is None
+    table.put(5, "a")
+    table.put(5, "b")
+    assert table.get(5) == "b"
+    assert len(table) == 1
+    assert (table.hits, table.misses, table.stores) == (1, 1, 2)
+    table.clear()
+    assert len(table) == 0 and table.get(5) is None
+
+
+def test_a_full_bucket_evicts_the_shallower_entry():
+    table = TranspositionTable(2)  # one bucket of two slots
+    table.put(1, "deep", depth=5)
+    table.put(2, "shallow", depth=1)
+    table.put(3, "new", depth=3)
+    assert table.get(1) == "deep"
+    assert table.get(2) is None
+    assert table.get(3) == "new"
+    assert table.evictions == 1
+    # equal depths: the older entry goes
+    table.put(4, "newer", depth=3)
+    assert table.get(3) is None and table.get(4) == "newer"
+    assert len(table) <= table.capacity()
+
+
+def test_keys_follow_the_position_not_the_move_order():
+    rng = Random(6)
+    size = 6
+    cells = [Coord(x, y) for x in range(1, size+1) for y in range(1, size+1)]
+    stones = [(coord, rng.choice((Color.WHITE, Color.BLACK))) for coord in rng.sample(cells, 15)]
+    first, second = Board(size), Board(size)
+    for coord, color in stones:
+        first.set(coord, color)
+    for coord, color in reversed(stones):
+        second.set(coord, color)
+    assert first.key() == second.key() != 0
+
+    # the rotated position has the same canonical key
+    rotated = Board(size)
+    for coord, color in stones:
+        rotated.set(Coord(size + 1 - coord.getx(), size + 1 - coord.gety()), color)
+    assert rotated.key(canonical=True) == first.key(canonical=True)
+
+    for coord, _ in stones:
+        first.unset(coord)
+    assert first.key() == 0
+
+
+def test_a_new_game_starts_with_an_empty_table():
+    bot = HexBot(Color.WHITE, 5)
+    bot.dijkstra(bot.board.cells[Edges.TOP], bot.board.cells[Edges.BOTTOM], Color.WHITE)
+    assert len(bot.tt) > 0
+    bot.init_board(5)
+    assert len(bot.tt) == 0
@@ -0,0 +1,40 @@
+# test_unionfind.py
+
+from random import Random
+from unionfind import DisjointSet
+
+
+def components(sets: DisjointSet, size: int) -> list:
+    return [sets.find(x) for x in range(size)]
+
+
+def test_union_and_connected():
+    sets = DisjointSet(5)
+    assert sets.union(0, 1)
+    assert sets.union(3, 4)
+    assert not sets.union(1, 0)
+    assert sets.connected(0, 1) and sets.connected(3, 4)
+    assert not sets.connected(1, 3)
+    assert sets.union(1, 4)
+    assert sets.connected(0, 3)
+    assert not sets.connected(2, 0)
+
+
+def test_rollback_restores_every_checkpoint():
+    rng = Random(1)
+    size = 40
+    sets = DisjointSet(size)
+    saved = []
+    for _ in range(300):
+        if saved and rng.random() < 0.3:
+            checkpoint, expected = saved.pop()
+            sets.rollback(checkpoint)
+            assert components(sets, size) == expected
+        else:
+            saved.append((sets.checkpoint(), components(sets, size)))
+            sets.union(rng.randrange(size), rng.randrange(size))
+    while saved:
+        checkpoint, expected = saved.pop()
+        sets.rollback(checkpoint)
+        assert components(sets, size) == expected
+    assert components(sets, size) == list(range(size))